@@ -1,7 +1,64 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin import helpers
 from django.contrib.auth.models import Group, User
+from django.core.exceptions import ValidationError
+from django.db.models import F
 
-from .models import Household, Person, Meeting, Faq, Feedback
+from . import bulk, exports, pagination, search
+from .models import (
+    ArchivedMeeting,
+    Household,
+    Person,
+    Meeting,
+    MeetingGroup,
+    Faq,
+    Feedback,
+    QueuedEmail,
+)
+
+
+class ExportMixin:
+    """Adds actions that stream the selected rows as CSV or JSON (see exports.py)."""
+
+    export_name: str
+    actions = ["export_csv", "export_json"]
+
+    def export_csv(self, request, queryset):
+        return exports.streaming_response(self.export_name, "csv", queryset)
+
+    export_csv.short_description = (  # type: ignore
+        "Export selected %(verbose_name_plural)s as CSV"
+    )
+
+    def export_json(self, request, queryset):
+        return exports.streaming_response(self.export_name, "json", queryset)
+
+    export_json.short_description = (  # type: ignore
+        "Export selected %(verbose_name_plural)s as JSON"
+    )
+
+
+class KeysetPaginationMixin:
+    """Pages by seeking past the previous page's last row, rather than by OFFSET, and
+    estimates the count of large tables (see pagination.py)."""
+
+    # Otherwise every page counts the whole (unfiltered) table a second time
+    show_full_result_count = False
+
+    def get_changelist(self, request, **kwargs):
+        return pagination.KeysetChangeList
+
+    def get_paginator(
+        self, request, queryset, per_page, orphans=0, allow_empty_first_page=True
+    ):
+        return pagination.KeysetPaginator(
+            queryset,
+            per_page,
+            cursor=request.GET.get(pagination.CURSOR_VAR),
+            orphans=orphans,
+            allow_empty_first_page=allow_empty_first_page,
+        )
 
 
 class PersonInline(admin.TabularInline):
@@ -15,11 +72,32 @@ class MeetingInline(admin.TabularInline):
     model = Meeting
     exclude = ["notes"]
     extra = 0
+    # Search for groups, rather than render every group as an <option> in every row
+    autocomplete_fields = ["group"]
 
 
-class HouseholdAdmin(admin.ModelAdmin):
+class ArchivedMeetingInline(admin.TabularInline):
+    """The household's past meetings (see archive.py), read-only."""
+
+    model = ArchivedMeeting
+    fields = ["name", "start", "end", "reserved", "group"]
+    readonly_fields = fields
+    ordering = ["-start"]
+    extra = 0
+    can_delete = False
+    verbose_name_plural = "Archived meetings"
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("group")
+
+
+class HouseholdAdmin(KeysetPaginationMixin, ExportMixin, admin.ModelAdmin):
+    export_name = "households"
     fields = ["address"]
-    inlines = [PersonInline, MeetingInline]
+    inlines = [PersonInline, MeetingInline, ArchivedMeetingInline]
     list_display = (
         "address",
         "owner_name",
@@ -34,18 +112,131 @@ class HouseholdAdmin(admin.ModelAdmin):
         "person__last_name",
         "person__phone_number",
     ]
-    ordering = ["meeting__start"]
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_owner().with_upcoming_meeting()
+
+    def get_search_results(self, request, queryset, search_term):
+        # search_fields (LIKE '%term%') are only a fallback for databases without
+        # full-text search
+        if search.is_available():
+            return search.search(queryset, search_term), False
+        return super().get_search_results(request, queryset, search_term)
 
-class MeetingAdmin(admin.ModelAdmin):
+    def get_ordering(self, request):
+        # annotated by get_queryset(), so it can't be listed in `ordering`. NULLs (no
+        # upcoming meeting) sort last on every database, so pages can be seeked.
+        return [F("upcoming_meeting_start").asc(nulls_last=True), "id"]
+
+
+class MeetingActionForm(helpers.ActionForm):
+    minutes = forms.IntegerField(
+        required=False, help_text="Used to shift meetings (negative for earlier)"
+    )
+
+
+class MeetingAdmin(KeysetPaginationMixin, ExportMixin, admin.ModelAdmin):
+    export_name = "meetings"
     model = Meeting
-    fields = ["name", "start", "end", "reserved", "household"]
+    fields = ["name", "start", "end", "reserved", "household", "group"]
+    autocomplete_fields = ["household", "group"]
+    # Set-based (see bulk.py), rather than saving each meeting
+    action_form = MeetingActionForm
+    actions = ExportMixin.actions + [
+        "release_reservations",
+        "cancel_meetings",
+        "shift_meetings",
+    ]
+
     list_display = ("full_name", "owner_name", "reserved", "household")
     list_filter = ["start", "reserved"]
-    ordering = ["start"]
+    # Served by the (start, end) index, whose entries end with the id. "id" (not "pk")
+    # makes the ordering total, so the changelist doesn't add "-pk".
+    ordering = ["start", "end", "id"]
+
+    def get_field_queryset(self, db, db_field, request):
+        # HouseholdAdmin's ordering sorts on its own annotation, which the plain
+        # Household queryset behind the household field doesn't have
+        if db_field.name == "household":
+            return None
+        return super().get_field_queryset(db, db_field, request)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_owner()
+
+    def release_reservations(self, request, queryset):
+        released = bulk.release_meetings(queryset)
+        self.message_user(request, f"Released {released} reserved meetings")
+
+    release_reservations.allowed_permissions = ("change",)  # type: ignore
+    release_reservations.short_description = (  # type: ignore
+        "Release the reservations of selected meetings"
+    )
+
+    def cancel_meetings(self, request, queryset):
+        cancelled, groups_deleted = bulk.cancel_meetings(queryset)
+        self.message_user(
+            request,
+            f"Cancelled {cancelled} meetings and deleted {groups_deleted} emptied "
+            "meeting groups",
+        )
+
+    cancel_meetings.allowed_permissions = ("delete",)  # type: ignore
+    cancel_meetings.short_description = "Cancel selected meetings"  # type: ignore
+
+    def shift_meetings(self, request, queryset):
+        minutes_field = self.action_form.base_fields["minutes"]
+        try:
+            minutes = minutes_field.clean(request.POST.get("minutes"))
+            if not minutes:
+                raise ValidationError("Enter the minutes to shift the meetings by")
+            shifted = bulk.shift_meetings(queryset, minutes)
+        except ValidationError as error:
+            self.message_user(request, " ".join(error.messages), messages.ERROR)
+            return
+        self.message_user(request, f"Shifted {shifted} meetings by {minutes} minutes")
+
+    shift_meetings.allowed_permissions = ("change",)  # type: ignore
+    shift_meetings.short_description = (  # type: ignore
+        "Shift selected meetings by the given minutes"
+    )
+
+
+class MeetingGroupAdmin(admin.ModelAdmin):
+    model = MeetingGroup
+    fields = ["name", "date"]
+    list_display = ("name", "date", "total_slots", "open_slots")
+    list_filter = ["date"]
+    ordering = ["-date"]
+    # Used by the group autocomplete (see MeetingAdmin and MeetingInline)
+    search_fields = ["name"]
+
 
+class ArchivedMeetingAdmin(KeysetPaginationMixin, admin.ModelAdmin):
+    """Past meetings (see archive.py): viewable, but no longer scheduled or edited."""
 
-class FeedbackAdmin(admin.ModelAdmin):
+    model = ArchivedMeeting
+    list_display = ("full_name", "owner_name", "reserved", "household")
+    list_filter = ["start"]
+    ordering = ["-start", "-id"]
+
+    def get_queryset(self, request):
+        return (
+            super()
+            .get_queryset(request)
+            .select_related("household", "group")
+            .prefetch_related("household__person_set")
+        )
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+class FeedbackAdmin(KeysetPaginationMixin, ExportMixin, admin.ModelAdmin):
+    export_name = "feedback"
     model = Feedback
     fields = ["name", "email", "phone_number", "issue", "comment", "responded"]
     list_display = (
@@ -57,8 +248,18 @@ class FeedbackAdmin(admin.ModelAdmin):
         "responded",
     )
     list_filter = ["created_date", "responded"]
-    ordering = ["-created_date"]
+    ordering = ["-created_date", "-id"]
     readonly_fields = ("issue", "comment")
+    actions = ExportMixin.actions + ["mark_responded"]
+
+    def mark_responded(self, request, queryset):
+        marked = queryset.filter(responded=False).update(responded=True)
+        self.message_user(request, f"Marked {marked} feedback as responded")
+
+    mark_responded.allowed_permissions = ("change",)  # type: ignore
+    mark_responded.short_description = (  # type: ignore
+        "Mark selected feedback as responded"
+    )
 
 
 class FaqAdmin(admin.ModelAdmin):
@@ -69,10 +270,22 @@ class FaqAdmin(admin.ModelAdmin):
     ordering = ["-created_date"]
 
 
+class QueuedEmailAdmin(admin.ModelAdmin):
+    model = QueuedEmail
+    fields = ["subject", "from_email", "to", "cc", "status", "attempts", "last_error"]
+    list_display = ("subject", "to", "status", "attempts", "next_attempt", "sent_date")
+    list_filter = ["status", "created_date"]
+    ordering = ["-created_date"]
+    readonly_fields = ("subject", "from_email", "to", "cc", "attempts", "last_error")
+
+
 admin.site.register(Household, HouseholdAdmin)
 admin.site.register(Meeting, MeetingAdmin)
+admin.site.register(MeetingGroup, MeetingGroupAdmin)
+admin.site.register(ArchivedMeeting, ArchivedMeetingAdmin)
 admin.site.register(Feedback, FeedbackAdmin)
 admin.site.register(Faq, FaqAdmin)
+admin.site.register(QueuedEmail, QueuedEmailAdmin)
 
 # No need for User/Group management on our admin site
 admin.site.unregister(Group)
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class HomevisitConfig(AppConfig):
     name = "homevisit"
+
+    def ready(self):
+        from . import signals  # noqa: F401
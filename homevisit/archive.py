@@ -0,0 +1,98 @@
+"""Moves past meetings and their groups into archive tables.
+
+Availability, overlap checks and the admin all read the Meeting and MeetingGroup
+tables, which would otherwise keep growing with history that is never booked again.
+Groups whose meetings all ended before the cutoff are moved (with their meetings, and
+keeping their ids) to ArchivedMeetingGroup and ArchivedMeeting, one batch of groups per
+transaction. Archived meetings keep their household, so a household's history stays
+queryable (``household.archivedmeeting_set``).
+"""
+import logging
+from datetime import datetime, time, timedelta
+from typing import Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from . import availability, bulk
+from .models import ArchivedMeeting, ArchivedMeetingGroup, Meeting, MeetingGroup
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+
+
+def get_cutoff(days: int = None) -> datetime:
+    """Returns the local midnight ``days`` (default: HOMEVISIT_ARCHIVE_AFTER_DAYS) ago."""
+    if days is None:
+        days = settings.HOMEVISIT_ARCHIVE_AFTER_DAYS
+    day = timezone.localdate() - timedelta(days=days)
+    return timezone.make_aware(datetime.combine(day, time()))
+
+
+def archivable_groups(cutoff: datetime) -> QuerySet:
+    """Groups (dated before ``cutoff``) whose meetings all ended before ``cutoff``."""
+    return MeetingGroup.objects.filter(date__lt=timezone.localdate(cutoff)).exclude(
+        meeting__end__gte=cutoff
+    )
+
+
+def _archive_batch(cutoff: datetime, batch_size: int) -> Tuple[int, int]:
+    with transaction.atomic():
+        group_ids = list(
+            archivable_groups(cutoff)
+            .order_by("date", "pk")
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        if not group_ids:
+            return 0, 0
+
+        groups = MeetingGroup.objects.filter(pk__in=group_ids)
+        ArchivedMeetingGroup.objects.bulk_create(
+            ArchivedMeetingGroup(id=pk, name=name, date=date)
+            for pk, name, date in groups.values_list("pk", "name", "date")
+        )
+        meetings = Meeting.objects.filter(group_id__in=group_ids)
+        fields = ["id", "name", "start", "end", "reserved", "household_id", "group_id"]
+        ArchivedMeeting.objects.bulk_create(
+            (
+                ArchivedMeeting(**dict(zip(fields, row)))
+                for row in meetings.values_list(*fields).iterator()
+            ),
+            batch_size=BATCH_SIZE,
+        )
+
+        # Once the meetings are gone nothing references their groups. Availability is
+        # invalidated by archive_past().
+        archived = bulk.raw_delete(meetings)
+        bulk.raw_delete(groups)
+    return archived, len(group_ids)
+
+
+def archive_past(
+    cutoff: datetime = None, batch_size: int = BATCH_SIZE
+) -> Tuple[int, int]:
+    """Archives the groups (and their meetings) that ended before ``cutoff``.
+
+    :param cutoff: Default: see get_cutoff()
+    :param batch_size: the number of groups archived per transaction
+    :return: the number of meetings and meeting groups archived
+    """
+    if cutoff is None:
+        cutoff = get_cutoff()
+
+    meetings = groups = 0
+    while True:
+        batch_meetings, batch_groups = _archive_batch(cutoff, batch_size)
+        if not batch_groups:
+            break
+        meetings += batch_meetings
+        groups += batch_groups
+        logger.debug("Archived %d meetings in %d groups", batch_meetings, batch_groups)
+
+    if groups:
+        availability.invalidate()
+    logger.info("Archived %d meetings in %d groups before %s", meetings, groups, cutoff)
+    return meetings, groups
@@ -0,0 +1,105 @@
+"""Versioned cache of the meeting availability offered on the sign-up page.
+
+Every cached entry embeds the current availability "version" in its key. Changing a
+Meeting or MeetingGroup bumps the version (see ``homevisit.signals`` and
+``homevisit.versions``), so readers stop seeing the old entries immediately.
+"""
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from typing import List, NamedTuple, Optional, Tuple
+
+from django.conf import settings
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from . import versions
+from .models import Meeting, MeetingGroup
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "homevisit:availability:version"
+
+
+def get_version() -> int:
+    """Returns the current availability version, creating it if needed."""
+    return versions.get_version(VERSION_KEY)
+
+
+def invalidate() -> None:
+    """Discards all cached availability (see versions.bump)."""
+    versions.bump(VERSION_KEY)
+    logger.debug("Invalidated cached meeting availability")
+
+
+def _query_open_groups(today, max_date) -> List[Tuple[int, str]]:
+    # The groups' slot counters spare a join (and anti-join) across their meetings
+    mtg_group_query = (
+        MeetingGroup.objects.filter(date__gte=today)
+        .filter(date__lte=max_date)
+        .open()
+        .order_by("date")
+    )
+    return [(group.id, group.date_string()) for group in mtg_group_query]
+
+
+def get_open_groups() -> List[Tuple[int, str]]:
+    """Returns ``(group_id, date_string)`` for every MeetingGroup open for booking.
+
+    Results are served from the cache when possible; only a cache miss hits the
+    database.
+    """
+    today = timezone.now().date()
+    weeks = settings.HOMEVISIT_HIDE_WEEKS_AFTER
+    key = f"homevisit:availability:{get_version()}:groups:{today}:{weeks}"
+
+    cache = versions.get_cache()
+    open_groups = cache.get(key)
+    if open_groups is None:
+        open_groups = _query_open_groups(today, today + timedelta(weeks=weeks))
+        cache.set(key, open_groups, timeout=settings.HOMEVISIT_AVAILABILITY_TIMEOUT)
+    return open_groups
+
+
+class TimeOptions(NamedTuple):
+    """The rendered ``<option>`` list of a MeetingGroup's open meeting times."""
+
+    html: str
+    etag: str
+    last_modified: datetime
+
+
+def _render_time_options(group_id: int) -> Optional[TimeOptions]:
+    group = MeetingGroup.objects.filter(pk=group_id).first()
+    if group is None:
+        return None
+
+    # Once any meeting in the group is reserved, none of them are available
+    meetings = Meeting.objects.none()
+    if group.open_slots == group.total_slots:
+        meetings = Meeting.objects.filter(group_id=group_id).order_by("start")
+    html = render_to_string(
+        "homevisit/times_dropdown_list_options.html", {"meetings": meetings}
+    )
+    etag = f'"{hashlib.md5(html.encode()).hexdigest()}"'
+    return TimeOptions(html, etag, timezone.now().replace(microsecond=0))
+
+
+def get_time_options(group_id: int) -> Optional[TimeOptions]:
+    """Returns the rendered times still available in a MeetingGroup.
+
+    Like ``get_open_groups``, results are cached until availability changes.
+
+    :param group_id: the MeetingGroup's id
+    :return: the rendered options, or None if the group doesn't exist
+    """
+    key = f"homevisit:availability:{get_version()}:times:{group_id}"
+
+    cache = versions.get_cache()
+    options = cache.get(key)
+    if options is None:
+        options = _render_time_options(group_id)
+        if options is None:
+            return None
+        cache.set(key, options, timeout=settings.HOMEVISIT_AVAILABILITY_TIMEOUT)
+    return options
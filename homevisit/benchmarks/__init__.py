@@ -0,0 +1,7 @@
+"""Performance benchmarks for homevisit.
+
+Run them with ``python manage.py benchmark``, which executes every requested suite
+against a throwaway test database. Each suite module exposes a ``run()`` function
+returning a list of result dicts. Results can be saved as JSON (``--output``) and
+compared against a previous run (``--baseline``) to fail on regressions.
+"""
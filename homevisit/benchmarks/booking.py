@@ -0,0 +1,227 @@
+"""The public booking flow: the pages (and AJAX calls) a household goes through.
+
+Seeds ``size`` meetings (3 per group, 4 groups per day, every other group reserved)
+and then measures each request with the Django test client.
+"""
+import math
+import time
+from datetime import datetime, time as dt_time, timedelta
+from typing import Callable, Dict, List, Type
+
+from django.db import connection, reset_queries, transaction
+from django.db.models import Model
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .. import availability
+from ..models import Faq, Feedback, Household, Meeting, MeetingGroup, Person, QueuedEmail
+
+DEFAULT_SIZES = [100, 1000, 10000]
+DEFAULT_REQUESTS = 100
+MEETINGS_PER_GROUP = 3
+GROUPS_PER_DAY = 4
+FIRST_HOUR = 8
+FAQS = 10
+
+
+def seed(size: int, batch_size: int) -> None:
+    """Seeds ``size`` meetings, plus households for the reserved ones and FAQs."""
+    begin_date = timezone.localdate() + timedelta(days=1)
+    meetings = []
+    with transaction.atomic():
+        for index in range(math.ceil(size / MEETINGS_PER_GROUP)):
+            day = begin_date + timedelta(days=index // GROUPS_PER_DAY)
+            group = MeetingGroup.objects.create(name=f"Benchmark: {day}", date=day)
+
+            household = None
+            if index % 2:
+                household = Household.objects.create(address=f"{index} Benchmark St")
+                Person.objects.create(
+                    household=household,
+                    first_name="Bench",
+                    last_name=str(index),
+                    email=f"bench{index}@example.com",
+                )
+
+            first_hour = FIRST_HOUR + (index % GROUPS_PER_DAY) * MEETINGS_PER_GROUP
+            for hour in range(first_hour, first_hour + MEETINGS_PER_GROUP):
+                start = timezone.make_aware(datetime.combine(day, dt_time(hour)))
+                meetings.append(
+                    Meeting(
+                        name="Benchmark",
+                        start=start,
+                        end=start + timedelta(hours=1),
+                        group=group,
+                        household=household if hour == first_hour else None,
+                    )
+                )
+        Meeting.objects.bulk_create(meetings, batch_size=batch_size)
+        MeetingGroup.objects.all().refresh_counters()
+
+        Faq.objects.create(short_name="about", question="About", answer="About us")
+        for index in range(FAQS):
+            Faq.objects.create(
+                short_name=f"faq{index}", question=f"Question {index}?", answer="Yes"
+            )
+    availability.invalidate()
+
+
+SEEDED_MODELS: List[Type[Model]] = [
+    Person,
+    Household,
+    MeetingGroup,
+    Faq,
+    Feedback,
+    QueuedEmail,
+]
+
+
+def clean_up() -> None:
+    with transaction.atomic():
+        for model in SEEDED_MODELS:
+            model._default_manager.all().delete()
+    availability.invalidate()
+
+
+def _open_meetings() -> List[Dict]:
+    """Returns booking form data for (one meeting of) every open group."""
+    bookings = []
+    for group_id, _ in availability.get_open_groups():
+        meeting = Meeting.objects.filter(group_id=group_id).order_by("start").first()
+        bookings.append({"meeting_dates": group_id, "meeting": meeting.pk})
+    return bookings
+
+
+def get(url_name, **params):
+    """Returns a request (for measure()) that GETs the named URL."""
+
+    def request(client, _):
+        return client.get(reverse(url_name), params, secure=True)
+
+    return request
+
+
+def _book(bookings):
+    def book(client, iteration):
+        data = {
+            "ownerForm-first_name": "Bench",
+            "ownerForm-last_name": f"Booking {iteration}",
+            "ownerForm-email": f"booking{iteration}@example.com",
+            "ownerForm-phone_number": "",
+            "address": f"{iteration} Booking Ave",
+            **bookings[iteration],
+        }
+        response = client.post(reverse("index"), data, secure=True)
+        if response.status_code != 302:
+            raise RuntimeError(f"Failed to book {bookings[iteration]}")
+        return response
+
+    return book
+
+
+def _contact(client, iteration):
+    data = {
+        "name": "Bench",
+        "email": f"contact{iteration}@example.com",
+        "phone_number": "",
+        "issue": "GENERAL",
+        "comment": "Benchmarking the contact page",
+    }
+    return client.post(reverse("contact"), data, secure=True)
+
+
+def _percentile(sorted_values: List[float], percent: int) -> float:
+    """Nearest-rank percentile."""
+    rank = max(math.ceil(percent / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+class DatabaseTimer:
+    """Sums the time spent in database calls (see connection.execute_wrapper()).
+
+    The query log's times are rounded to whole milliseconds, so fast queries read 0.
+    """
+
+    def __init__(self):
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - started
+
+
+def measure(client: Client, request: Callable, requests: int) -> Dict:
+    """Times ``requests`` calls of ``request(client, iteration)``."""
+    # The (DEBUG) query log is capped: make room, so every query is counted
+    reset_queries()
+    latencies = []
+    queries = 0
+    db_timer = DatabaseTimer()
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    with connection.execute_wrapper(db_timer):
+        for iteration in range(requests):
+            with CaptureQueriesContext(connection) as captured:
+                request_started = time.perf_counter()
+                response = request(client, iteration)
+                latencies.append(time.perf_counter() - request_started)
+            if response.status_code not in (200, 302):
+                raise RuntimeError(f"Unexpected HTTP {response.status_code} response")
+            queries += len(captured)
+    elapsed = time.perf_counter() - started
+    cpu_seconds = time.process_time() - cpu_started
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "seconds": elapsed,
+        "per_second": requests / elapsed if elapsed else 0.0,
+        "p50_ms": _percentile(latencies, 50) * 1000,
+        "p95_ms": _percentile(latencies, 95) * 1000,
+        "p99_ms": _percentile(latencies, 99) * 1000,
+        "cpu_ms": cpu_seconds / requests * 1000,
+        "queries_per_request": queries / requests,
+        "db_ms": db_timer.seconds / requests * 1000,
+    }
+
+
+def run(
+    sizes: List[int] = None, batch_size: int = 500, requests: int = None
+) -> List[Dict]:
+    """Measures each step of the booking flow against ``sizes`` seeded meetings.
+
+    :param sizes: the number of meetings to seed per measurement
+    :param batch_size: the bulk_create batch size used when seeding
+    :param requests: the number of requests to time per page
+    :return: one result per (page, size), including latency percentiles (in ms)
+        and the average number of queries per request
+    """
+    requests = requests or DEFAULT_REQUESTS
+    results = []
+    for size in sizes or DEFAULT_SIZES:
+        seed(size, batch_size)
+        try:
+            client = Client()
+            bookings = _open_meetings()
+            group_id = bookings[0]["meeting_dates"]
+            scenarios = [
+                ("index", get("index"), requests),
+                ("load_times", get("ajax_load_times", group=group_id), requests),
+                ("faqs", get("faqs"), requests),
+                ("about", get("about"), requests),
+                ("contact", _contact, requests),
+                # Last, since every booking closes a group (so each can be booked once)
+                ("booking", _book(bookings), min(requests, len(bookings))),
+            ]
+            for name, request, count in scenarios:
+                result = {"suite": "booking", "name": name, "size": size}
+                result.update(measure(client, request, count))
+                results.append(result)
+        finally:
+            clean_up()
+    return results
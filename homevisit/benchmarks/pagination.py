@@ -0,0 +1,118 @@
+"""The meeting admin's changelist, paged deep into a large table: OFFSET vs keyset.
+
+Seeds ``size`` meetings (analyzed, so their count can be estimated) and GETs page N of
+the changelist at increasing depths: by page number (OFFSET, with an exact count, as
+the stock admin does) and by cursor (as the "Next" links do).
+"""
+import sys
+from datetime import datetime, time as dt_time, timedelta
+from typing import Dict, List
+
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .. import bulk, pagination
+from ..admin import MeetingAdmin
+from ..models import Meeting, MeetingGroup
+from .booking import FIRST_HOUR, MEETINGS_PER_GROUP, measure
+
+DEFAULT_SIZES = [10000, 100000]
+DEFAULT_REQUESTS = 20
+DEPTHS = [1, 10, 100, 1000]
+USERNAME = "benchmark"
+
+
+def seed(size: int, batch_size: int) -> None:
+    """Seeds ``size`` meetings (in groups, a day apart) and analyzes the tables."""
+    begin_date = timezone.localdate() + timedelta(days=1)
+    group_count = -(-size // MEETINGS_PER_GROUP)
+    with transaction.atomic():
+        MeetingGroup.objects.bulk_create(
+            (
+                MeetingGroup(name=f"Benchmark {ndx}", date=begin_date + timedelta(ndx))
+                for ndx in range(group_count)
+            ),
+            batch_size=batch_size,
+        )
+        groups = MeetingGroup.objects.order_by("date").values_list("pk", "date")
+        Meeting.objects.bulk_create(
+            (
+                Meeting(
+                    name="Benchmark",
+                    start=timezone.make_aware(datetime.combine(day, dt_time(hour))),
+                    end=timezone.make_aware(datetime.combine(day, dt_time(hour + 1))),
+                    group_id=group_id,
+                )
+                for group_id, day in groups.iterator()
+                for hour in range(FIRST_HOUR, FIRST_HOUR + MEETINGS_PER_GROUP)
+            ),
+            batch_size=batch_size,
+        )
+        MeetingGroup.objects.all().refresh_counters()
+        User.objects.create_superuser(USERNAME, "benchmark@example.com", None)
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+
+def clean_up() -> None:
+    with transaction.atomic():
+        # Meetings first: they reference the groups
+        bulk.raw_delete(Meeting.objects.all())
+        bulk.raw_delete(MeetingGroup.objects.all())
+        User.objects.filter(username=USERNAME).delete()
+
+
+def _cursor(depth: int) -> Dict:
+    """The query string of the changelist's "Next" link leading to page ``depth``."""
+    if depth == 1:
+        return {}
+    queryset = Meeting.objects.order_by(*MeetingAdmin.ordering)
+    last = queryset[(depth - 1) * MeetingAdmin.list_per_page - 1]
+    cursor = pagination.encode_cursor(pagination.get_keys(queryset) or [], last)
+    return {pagination.CURSOR_VAR: cursor, "p": depth - 1}
+
+
+def _get(params: Dict):
+    def request(client, _):
+        url = reverse("admin:homevisit_meeting_changelist")
+        return client.get(url, params, secure=True)
+
+    return request
+
+
+def run(
+    sizes: List[int] = None, batch_size: int = 500, requests: int = None
+) -> List[Dict]:
+    """Measures the meeting changelist's pages at each of DEPTHS, by OFFSET and cursor.
+
+    :param sizes: the number of meetings to seed per measurement
+    :param batch_size: the bulk_create batch size used when seeding
+    :param requests: the number of requests to time per page
+    :return: one result per (mode and page, size), including latency percentiles (in ms)
+    """
+    requests = requests or DEFAULT_REQUESTS
+    results = []
+    for size in sizes or DEFAULT_SIZES:
+        seed(size, batch_size)
+        try:
+            client = Client()
+            client.force_login(User.objects.get(username=USERNAME))
+            pages = -(-size // MeetingAdmin.list_per_page)
+            for depth in [depth for depth in DEPTHS if depth <= pages]:
+                # Never estimated: the stock admin counts every row
+                with override_settings(HOMEVISIT_ESTIMATED_COUNT_MIN=sys.maxsize):
+                    name = f"offset_{depth}"
+                    result = {"suite": "pagination", "name": name, "size": size}
+                    result.update(measure(client, _get({"p": depth - 1}), requests))
+                    results.append(result)
+
+                result = {"suite": "pagination", "name": f"keyset_{depth}", "size": size}
+                result.update(measure(client, _get(_cursor(depth)), requests))
+                results.append(result)
+        finally:
+            clean_up()
+    return results
@@ -0,0 +1,82 @@
+"""Form rendering: crispy layouts built per form instance vs. once per process.
+
+Renders the index and contact pages (the pages with crispy forms) using the shared
+class-level FormHelpers, and again building new FormHelpers for every request (as the
+forms used to). Results include the CPU time per request.
+"""
+from typing import Any, Callable, Dict, List, Tuple
+
+from django.template import engines
+from django.template.loaders.cached import Loader as CachedLoader
+from django.test import Client
+
+from .. import forms
+from .booking import clean_up, get, measure, seed
+
+DEFAULT_SIZES = [300]
+DEFAULT_REQUESTS = 200
+
+# (form class, builds its FormHelper)
+HELPERS: List[Tuple[Any, Callable]] = [
+    (forms.HouseholdForm, forms._household_helper),
+    (forms.OwnerForm, forms._owner_helper),
+    (forms.FeedbackForm, forms._feedback_helper),
+]
+
+
+def _rebuild_helpers():
+    for form_class, build_helper in HELPERS:
+        form_class.helper = build_helper()
+
+
+MODES = [("rebuilt", _rebuild_helpers), ("shared", None)]
+
+
+def _cached_templates() -> bool:
+    loaders = engines["django"].engine.template_loaders
+    return any(isinstance(loader, CachedLoader) for loader in loaders)
+
+
+def _render(page, prepare):
+    render = get(page)
+
+    def request(client, iteration):
+        if prepare:
+            prepare()
+        return render(client, iteration)
+
+    return request
+
+
+def run(
+    sizes: List[int] = None, batch_size: int = 500, requests: int = None
+) -> List[Dict]:
+    """Measures rendering the index and contact pages with each layout mode.
+
+    :param sizes: the number of meetings to seed (offered on the index page)
+    :param batch_size: the bulk_create batch size used when seeding
+    :param requests: the number of requests to time per page and mode
+    :return: one result per (page, mode, size), including the CPU ms per request
+    """
+    requests = requests or DEFAULT_REQUESTS
+    shared_helpers = [form_class.helper for form_class, _ in HELPERS]
+    results = []
+    for size in sizes or DEFAULT_SIZES:
+        seed(size, batch_size)
+        try:
+            client = Client()
+            for page in ["index", "contact"]:
+                for mode, prepare in MODES:
+                    result = {
+                        "suite": "rendering",
+                        "name": f"{page}/{mode}",
+                        "size": size,
+                    }
+                    result.update(measure(client, _render(page, prepare), requests))
+                    result["cached_templates"] = _cached_templates()
+                    results.append(result)
+        finally:
+            for (form_class, _), helper in zip(HELPERS, shared_helpers):
+                form_class.helper = helper
+            clean_up()
+    return results
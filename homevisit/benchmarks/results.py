@@ -0,0 +1,63 @@
+"""Saves benchmark results as JSON and compares them against a previous run."""
+import json
+import math
+import platform
+from typing import Dict, List
+
+import django
+from django.utils import timezone
+
+# For each metric: True if bigger is better. Unlike the timings, the query count is
+# deterministic: any growth beyond the allowed percentage is a real regression.
+METRICS = {"per_second": True, "p95_ms": False, "queries_per_request": False}
+
+
+def save(path: str, results: List[Dict]) -> None:
+    report = {
+        "created": timezone.now().isoformat(),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "results": results,
+    }
+    with open(path, "w") as output:
+        json.dump(report, output, indent=2)
+
+
+def load(path: str) -> List[Dict]:
+    with open(path) as report:
+        return json.load(report)["results"]
+
+
+def find_regressions(
+    baseline: List[Dict], results: List[Dict], max_regression: float
+) -> List[str]:
+    """Compares results against the matching (suite, name, size) baseline results.
+
+    :param baseline: the results of a previous run
+    :param results: the results of this run
+    :param max_regression: the allowed slowdown of each metric, in percent
+    :return: a description of every metric that regressed by more than allowed
+    """
+    previous = {(r["suite"], r["name"], r["size"]): r for r in baseline}
+    regressions = []
+    for result in results:
+        key = (result["suite"], result["name"], result["size"])
+        if key not in previous:
+            continue
+
+        for metric, bigger_is_better in METRICS.items():
+            if metric not in result or metric not in previous[key]:
+                continue
+            before, after = previous[key][metric], result[metric]
+            if before:
+                change = (after - before) / before
+            else:
+                # ex: a (cached) page that issued no queries now does
+                change = math.copysign(math.inf, after) if after else 0.0
+            regression = -change if bigger_is_better else change
+            if regression * 100 > max_regression:
+                regressions.append(
+                    f"{' '.join(map(str, key))} {metric}: {previous[key][metric]:.2f} "
+                    f"-> {result[metric]:.2f} ({regression:.0%} worse)"
+                )
+    return regressions
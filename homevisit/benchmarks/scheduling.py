@@ -0,0 +1,75 @@
+"""Meeting generation: one INSERT per meeting vs. Meeting.schedule_recurring."""
+import time
+from datetime import datetime, time as dt_time, timedelta
+from typing import Dict, List
+
+from django.utils import timezone
+
+from ..models import Meeting, MeetingGroup, Weekdays
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+DURATION_MINS = 60
+START_TIMES = [dt_time(hour) for hour in range(8, 20)]  # 12 meetings per day
+WEEKDAYS = list(Weekdays)
+
+
+def _schedule_per_row(name, begin_date, end_date, create_after, group, batch_size):
+    """The original implementation: one Meeting.objects.create() per slot."""
+    for day_num in range((end_date - begin_date).days):
+        loop_date = begin_date + timedelta(days=day_num)
+        for start_time in START_TIMES:
+            mtg_start = datetime.combine(
+                loop_date, start_time, tzinfo=create_after.tzinfo
+            )
+            mtg_end = mtg_start + timedelta(minutes=DURATION_MINS)
+            Meeting.objects.create(name=name, start=mtg_start, end=mtg_end, group=group)
+
+
+def _schedule_bulk(name, begin_date, end_date, create_after, group, batch_size):
+    Meeting.schedule_recurring(
+        name,
+        begin_date,
+        end_date,
+        DURATION_MINS,
+        WEEKDAYS,
+        START_TIMES,
+        create_after=create_after,
+        group=group,
+        batch_size=batch_size,
+    )
+
+
+MODES = [("per-row", _schedule_per_row), ("bulk", _schedule_bulk)]
+
+
+def run(sizes: List[int] = None, batch_size: int = 500) -> List[Dict]:
+    """Times the creation of ``sizes`` meetings with each scheduling mode.
+
+    :param sizes: the number of meetings to create per measurement
+    :param batch_size: the bulk_create batch size used by schedule_recurring
+    :return: one result per (mode, size), including inserts/sec
+    """
+    results = []
+    for slots in sizes or DEFAULT_SIZES:
+        create_after = timezone.now()
+        begin_date = create_after.date() + timedelta(days=1)
+        end_date = begin_date + timedelta(days=-(-slots // len(START_TIMES)))
+
+        for mode, schedule in MODES:
+            group = MeetingGroup.objects.create(name=f"Benchmark {mode}", date=begin_date)
+            started = time.perf_counter()
+            schedule("Benchmark", begin_date, end_date, create_after, group, batch_size)
+            elapsed = time.perf_counter() - started
+
+            created = group.meeting_set.count()
+            results.append(
+                {
+                    "suite": "scheduling",
+                    "name": mode,
+                    "size": created,
+                    "seconds": elapsed,
+                    "per_second": created / elapsed if elapsed else 0.0,
+                }
+            )
+            group.delete()
+    return results
@@ -0,0 +1,138 @@
+"""Household admin search: LIKE '%term%' across joined tables vs. the full-text index.
+
+Seeds ``size`` households (each with an owner) and times what the admin's changelist
+does for a search: count the matches and load the first page of them.
+"""
+import time
+from typing import Callable, Dict, List
+
+from django.contrib import admin
+from django.db import connection, reset_queries, transaction
+from django.test.utils import CaptureQueriesContext
+
+from .. import bulk, search
+from ..admin import HouseholdAdmin
+from ..models import Household, Person
+from .booking import _percentile
+
+DEFAULT_SIZES = [10000, 100000]
+DEFAULT_REQUESTS = 20
+PAGE_SIZE = 100
+
+STREETS = ["Main Street", "Oak Avenue", "Pine Road", "Elm Court", "Maple Lane"]
+FIRST_NAMES = ["Tyler", "Jane", "Maria", "David", "Grace", "Samuel", "Ruth", "Paul"]
+LAST_NAMES = ["Curtis", "Smith", "Garcia", "Nguyen", "Johnson", "Miller", "Lee"]
+# Broad and narrow searches, like a coordinator typing a street, a name or a phone
+TERMS = ["main", "smith", "grace miller", "12 oak", "530-555-01", "nobody"]
+
+
+def seed(size: int, batch_size: int) -> None:
+    with transaction.atomic():
+        Household.objects.bulk_create(
+            (
+                Household(address=f"{ndx} {STREETS[ndx % len(STREETS)]}")
+                for ndx in range(size)
+            ),
+            batch_size=batch_size,
+        )
+        household_ids = Household.objects.order_by("pk").values_list("pk", flat=True)
+        Person.objects.bulk_create(
+            (
+                Person(
+                    household_id=household_id,
+                    first_name=FIRST_NAMES[ndx % len(FIRST_NAMES)],
+                    last_name=LAST_NAMES[ndx % len(LAST_NAMES)],
+                    email=f"search{ndx}@example.com",
+                    phone_number=f"+1530555{ndx % 10000:04d}",
+                )
+                for ndx, household_id in enumerate(household_ids.iterator())
+            ),
+            batch_size=batch_size,
+        )
+    # bulk_create() doesn't send the signals that index households
+    search.rebuild()
+
+
+def clean_up() -> None:
+    with transaction.atomic():
+        # Only the seeded people reference the seeded households (no meetings are
+        # seeded). The index is emptied by rebuild().
+        bulk.raw_delete(Person.objects.all())
+        bulk.raw_delete(Household.objects.all())
+    search.rebuild()
+
+
+def _like(model_admin, term):
+    queryset, use_distinct = admin.ModelAdmin.get_search_results(
+        model_admin, None, Household.objects.all(), term
+    )
+    return queryset.distinct() if use_distinct else queryset
+
+
+def _full_text(model_admin, term):
+    queryset, _ = model_admin.get_search_results(None, Household.objects.all(), term)
+    return queryset
+
+
+def measure(find: Callable, requests: int) -> Dict:
+    """Times ``requests`` searches (cycling through TERMS) like the changelist does."""
+    model_admin = HouseholdAdmin(Household, admin.site)
+    # The (DEBUG) query log is capped: make room, so every query is counted
+    reset_queries()
+    latencies = []
+    queries = 0
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    for iteration in range(requests):
+        term = TERMS[iteration % len(TERMS)]
+        with CaptureQueriesContext(connection) as captured:
+            request_started = time.perf_counter()
+            queryset = find(model_admin, term).order_by("-pk")
+            queryset.count()
+            list(queryset[:PAGE_SIZE])
+            latencies.append(time.perf_counter() - request_started)
+        queries += len(captured)
+    elapsed = time.perf_counter() - started
+    cpu_seconds = time.process_time() - cpu_started
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "seconds": elapsed,
+        "per_second": requests / elapsed if elapsed else 0.0,
+        "p50_ms": _percentile(latencies, 50) * 1000,
+        "p95_ms": _percentile(latencies, 95) * 1000,
+        "p99_ms": _percentile(latencies, 99) * 1000,
+        "cpu_ms": cpu_seconds / requests * 1000,
+        "queries_per_request": queries / requests,
+    }
+
+
+MODES = [("like", _like), ("full_text", _full_text)]
+
+
+def run(
+    sizes: List[int] = None, batch_size: int = 500, requests: int = None
+) -> List[Dict]:
+    """Measures household searches with each search mode.
+
+    :param sizes: the number of households to seed per measurement
+    :param batch_size: the bulk_create batch size used when seeding
+    :param requests: the number of searches to time per mode
+    :return: one result per (mode, size), including latency percentiles (in ms)
+    """
+    if not search.is_available():
+        raise RuntimeError("Full-text search isn't supported by this database")
+
+    requests = requests or DEFAULT_REQUESTS
+    results = []
+    for size in sizes or DEFAULT_SIZES:
+        seed(size, batch_size)
+        try:
+            for mode, find in MODES:
+                result = {"suite": "search", "name": mode, "size": size}
+                result.update(measure(find, requests))
+                results.append(result)
+        finally:
+            clean_up()
+    return results
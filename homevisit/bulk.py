@@ -0,0 +1,118 @@
+"""Set-based changes to many meetings at once (ex: the admin's bulk actions).
+
+Each change is a fixed number of statements, however many meetings it applies to: no
+per-row saves, clean() calls or signals. Instead, the affected groups' counters are
+refreshed and the cached availability is invalidated once, afterwards.
+"""
+import logging
+from datetime import timedelta
+from typing import Tuple
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from . import availability, db, overlaps
+from .models import Meeting, MeetingGroup
+
+logger = logging.getLogger(__name__)
+
+
+def _plain(meetings: QuerySet) -> QuerySet:
+    # Drop the admin's joins and prefetches, which updates and deletes don't need
+    return meetings.select_related(None).prefetch_related(None).order_by()
+
+
+def raw_delete(rows: QuerySet) -> int:
+    """Deletes ``rows`` in a single DELETE, skipping Django's collector.
+
+    The collector fetches every row, to cascade to the rows referencing them and to send
+    each one's pre_delete and post_delete. Only use this when nothing references the
+    rows (any more), and redo the delete receivers' work afterwards. test_bulk checks
+    both still hold for the models deleted this way.
+
+    :return: the number of rows deleted
+    """
+    return rows._raw_delete(rows.db)
+
+
+def release_meetings(meetings: QuerySet) -> int:
+    """Clears the reservations of ``meetings``, opening their slots again.
+
+    :return: the number of meetings released (those that were reserved)
+    """
+    reserved = _plain(meetings).filter(household__isnull=False)
+    with transaction.atomic():
+        group_ids = list(reserved.values_list("group_id", flat=True).distinct())
+        released = reserved.update(household=None, reserved=None)
+        MeetingGroup.objects.filter(pk__in=group_ids).refresh_counters()
+    availability.invalidate()
+    logger.info("Released %d meetings", released)
+    return released
+
+
+def cancel_meetings(meetings: QuerySet) -> Tuple[int, int]:
+    """Deletes ``meetings``, and then the groups left without any meeting.
+
+    :return: the number of meetings and of (emptied) meeting groups deleted
+    """
+    meetings = _plain(meetings)
+    with transaction.atomic():
+        group_ids = list(meetings.values_list("group_id", flat=True).distinct())
+        # The receivers' work (recounting and invalidating) is redone below
+        cancelled = raw_delete(meetings)
+        groups_deleted, _ = (
+            MeetingGroup.objects.filter(pk__in=group_ids)
+            .filter(meeting__isnull=True)
+            .delete()
+        )
+        MeetingGroup.objects.filter(pk__in=group_ids).refresh_counters()
+    availability.invalidate()
+    logger.info("Cancelled %d meetings", cancelled)
+    return cancelled, groups_deleted
+
+
+def shift_meetings(meetings: QuerySet, minutes: int) -> int:
+    """Moves ``meetings`` ``minutes`` later (or earlier, if negative).
+
+    The shifted meetings are checked for overlaps (with each other and every other
+    meeting) in one query, and then moved with a single UPDATE (per batch of
+    bulk_update()). They keep their group, so must stay on its date.
+
+    :raises ValidationError: if a shifted meeting would start in the past or on
+        another day than its group's date, or overlap
+    :return: the number of meetings shifted
+    """
+    delta = timedelta(minutes=minutes)
+    meetings = _plain(meetings)
+    with transaction.atomic():
+        db.lock_schedule()
+        rows = meetings.values_list("pk", "name", "start", "end", "group__date")
+        shifted, group_dates = [], []
+        for pk, name, start, end, group_date in rows:
+            shifted.append(
+                Meeting(pk=pk, name=name, start=start + delta, end=end + delta)
+            )
+            group_dates.append(group_date)
+        if not shifted:
+            return 0
+        if min(meeting.start for meeting in shifted) <= timezone.now():
+            raise ValidationError(
+                "Meetings cannot be moved into the past", code="invalid"
+            )
+        for meeting, group_date in zip(shifted, group_dates):
+            if timezone.localdate(meeting.start) != group_date:
+                raise ValidationError(
+                    f"'{meeting.full_name()}' would no longer be on its group's date "
+                    f"({group_date})",
+                    code="invalid",
+                )
+        overlaps.validate_no_overlaps(shifted)
+
+        # One UPDATE (per batch) of precomputed values: SQLite's date arithmetic
+        # (F("start") + delta) would store the times in a different text format
+        Meeting.objects.bulk_update(shifted, ["start", "end"])
+    availability.invalidate()
+    logger.info("Shifted %d meetings by %d minutes", len(shifted), minutes)
+    return len(shifted)
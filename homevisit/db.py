@@ -0,0 +1,47 @@
+"""Database backend specifics: SQLite tuning and PostgreSQL locking.
+
+Each new SQLite connection is tuned for a concurrent web workload.
+
+Write-ahead logging lets readers keep reading while a booking is being written (instead
+of waiting on the rollback journal's exclusive lock), and synchronous=NORMAL is safe
+(and much cheaper) in WAL mode. Waiting for competing writers is configured separately,
+by the DB_TIMEOUT ("timeout") database option.
+
+SQLite only allows one writer at a time, so checking for overlapping meetings and then
+inserting new ones (in one transaction) can't be raced. PostgreSQL runs writers
+concurrently, so schedulers serialize on an advisory lock instead (see lock_schedule()).
+"""
+import logging
+
+from django.conf import settings
+from django.db import connection as default_connection
+
+logger = logging.getLogger(__name__)
+
+
+def configure_connection(connection) -> None:
+    """Applies HOMEVISIT_SQLITE_PRAGMAS to a new connection (see homevisit.signals)."""
+    if connection.vendor != "sqlite":
+        return
+
+    # Use the DB-API connection directly, so the PRAGMAs aren't logged as queries
+    for name, value in settings.HOMEVISIT_SQLITE_PRAGMAS.items():
+        connection.connection.execute(f"PRAGMA {name} = {value}")
+    logger.debug("Configured SQLite connection: %s", settings.HOMEVISIT_SQLITE_PRAGMAS)
+
+
+# Arbitrary (but fixed) key of the PostgreSQL advisory lock taken by lock_schedule()
+SCHEDULE_LOCK_ID = 4_632_001
+
+
+def lock_schedule(connection=default_connection) -> None:
+    """Serializes transactions that check for overlaps and then schedule meetings.
+
+    Must be called inside a transaction: the lock is held until it ends. A no-op on
+    backends (like SQLite) that already serialize writers.
+    """
+    if connection.vendor != "postgresql":
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_xact_lock(%s)", [SCHEDULE_LOCK_ID])
@@ -0,0 +1,169 @@
+"""Streams reports of households, meetings and feedback as CSV or JSON.
+
+Rows are read with ``values_list(...).iterator(chunk_size=...)`` (no model instances,
+no per-row queries) and written out as they arrive, so large exports use constant
+memory and start sending bytes immediately. Used by the admin's export actions and the
+`export` management command.
+"""
+import csv
+import json
+from datetime import date, datetime
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple, Type
+
+from django.db.models import Model, OuterRef, QuerySet, Subquery
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from .models import Feedback, Household, Meeting, Person
+
+CHUNK_SIZE = 2000
+
+CONTENT_TYPES = {"csv": "text/csv", "json": "application/json"}
+
+
+def _prepare_households(queryset: QuerySet) -> QuerySet:
+    """Annotates each household's owner and next meeting (one query in total)."""
+    owners = Person.objects.filter(household=OuterRef("pk")).order_by("pk")
+    upcoming = Meeting.objects.filter(
+        household=OuterRef("pk"), start__gte=timezone.now()
+    ).order_by("start")
+    return queryset.annotate(
+        **{
+            f"export_owner_{field}": Subquery(owners.values(field)[:1])
+            for field in ["first_name", "last_name", "email", "phone_number"]
+        },
+        export_next_meeting=Subquery(upcoming.values("start")[:1]),
+    )
+
+
+def _unchanged(queryset: QuerySet) -> QuerySet:
+    return queryset
+
+
+class Export(NamedTuple):
+    """Which columns (``name``, ``values_list`` field) to export from a model."""
+
+    model: Type[Model]
+    columns: List[Tuple[str, str]]
+    prepare: Callable[[QuerySet], QuerySet] = _unchanged
+
+    @property
+    def headers(self) -> List[str]:
+        return [name for name, _ in self.columns]
+
+
+EXPORTS: Dict[str, Export] = {
+    "households": Export(
+        Household,
+        [
+            ("id", "pk"),
+            ("address", "address"),
+            ("owner_first_name", "export_owner_first_name"),
+            ("owner_last_name", "export_owner_last_name"),
+            ("owner_email", "export_owner_email"),
+            ("owner_phone_number", "export_owner_phone_number"),
+            ("next_meeting", "export_next_meeting"),
+            ("created_date", "created_date"),
+        ],
+        _prepare_households,
+    ),
+    "meetings": Export(
+        Meeting,
+        [
+            ("id", "pk"),
+            ("name", "name"),
+            ("start", "start"),
+            ("end", "end"),
+            ("group", "group__name"),
+            ("reserved", "reserved"),
+            ("household_id", "household_id"),
+            ("household_address", "household__address"),
+        ],
+    ),
+    "feedback": Export(
+        Feedback,
+        [
+            ("id", "pk"),
+            ("name", "name"),
+            ("email", "email"),
+            ("phone_number", "phone_number"),
+            ("issue", "issue"),
+            ("comment", "comment"),
+            ("created_date", "created_date"),
+            ("responded", "responded"),
+        ],
+    ),
+}
+
+
+def _cell(value):
+    """Converts a value to a CSV/JSON friendly one (datetimes in local time)."""
+    if isinstance(value, datetime):
+        return timezone.localtime(value).isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)  # ex: PhoneNumber
+
+
+def rows(
+    export: Export, queryset: QuerySet = None, chunk_size: int = CHUNK_SIZE
+) -> Iterator[Tuple]:
+    """Yields the exported rows, in primary key order.
+
+    :param export: one of EXPORTS
+    :param queryset: the rows to export (ex: the admin's selection). Default: all
+    :param chunk_size: the number of rows fetched from the database at a time
+    """
+    if queryset is None:
+        queryset = export.model._default_manager.all()
+    # Drop the admin's prefetches: they don't apply to values_list()
+    queryset = export.prepare(queryset.prefetch_related(None)).order_by("pk")
+    fields = [field for _, field in export.columns]
+    for row in queryset.values_list(*fields).iterator(chunk_size=chunk_size):
+        yield tuple(_cell(value) for value in row)
+
+
+class _Echo:
+    """A file-like object that returns (rather than buffers) what csv.writer writes."""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(export: Export, queryset: QuerySet = None, **kwargs) -> Iterator[str]:
+    writer = csv.writer(_Echo())
+    yield writer.writerow(export.headers)
+    for row in rows(export, queryset, **kwargs):
+        yield writer.writerow(row)
+
+
+def stream_json(export: Export, queryset: QuerySet = None, **kwargs) -> Iterator[str]:
+    """Yields a JSON array of objects, one per row."""
+    separator = "[\n"
+    for row in rows(export, queryset, **kwargs):
+        yield separator + json.dumps(dict(zip(export.headers, row)))
+        separator = ",\n"
+    yield "[]\n" if separator == "[\n" else "\n]\n"
+
+
+STREAMS = {"csv": stream_csv, "json": stream_json}
+
+
+def stream(
+    name: str, export_format: str, queryset: QuerySet = None, **kwargs
+) -> Iterator[str]:
+    """Yields the named export (see EXPORTS) in ``export_format`` ("csv" or "json")."""
+    return STREAMS[export_format](EXPORTS[name], queryset, **kwargs)
+
+
+def streaming_response(
+    name: str, export_format: str, queryset: Optional[QuerySet] = None
+) -> StreamingHttpResponse:
+    """Returns a downloadable export, streamed as it is read from the database."""
+    response = StreamingHttpResponse(
+        stream(name, export_format, queryset), content_type=CONTENT_TYPES[export_format]
+    )
+    response["Content-Disposition"] = f'attachment; filename="{name}.{export_format}"'
+    return response
@@ -1,32 +1,74 @@
-from datetime import timedelta
 import logging
 
 from django import forms
-from django.conf import settings
-from django.utils import timezone
-from django.urls import reverse
 from crispy_forms.helper import FormHelper
 from crispy_forms.layout import Layout, Div, Field, Submit
 
-from .models import Household, Person, Meeting, MeetingGroup, Feedback
+from . import availability
+from .models import Household, Person, Meeting, Feedback
 
 logger = logging.getLogger(__name__)
 
+SLOT_TAKEN_ERROR = "This time was just reserved by someone else. Please choose another."
 
-def get_meeting_dates():
-    now = timezone.now().date()
-    max_start = now + timedelta(weeks=settings.HOMEVISIT_HIDE_WEEKS_AFTER)
-
-    mtg_group_query = (
-        MeetingGroup.objects.filter(date__gte=now)
-        .filter(date__lte=max_start)
-        .exclude(meeting__household__isnull=False)
-        .order_by("date")
+
+def _household_helper():
+    helper = FormHelper()
+    helper.form_tag = False
+    helper.layout = Layout(
+        Div(Field("address", wrapper_class="col-md-12"), css_class="row"),
+        Div(
+            Field("meeting_dates", wrapper_class="col-md-6"),
+            Field("meeting", wrapper_class="col-md-6"),
+            css_class="row",
+        ),
+    )
+    return helper
+
+
+def _owner_helper():
+    helper = FormHelper()
+    helper.form_tag = False
+    helper.layout = Layout(
+        Div(
+            Field("first_name", wrapper_class="col-md-6"),
+            Field("last_name", wrapper_class="col-md-6"),
+            css_class="row",
+        ),
+        Div(
+            Field("email", wrapper_class="col-md-6"),
+            Field("phone_number", wrapper_class="col-md-6"),
+            css_class="row",
+        ),
+    )
+    return helper
+
+
+def _feedback_helper():
+    helper = FormHelper()
+    helper.form_method = "post"
+    # A URL name: crispy reverses it when rendering (as URLs aren't loaded yet)
+    helper.form_action = "contact"
+    helper.layout = Layout(
+        Div(
+            Field("name", wrapper_class="col-md-6"),
+            Field("email", wrapper_class="col-md-6"),
+            css_class="row",
+        ),
+        Div(
+            Field("phone_number", wrapper_class="col-md-6"),
+            Field("issue", wrapper_class="col-md-6"),
+            css_class="row",
+        ),
+        Div(Field("comment", wrapper_class="col-md-12"), css_class="row"),
     )
+    helper.add_input(Submit("submit", "Submit", css_class="btn-success"))
+    return helper
 
+
+def get_meeting_dates():
     weeks_list = [("", "Select available date here...")]
-    for group in mtg_group_query:
-        weeks_list.append((group.id, group.date_string()))
+    weeks_list.extend(availability.get_open_groups())
     return weeks_list
 
 
@@ -47,82 +89,43 @@ class HouseholdForm(forms.ModelForm):
         help_text="Choose meeting date first",
     )
 
+    # Layouts are only read while rendering, so every form instance shares one helper
+    helper = _household_helper()
+
     class Meta:
         model = Household
         fields = ["address"]
-
-    def __init__(self, *args, **kwargs):
-        super(HouseholdForm, self).__init__(*args, **kwargs)
-        self.fields["address"].widget.attrs.update({"rows": "4"})
-
-        self.helper = FormHelper()
-        self.helper.form_tag = False
-
-        self.helper.layout = Layout(
-            Div(Field("address", wrapper_class="col-md-12"), css_class="row"),
-            Div(
-                Field("meeting_dates", wrapper_class="col-md-6"),
-                Field("meeting", wrapper_class="col-md-6"),
-                css_class="row",
-            ),
-        )
+        widgets = {"address": forms.Textarea(attrs={"rows": "4"})}
 
     def clean(self):
         super().clean()
         if "meeting" in self.cleaned_data:
             meeting_id = self.cleaned_data.get("meeting")
-            query = Meeting.objects.filter(pk=meeting_id).filter(household=None)
-            self.cleaned_data["meeting_obj"] = query.get()
+            meeting = None
+            if meeting_id.isdigit():
+                query = Meeting.objects.filter(pk=meeting_id).filter(household=None)
+                meeting = query.first()
+            if meeting is None:
+                self.add_error("meeting", SLOT_TAKEN_ERROR)
+                return self.cleaned_data
+
+            self.cleaned_data["meeting_obj"] = meeting
             logger.debug("HouseholdForm valid with cleaned_data: %s", self.cleaned_data)
         return self.cleaned_data
 
 
 class OwnerForm(forms.ModelForm):
+    helper = _owner_helper()
+
     class Meta:
         model = Person
         exclude = ["notes", "household"]
 
-    def __init__(self, *args, **kwargs):
-        super(OwnerForm, self).__init__(*args, **kwargs)
-        self.helper = FormHelper()
-        self.helper.form_tag = False
-        self.helper.layout = Layout(
-            Div(
-                Field("first_name", wrapper_class="col-md-6"),
-                Field("last_name", wrapper_class="col-md-6"),
-                css_class="row",
-            ),
-            Div(
-                Field("email", wrapper_class="col-md-6"),
-                Field("phone_number", wrapper_class="col-md-6"),
-                css_class="row",
-            ),
-        )
-
 
 class FeedbackForm(forms.ModelForm):
+    helper = _feedback_helper()
+
     class Meta:
         model = Feedback
         fields = ["name", "email", "phone_number", "issue", "comment"]
-
-    def __init__(self, *args, **kwargs):
-        super(FeedbackForm, self).__init__(*args, **kwargs)
-        self.fields["comment"].widget.attrs.update({"rows": "4"})
-
-        self.helper = FormHelper()
-        self.helper.form_method = "post"
-        self.helper.form_action = reverse("contact")
-        self.helper.layout = Layout(
-            Div(
-                Field("name", wrapper_class="col-md-6"),
-                Field("email", wrapper_class="col-md-6"),
-                css_class="row",
-            ),
-            Div(
-                Field("phone_number", wrapper_class="col-md-6"),
-                Field("issue", wrapper_class="col-md-6"),
-                css_class="row",
-            ),
-            Div(Field("comment", wrapper_class="col-md-12"), css_class="row"),
-        )
-        self.helper.add_input(Submit("submit", "Submit", css_class="btn-success"))
+        widgets = {"comment": forms.Textarea(attrs={"rows": "4"})}
@@ -0,0 +1,115 @@
+"""Reuses open email backend (SMTP) connections across messages.
+
+Opening an SMTP connection costs a TCP + TLS handshake and a login, so instead of a new
+connection per message (Django's default for EmailMessage.send), each thread keeps one
+connection open and reuses it until it has been idle for
+HOMEVISIT_EMAIL_POOL_IDLE_SECONDS.
+"""
+import logging
+import smtplib
+import threading
+import time
+from typing import List, Optional
+
+from django.conf import settings
+from django.core.mail import get_connection
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionPool:
+    def __init__(self, idle_timeout: float = None):
+        self._idle_timeout = idle_timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.handshakes = 0
+        self.messages_sent = 0
+        self.send_seconds = 0.0
+
+    @property
+    def idle_timeout(self) -> float:
+        if self._idle_timeout is None:
+            return settings.HOMEVISIT_EMAIL_POOL_IDLE_SECONDS
+        return self._idle_timeout
+
+    @property
+    def handshakes_saved(self) -> int:
+        """Handshakes avoided compared to opening one connection per message."""
+        return self.messages_sent - self.handshakes
+
+    def stats(self) -> dict:
+        return {
+            "handshakes": self.handshakes,
+            "messages_sent": self.messages_sent,
+            "handshakes_saved": self.handshakes_saved,
+            "send_seconds": self.send_seconds,
+        }
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        last_used = getattr(self._local, "last_used", 0)
+        if connection is not None and time.monotonic() - last_used > self.idle_timeout:
+            self.close()
+            connection = None
+
+        if connection is None:
+            connection = get_connection(fail_silently=False)
+            connection.open()
+            self._local.connection = connection
+            with self._lock:
+                self.handshakes += 1
+        return connection
+
+    def _send(self, message) -> None:
+        connection = self._connection()
+        try:
+            connection.send_messages([message])
+        except smtplib.SMTPServerDisconnected:
+            # The server closed our idle connection: reconnect once and retry
+            logger.debug("Email connection was closed by the server. Reconnecting...")
+            self.close()
+            self._connection().send_messages([message])
+        self._local.last_used = time.monotonic()
+
+    def send_messages(self, messages) -> List[Optional[Exception]]:
+        """Sends messages over this thread's pooled connection.
+
+        Unlike a backend's send_messages(), a failed message doesn't stop the batch.
+
+        :return: for each message, the error that prevented sending it (or None)
+        """
+        errors: List[Optional[Exception]] = []
+        for message in messages:
+            started = time.perf_counter()
+            try:
+                self._send(message)
+            except Exception as error:
+                logger.debug("Failed to send '%s': %s", message.subject, error)
+                # Don't reuse a connection that may be in a bad state
+                self.close()
+                errors.append(error)
+                continue
+            finally:
+                with self._lock:
+                    self.send_seconds += time.perf_counter() - started
+
+            errors.append(None)
+            with self._lock:
+                self.messages_sent += 1
+        return errors
+
+    def close(self) -> None:
+        """Closes this thread's pooled connection (if open)."""
+        connection = getattr(self._local, "connection", None)
+        self._local.connection = None
+        if connection is not None:
+            connection.close()
+
+    def close_idle(self) -> None:
+        """Closes this thread's connection if it has been idle for too long."""
+        last_used = getattr(self._local, "last_used", 0)
+        if time.monotonic() - last_used > self.idle_timeout:
+            self.close()
+
+
+pool = ConnectionPool()
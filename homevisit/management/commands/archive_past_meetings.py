@@ -0,0 +1,59 @@
+import logging
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+
+from homevisit import archive
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "moves past meetings (and their groups) to the archive tables"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            help="Archive meetings that ended before this many days ago. "
+            f"Default: {settings.HOMEVISIT_ARCHIVE_AFTER_DAYS}",
+            type=int,
+        )
+        parser.add_argument(
+            "--batch-size",
+            help=f"The meeting groups archived per transaction. Default: "
+            f"{archive.BATCH_SIZE}",
+            type=int,
+            default=archive.BATCH_SIZE,
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Only report what would be archived"
+        )
+
+    def handle(self, *args, **options):
+        days = options["days"]
+        if days is not None and days < 0:
+            raise CommandError("--days must not be negative")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive")
+
+        cutoff = archive.get_cutoff(days)
+        if options["dry_run"]:
+            counts = archive.archivable_groups(cutoff).aggregate(
+                groups=Count("pk", distinct=True), meetings=Count("meeting")
+            )
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Dry run: would archive {counts['meetings']} meetings in "
+                    f"{counts['groups']} meeting groups (before {cutoff.date()})"
+                )
+            )
+            return
+
+        meetings, groups = archive.archive_past(cutoff, options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Archived {meetings} meetings in {groups} meeting groups "
+                f"(before {cutoff.date()})"
+            )
+        )
@@ -0,0 +1,126 @@
+import inspect
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from homevisit.benchmarks import booking, pagination, rendering
+from homevisit.benchmarks import results as benchmark_results, scheduling, search
+
+logger = logging.getLogger(__name__)
+
+SUITES = {
+    "scheduling": scheduling,
+    "booking": booking,
+    "rendering": rendering,
+    "search": search,
+    "pagination": pagination,
+}
+
+
+class Command(BaseCommand):
+    help = "runs performance benchmarks against a throwaway test database"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "suites",
+            help=f"The benchmark suites to run. Default: all ({' '.join(SUITES)})",
+            metavar="suite",
+            nargs="*",
+        )
+        parser.add_argument(
+            "--sizes",
+            help="The data volumes to benchmark. Default depends on the suite",
+            nargs="+",
+            type=int,
+        )
+        parser.add_argument(
+            "--batch-size",
+            help="The bulk_create batch size. Default: 500",
+            type=int,
+            default=500,
+        )
+        parser.add_argument(
+            "--requests",
+            help="The number of requests timed per page. Default depends on the suite",
+            type=int,
+        )
+        parser.add_argument(
+            "--output", help="Write the results to this JSON file", metavar="PATH"
+        )
+        parser.add_argument(
+            "--baseline",
+            help="Fail if results regressed compared to this JSON file (from --output)",
+            metavar="PATH",
+        )
+        parser.add_argument(
+            "--max-regression",
+            help="The allowed regression (in percent) compared to --baseline. "
+            "Default: 20",
+            type=float,
+            default=20,
+        )
+
+    @staticmethod
+    def _run_suite(suite, options):
+        run = SUITES[suite].run
+        parameters = inspect.signature(run).parameters
+        kwargs = {
+            name: options[name]
+            for name in ("sizes", "batch_size", "requests")
+            if name in parameters
+        }
+        return run(**kwargs)
+
+    def _write(self, result):
+        line = (
+            f"{result['suite']:>12} {result['name']:>15} "
+            f"{result['size']:>8}: {result['seconds']:8.3f}s "
+            f"({result['per_second']:,.0f}/sec)"
+        )
+        if "p50_ms" in result:
+            line += (
+                f" p50={result['p50_ms']:.1f}ms p95={result['p95_ms']:.1f}ms"
+                f" p99={result['p99_ms']:.1f}ms"
+                f" cpu={result['cpu_ms']:.1f}ms"
+                f" queries={result['queries_per_request']:.1f}"
+                f" db={result['db_ms']:.2f}ms"
+            )
+        if "cached_templates" in result:
+            line += f" cached_templates={result['cached_templates']}"
+        self.stdout.write(line)
+
+    def handle(self, *args, **options):
+        suites = options["suites"] or list(SUITES)
+        unknown = [suite for suite in suites if suite not in SUITES]
+        if unknown:
+            self.stderr.write(self.style.ERROR(f"Unknown benchmark suites: {unknown}"))
+            return
+
+        # The booking suite uses the test client (and must never send real email)
+        setup_test_environment()
+        test_db = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        all_results = []
+        try:
+            for suite in suites:
+                logger.info("Running '%s' benchmarks...", suite)
+                for result in self._run_suite(suite, options):
+                    self._write(result)
+                    all_results.append(result)
+        finally:
+            connection.creation.destroy_test_db(test_db, verbosity=0)
+            teardown_test_environment()
+
+        if options["output"]:
+            benchmark_results.save(options["output"], all_results)
+            logger.info("Wrote benchmark results to %s", options["output"])
+        if options["baseline"]:
+            regressions = benchmark_results.find_regressions(
+                benchmark_results.load(options["baseline"]),
+                all_results,
+                options["max_regression"],
+            )
+            if regressions:
+                raise CommandError("Performance regressed:\n" + "\n".join(regressions))
+        self.stdout.write(self.style.SUCCESS("Done!"))
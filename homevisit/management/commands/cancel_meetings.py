@@ -1,34 +1,106 @@
 import logging
+from datetime import datetime, time, timedelta
+from functools import reduce
+from operator import or_
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+from django.utils import timezone
 
-from homevisit.models import Meeting
-from homevisit.management.commands.create_meetings import _valid_date
+from homevisit import bulk
+from homevisit.models import Meeting, Weekdays
+from homevisit.management.commands.create_meetings import _valid_date, WEEKDAY_NAMES
 
 logger = logging.getLogger(__name__)
 
 
+def _local_midnight(day):
+    return timezone.make_aware(datetime.combine(day, time()))
+
+
+def _day_range(first_day, last_day):
+    """Matches meetings starting between first_day and last_day (inclusive).
+
+    Compares `start` directly (rather than `start__date`) so an index can be used.
+    """
+    return Q(start__gte=_local_midnight(first_day)) & Q(
+        start__lt=_local_midnight(last_day + timedelta(days=1))
+    )
+
+
+def _django_week_day(weekday_name):
+    """Converts a Weekdays name (Monday==0) to Django's week_day (Sunday==1)."""
+    return (Weekdays[weekday_name].value + 1) % 7 + 1
+
+
 class Command(BaseCommand):
     help = "cancels meetings based on parameters"
 
     def add_arguments(self, parser):
         parser.add_argument(
             "dates",
-            help=f"The dates to cancel. Expected format: YYYY-mm-dd",
+            help="The dates to cancel. Expected format: YYYY-mm-dd",
             metavar="date",
-            nargs="+",
+            nargs="*",
+            type=_valid_date,
+        )
+        parser.add_argument(
+            "--from",
+            help="Cancel meetings on or after this date: YYYY-mm-dd",
+            dest="from_date",
             type=_valid_date,
         )
+        parser.add_argument(
+            "--to",
+            help="Cancel meetings on or before this date: YYYY-mm-dd",
+            dest="to_date",
+            type=_valid_date,
+        )
+        parser.add_argument(
+            "--days",
+            help="Only cancel meetings on these days of the week. Ex: 'MON WED FRI'",
+            metavar="day",
+            nargs="+",
+            choices=WEEKDAY_NAMES,
+        )
+
+    def _build_filter(self, dates, from_date, to_date):
+        filters = [_day_range(cancel_date, cancel_date) for cancel_date in dates]
+        if from_date and to_date:
+            filters.append(_day_range(from_date, to_date))
+        elif from_date:
+            filters.append(Q(start__gte=_local_midnight(from_date)))
+        elif to_date:
+            filters.append(Q(start__lt=_local_midnight(to_date + timedelta(days=1))))
+        return reduce(or_, filters)
 
     def handle(self, *args, **options):
         dates = options["dates"]
+        from_date = options["from_date"]
+        to_date = options["to_date"]
+        days = options["days"]
+        if not dates and not from_date and not to_date:
+            raise CommandError("Provide the dates to cancel and/or a --from/--to range")
+        if from_date and to_date and to_date < from_date:
+            raise CommandError("--to must not be before --from")
+
         logger.info(
-            f"Cancelling meetings that occur on: %s ...",
+            "Cancelling meetings that occur on: %s [from=%s] [to=%s] [days=%s] ...",
             [str(cancel_dt) for cancel_dt in dates],
+            from_date,
+            to_date,
+            days,
         )
 
-        for cancel_date in dates:
-            meeting = Meeting.objects.filter(start__date=cancel_date)
-            if meeting:
-                meeting.delete()
-                logger.info(f"Cancelled {str(cancel_date)} meeting")
+        query = Meeting.objects.filter(self._build_filter(dates, from_date, to_date))
+        if days:
+            query = query.filter(start__week_day__in=[_django_week_day(d) for d in days])
+
+        cancelled, groups_deleted = bulk.cancel_meetings(query)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Cancelled {cancelled} meetings and deleted {groups_deleted} emptied "
+                "meeting groups"
+            )
+        )
@@ -3,8 +3,11 @@ import logging
 
 import pytz
 from datetime import datetime, timedelta
-from django.core.management.base import BaseCommand
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
 
+from homevisit import availability, db, overlaps
 from homevisit.models import MeetingGroup, Meeting, Weekdays
 
 logger = logging.getLogger(__name__)
@@ -32,6 +35,50 @@ def _valid_time(s):
         raise argparse.ArgumentTypeError(msg)
 
 
+def _build_batch(name, begin_date, final_date, start_times, duration_mins, days):
+    """Builds (unsaved) meeting groups and meetings for every requested day.
+
+    :return: a list of ``(group, meetings)`` tuples, one per matching day
+    """
+    batch = []
+    date_pst = pacific.localize(datetime.combine(begin_date, start_times[0]))
+    while date_pst.date() <= final_date:
+        weekday = date_pst.weekday()
+        date_only_pst = date_pst.date()
+        if Weekdays(weekday).name in days:
+            group = MeetingGroup(name=f"{name}: {str(date_only_pst)}", date=date_only_pst)
+            meetings = []
+            for start_time in start_times:
+                meeting_start_pst = pacific.localize(
+                    datetime.combine(date_only_pst, start_time)
+                )
+                meeting_start_utc = meeting_start_pst.astimezone(pytz.utc)
+                meeting_end_utc = meeting_start_utc + timedelta(minutes=duration_mins)
+                meetings.append(
+                    Meeting(name=name, start=meeting_start_utc, end=meeting_end_utc)
+                )
+            batch.append((group, meetings))
+        date_pst = date_pst + timedelta(days=1)
+    return batch
+
+
+def _insert_groups(groups, batch_size):
+    """Inserts ``groups`` with bulk_create(), and sets their ids.
+
+    Backends that return ids from a bulk INSERT (like PostgreSQL) set them directly.
+    SQLite doesn't, but it serializes writers and never reuses an AUTOINCREMENT id, so
+    the inserted groups are the ones with the largest ids until the transaction ends:
+    they're read back with one query. Must be called inside a transaction.
+    """
+    MeetingGroup.objects.bulk_create(groups, batch_size=batch_size)
+    if not groups or groups[0].pk is not None:
+        return
+
+    new_ids = MeetingGroup.objects.order_by("-pk").values_list("pk", flat=True)
+    for group, pk in zip(groups, reversed(list(new_ids[: len(groups)]))):
+        group.pk = pk
+
+
 class Command(BaseCommand):
     help = "creates new batches of meetings based on parameters"
 
@@ -67,6 +114,35 @@ class Command(BaseCommand):
             type=int,
             default=60,
         )
+        parser.add_argument(
+            "--bulk",
+            help="Insert the groups and meetings in batches (the default)",
+            action="store_true",
+            dest="bulk",
+            default=True,
+        )
+        parser.add_argument(
+            "--no-bulk",
+            help="Save each meeting individually, rather than inserting them all at once",
+            action="store_false",
+            dest="bulk",
+        )
+        parser.add_argument(
+            "--batch-size",
+            help="The max number of meetings per INSERT (unless --no-bulk). Default: 500",
+            type=int,
+            default=500,
+        )
+        parser.add_argument(
+            "--dry-run",
+            help="Only report how many groups and meetings would be created",
+            action="store_true",
+        )
+        parser.add_argument(
+            "--verbose",
+            help="Print every created group and meeting",
+            action="store_true",
+        )
 
     def handle(self, *args, **options):
         name = options["name"]
@@ -86,33 +162,71 @@ class Command(BaseCommand):
             f"          days: {days}\n"
         )
 
-        date_pst = pacific.localize(datetime.combine(begin_date, start_times[0]))
-        while date_pst.date() <= final_date:
-            weekday = date_pst.weekday()
-            date_only_pst = date_pst.date()
-            if Weekdays(weekday).name in days:
-                group = MeetingGroup(
-                    name=f"{name}: {str(date_only_pst)}", date=date_only_pst
+        batch = _build_batch(
+            name, begin_date, final_date, start_times, duration_mins, days
+        )
+        meeting_count = sum(len(meetings) for (_, meetings) in batch)
+
+        if options["dry_run"]:
+            self._validate(batch)
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Dry run: would create {len(batch)} meeting groups and "
+                    f"{meeting_count} meetings"
                 )
-                group.save()
+            )
+            return
+
+        # Check and create in one transaction, so a concurrent scheduler can't slip
+        # an overlapping meeting in between
+        with transaction.atomic():
+            db.lock_schedule()
+            self._validate(batch)
+            if options["bulk"]:
+                self._create_bulk(batch, options["batch_size"])
+            else:
+                self._create_per_row(batch)
+        availability.invalidate()
+
+        if options["verbose"]:
+            for group, meetings in batch:
                 self.stdout.write(
                     self.style.SUCCESS(f"Created meeting group: {str(group)}")
                 )
-                for start_time in start_times:
-                    meeting_start_pst = pacific.localize(
-                        datetime.combine(date_only_pst, start_time)
-                    )
-                    meeting_start_utc = meeting_start_pst.astimezone(pytz.utc)
-                    meeting_end_utc = meeting_start_utc + timedelta(minutes=duration_mins)
-                    meeting = Meeting(
-                        name=name,
-                        start=meeting_start_utc,
-                        end=meeting_end_utc,
-                        group=group,
-                    )
-                    meeting.save()
+                for meeting in meetings:
                     self.stdout.write(
                         self.style.SUCCESS(f"    Created meeting: {str(meeting)}")
                     )
-            date_pst = date_pst + timedelta(days=1)
-        self.stdout.write(self.style.SUCCESS(f"Done!\n"))
+        summary = f"Created {len(batch)} meeting groups and {meeting_count} meetings"
+        self.stdout.write(self.style.SUCCESS(f"Done! {summary}\n"))
+
+    @staticmethod
+    def _validate(batch):
+        try:
+            overlaps.validate_no_overlaps(
+                meeting for (_, meetings) in batch for meeting in meetings
+            )
+        except ValidationError as error:
+            raise CommandError(error.messages[0])
+
+    @staticmethod
+    def _create_bulk(batch, batch_size):
+        groups = [group for (group, _) in batch]
+        with transaction.atomic():
+            _insert_groups(groups, batch_size)
+            all_meetings = []
+            for group, meetings in batch:
+                for meeting in meetings:
+                    meeting.group = group
+                all_meetings.extend(meetings)
+            Meeting.objects.bulk_create(all_meetings, batch_size=batch_size)
+            # bulk_create() doesn't send post_save: count the new meetings here
+            MeetingGroup.objects.filter(pk__in=[g.pk for g in groups]).refresh_counters()
+
+    @staticmethod
+    def _create_per_row(batch):
+        for group, meetings in batch:
+            group.save()
+            for meeting in meetings:
+                meeting.group = group
+                meeting.save()
@@ -0,0 +1,50 @@
+import logging
+
+from django.core.management.base import BaseCommand
+
+from homevisit import exports
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "streams an export of households, meetings or feedback as CSV or JSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "name", help="What to export", choices=sorted(exports.EXPORTS)
+        )
+        parser.add_argument(
+            "--format",
+            help="Default: csv",
+            dest="export_format",
+            choices=sorted(exports.STREAMS),
+            default="csv",
+        )
+        parser.add_argument(
+            "--output", help="The file to write. Default: standard output", default="-"
+        )
+        parser.add_argument(
+            "--chunk-size",
+            help=f"The number of rows read at a time. Default: {exports.CHUNK_SIZE}",
+            type=int,
+            default=exports.CHUNK_SIZE,
+        )
+
+    def handle(self, *args, **options):
+        name = options["name"]
+        output = options["output"]
+        logger.info("Exporting %s to %s ...", name, output)
+
+        chunks = exports.stream(
+            name, options["export_format"], chunk_size=options["chunk_size"]
+        )
+        if output == "-":
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+            return
+
+        with open(output, "w", newline="") as out:
+            for chunk in chunks:
+                out.write(chunk)
+        self.stdout.write(self.style.SUCCESS(f"Done! Exported {name} to {output}"))
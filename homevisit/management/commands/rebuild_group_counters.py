@@ -0,0 +1,53 @@
+import logging
+
+from django.core.management.base import BaseCommand
+from django.db.models import F
+
+from homevisit import availability
+from homevisit.models import MeetingGroup
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "recounts each meeting group's total_slots and open_slots from its meetings"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report the meeting groups whose counters have drifted",
+        )
+
+    def handle(self, *args, **options):
+        drifted = (
+            MeetingGroup.objects.with_slot_counts()
+            .exclude(total_slots=F("slot_count"), open_slots=F("open_slot_count"))
+            .order_by("date")
+        )
+        for group in drifted:
+            logger.warning(
+                "[group=%s] counters drifted: total_slots=%d (actual %d) "
+                "open_slots=%d (actual %d)",
+                group.pk,
+                group.total_slots,
+                group.slot_count,
+                group.open_slots,
+                group.open_slot_count,
+            )
+        drifted_count = len(drifted)
+
+        if options["dry_run"]:
+            self.stdout.write(
+                self.style.SUCCESS(f"Dry run: {drifted_count} meeting groups drifted")
+            )
+            return
+
+        rebuilt = MeetingGroup.objects.all().refresh_counters()
+        availability.invalidate()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done! Rebuilt the counters of {rebuilt} meeting groups "
+                f"({drifted_count} had drifted)"
+            )
+        )
@@ -0,0 +1,18 @@
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+
+from homevisit import search
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "rebuilds the households' full-text search index"
+
+    def handle(self, *args, **options):
+        if not search.is_available():
+            raise CommandError("Full-text search isn't supported by this database")
+
+        indexed = search.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Done! Indexed {indexed} households"))
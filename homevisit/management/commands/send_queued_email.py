@@ -0,0 +1,65 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from homevisit import outbox
+from homevisit.mail import pool
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "delivers queued emails, retrying failures with exponential backoff"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            help="Send whatever is currently due and exit (instead of polling)",
+            action="store_true",
+        )
+        parser.add_argument(
+            "--interval",
+            help="Seconds to wait between polls when the queue is empty. Default: 10",
+            type=float,
+            default=10,
+        )
+        parser.add_argument(
+            "--batch-size",
+            help="The max number of emails to send per poll. Default: 50",
+            type=int,
+            default=50,
+        )
+        parser.add_argument(
+            "--max-attempts",
+            help="Give up on an email after this many failed attempts. "
+            f"Default: {settings.HOMEVISIT_EMAIL_MAX_ATTEMPTS}",
+            type=int,
+            default=settings.HOMEVISIT_EMAIL_MAX_ATTEMPTS,
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        logger.info("Delivering queued email [batch_size=%d] ...", batch_size)
+        while True:
+            sent, failed = outbox.send_due(batch_size, options["max_attempts"])
+            if sent or failed:
+                self.stdout.write(f"Sent {sent} emails ({failed} failed)")
+            if options["once"]:
+                break
+            if sent + failed < batch_size:
+                pool.close_idle()
+                time.sleep(options["interval"])
+        pool.close()
+
+        stats = pool.stats()
+        logger.info("Email connection stats: %s", stats)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done! Opened {stats['handshakes']} connections for "
+                f"{stats['messages_sent']} emails "
+                f"in {stats['send_seconds']:.2f}s "
+                f"({stats['handshakes_saved']} handshakes saved)"
+            )
+        )
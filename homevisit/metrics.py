@@ -0,0 +1,78 @@
+"""Aggregated per-view request metrics, recorded by RequestMetricsMiddleware.
+
+Metrics are kept in memory, so each server process aggregates its own requests.
+"""
+import threading
+from typing import Dict, Sequence
+
+TIME_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    """Counts values by bucket (the smallest upper bound they fit under)."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # the last bucket is for bigger values
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        index = next(
+            (i for i, bound in enumerate(self.buckets) if value <= bound),
+            len(self.buckets),
+        )
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def snapshot(self) -> Dict:
+        labels = [f"<={bound}" for bound in self.buckets] + [f">{self.buckets[-1]}"]
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "max": self.max,
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+def _new_view_metrics() -> Dict[str, Histogram]:
+    return {
+        "wall_ms": Histogram(TIME_BUCKETS_MS),
+        "queries": Histogram(QUERY_BUCKETS),
+        "db_ms": Histogram(TIME_BUCKETS_MS),
+        "template_ms": Histogram(TIME_BUCKETS_MS),
+    }
+
+
+_lock = threading.Lock()
+_views: Dict[str, Dict[str, Histogram]] = {}
+
+
+def record(view: str, **values: float) -> None:
+    """Records one request to ``view``.
+
+    :param view: the view's name
+    :param values: the request's wall_ms, queries, db_ms and template_ms
+    """
+    with _lock:
+        view_metrics = _views.setdefault(view, _new_view_metrics())
+        for name, value in values.items():
+            view_metrics[name].add(value)
+
+
+def snapshot() -> Dict[str, Dict]:
+    """Returns the metrics recorded (by this process) for each view."""
+    with _lock:
+        return {
+            view: {name: histogram.snapshot() for name, histogram in metrics.items()}
+            for view, metrics in sorted(_views.items())
+        }
+
+
+def reset() -> None:
+    with _lock:
+        _views.clear()
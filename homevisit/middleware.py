@@ -0,0 +1,94 @@
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class _RequestTimer:
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.template_seconds = 0.0
+        self._render_started = None
+
+    def time_query(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_seconds += time.perf_counter() - started
+            self.queries += 1
+
+    def start_render(self):
+        self._render_started = time.perf_counter()
+
+    def end_render(self, response):
+        if self._render_started is not None:
+            self.template_seconds += time.perf_counter() - self._render_started
+            self._render_started = None
+
+
+class RequestMetricsMiddleware:
+    """Records each request's wall time, DB query count + time and render time.
+
+    Every request is logged (in key=value format) and aggregated into
+    ``homevisit.metrics``. Requests issuing more than HOMEVISIT_QUERY_BUDGET queries
+    are logged as warnings.
+
+    Template render time covers TemplateResponses (i.e. class-based views); templates
+    rendered within a view (ex: with ``render()``) are included in its wall time.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = _RequestTimer()
+        request.homevisit_timer = timer
+
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer.time_query))
+            response = self.get_response(request)
+        wall_ms = (time.perf_counter() - started) * 1000
+
+        match = getattr(request, "resolver_match", None)
+        view = match.view_name if match else "<unresolved>"
+        values = {
+            "wall_ms": wall_ms,
+            "queries": timer.queries,
+            "db_ms": timer.db_seconds * 1000,
+            "template_ms": timer.template_seconds * 1000,
+        }
+        metrics.record(view, **values)
+
+        budget = settings.HOMEVISIT_QUERY_BUDGET
+        level = logging.WARNING if budget and timer.queries > budget else logging.INFO
+        logger.log(
+            level,
+            "view=%s method=%s status=%d wall_ms=%.1f queries=%d db_ms=%.1f "
+            "template_ms=%.1f%s",
+            view,
+            request.method,
+            response.status_code,
+            wall_ms,
+            timer.queries,
+            values["db_ms"],
+            values["template_ms"],
+            f" over_query_budget={budget}" if level == logging.WARNING else "",
+        )
+        return response
+
+    def process_template_response(self, request, response):
+        # This is the first middleware, so this hook runs just before rendering
+        timer = request.homevisit_timer
+        timer.start_render()
+        response.add_post_render_callback(timer.end_render)
+        return response
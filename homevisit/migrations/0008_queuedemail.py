@@ -0,0 +1,52 @@
+# Generated by Django 2.2.13 on 2026-10-17 18:17
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("homevisit", "0007_meeting_group_nonnull")]
+
+    operations = [
+        migrations.CreateModel(
+            name="QueuedEmail",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("subject", models.CharField(max_length=255)),
+                ("body", models.TextField()),
+                ("from_email", models.EmailField(max_length=254)),
+                ("to", models.TextField(help_text="Comma-separated recipients")),
+                (
+                    "cc",
+                    models.TextField(blank=True, help_text="Comma-separated recipients"),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("PENDING", "Pending"),
+                            ("SENT", "Sent"),
+                            ("FAILED", "Failed"),
+                        ],
+                        default="PENDING",
+                        max_length=10,
+                    ),
+                ),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                ("next_attempt", models.DateTimeField(default=django.utils.timezone.now)),
+                ("last_error", models.TextField(blank=True)),
+                ("created_date", models.DateTimeField(auto_now_add=True)),
+                ("sent_date", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={"verbose_name": "Queued email"},
+        )
+    ]
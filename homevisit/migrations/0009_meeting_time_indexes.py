@@ -0,0 +1,17 @@
+# Generated by Django 2.2.13 on 2026-10-17 18:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("homevisit", "0008_queuedemail")]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="meeting",
+            index=models.Index(
+                fields=["start", "end"], name="homevisit_meeting_start_end"
+            ),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 2.2.13 on 2026-10-17 18:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("homevisit", "0009_meeting_time_indexes")]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="faq",
+            index=models.Index(fields=["created_date"], name="homevisit_faq_created"),
+        ),
+        migrations.AddIndex(
+            model_name="feedback",
+            index=models.Index(
+                fields=["created_date"], name="homevisit_feedback_created"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="feedback",
+            index=models.Index(
+                fields=["responded", "created_date"], name="homevisit_feedback_responded"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="meeting",
+            index=models.Index(
+                fields=["household", "start"], name="homevisit_meeting_hh_start"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="meetinggroup",
+            index=models.Index(fields=["date"], name="homevisit_group_date"),
+        ),
+        migrations.AddIndex(
+            model_name="queuedemail",
+            index=models.Index(
+                fields=["status", "next_attempt"], name="homevisit_email_due"
+            ),
+        ),
+    ]
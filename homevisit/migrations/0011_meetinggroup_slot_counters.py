@@ -0,0 +1,43 @@
+# Generated by Django 2.2.13 on 2026-10-17 18:51
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def count_slots(apps, schema_editor):
+    """Initializes the counters (like the rebuild_group_counters command)."""
+    Meeting = apps.get_model("homevisit", "Meeting")
+    MeetingGroup = apps.get_model("homevisit", "MeetingGroup")
+
+    def slot_count(**filters):
+        meetings = (
+            Meeting.objects.filter(group=models.OuterRef("pk"), **filters)
+            .order_by()
+            .values("group")
+            .annotate(count=models.Count("pk"))
+            .values("count")
+        )
+        return Coalesce(models.Subquery(meetings, output_field=models.IntegerField()), 0)
+
+    MeetingGroup.objects.update(
+        total_slots=slot_count(), open_slots=slot_count(household__isnull=True)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("homevisit", "0010_booking_query_indexes")]
+
+    operations = [
+        migrations.AddField(
+            model_name="meetinggroup",
+            name="open_slots",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="meetinggroup",
+            name="total_slots",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_slots, migrations.RunPython.noop),
+    ]
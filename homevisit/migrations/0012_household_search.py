@@ -0,0 +1,90 @@
+# Generated by Django 2.2.13 on 2026-10-17 19:20
+
+import re
+import sqlite3
+
+from django.db import migrations
+
+# The index as of this migration: later changes to homevisit.search don't apply here
+TABLE = "homevisit_household_search"
+
+CREATE_SQL = {
+    # The rowid is the household's id
+    "sqlite": [f"CREATE VIRTUAL TABLE {TABLE} USING fts5(document)"],
+    # No foreign key: like the FTS5 table, rows are removed by the signals (and a
+    # reference would stop `flush` from truncating homevisit_household)
+    "postgresql": [
+        f"CREATE TABLE {TABLE} ("
+        "household_id integer PRIMARY KEY, document tsvector NOT NULL)",
+        f"CREATE INDEX {TABLE}_document ON {TABLE} USING gin (document)",
+    ],
+}
+
+INSERT_SQL = {
+    "sqlite": f"INSERT INTO {TABLE} (rowid, document) VALUES (%s, %s)",
+    "postgresql": f"INSERT INTO {TABLE} (household_id, document) "
+    "VALUES (%s, to_tsvector('simple', %s))",
+}
+
+DROP_SQL = f"DROP TABLE IF EXISTS {TABLE}"
+
+_WORD = re.compile(r"\w+")
+
+
+def _is_available(connection):
+    if connection.vendor != "sqlite":
+        return connection.vendor in CREATE_SQL
+    db = sqlite3.connect(":memory:")
+    try:
+        db.execute("CREATE VIRTUAL TABLE fts5_check USING fts5(document)")
+        return True
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        db.close()
+
+
+def _document(household):
+    parts = [household.address]
+    for person in household.person_set.all():
+        parts += [person.first_name, person.last_name]
+        phone_number = person.phone_number
+        if not phone_number:
+            continue
+        if phone_number.is_valid():
+            parts.append(
+                f"{phone_number.as_e164} {phone_number.national_number} "
+                f"{phone_number.as_national}"
+            )
+        else:
+            parts.append(str(phone_number))
+    return " ".join(_WORD.findall(" ".join(parts).lower()))
+
+
+def create_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if not _is_available(connection):
+        return
+
+    Household = apps.get_model("homevisit", "Household")
+    households = Household.objects.order_by("pk").prefetch_related("person_set")
+    with connection.cursor() as cursor:
+        for statement in CREATE_SQL[connection.vendor]:
+            cursor.execute(statement)
+        cursor.executemany(
+            INSERT_SQL[connection.vendor],
+            [(household.pk, _document(household)) for household in households],
+        )
+
+
+def drop_index(apps, schema_editor):
+    if _is_available(schema_editor.connection):
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute(DROP_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("homevisit", "0011_meetinggroup_slot_counters")]
+
+    operations = [migrations.RunPython(create_index, drop_index)]
@@ -0,0 +1,75 @@
+# Generated by Django 2.2.13 on 2026-10-17 19:37
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("homevisit", "0012_household_search")]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedMeeting",
+            fields=[
+                ("id", models.IntegerField(primary_key=True, serialize=False)),
+                ("name", models.CharField(max_length=50)),
+                ("start", models.DateTimeField()),
+                ("end", models.DateTimeField()),
+                ("reserved", models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="ArchivedMeetingGroup",
+            fields=[
+                ("id", models.IntegerField(primary_key=True, serialize=False)),
+                ("name", models.CharField(max_length=50)),
+                ("date", models.DateField()),
+                ("archived_date", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="archivedmeetinggroup",
+            index=models.Index(fields=["date"], name="homevisit_archgroup_date"),
+        ),
+        migrations.AddField(
+            model_name="archivedmeeting",
+            name="group",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                to="homevisit.ArchivedMeetingGroup",
+            ),
+        ),
+        migrations.AddField(
+            model_name="archivedmeeting",
+            name="household",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                to="homevisit.Household",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="archivedmeeting",
+            index=models.Index(fields=["start"], name="homevisit_archmeeting_start"),
+        ),
+        migrations.AddIndex(
+            model_name="archivedmeeting",
+            index=models.Index(
+                fields=["household", "start"], name="homevisit_archmeeting_hh"
+            ),
+        ),
+        # Meeting now checks for past dates in clean_fields(), not with validators
+        migrations.AlterField(
+            model_name="meeting", name="end", field=models.DateTimeField()
+        ),
+        migrations.AlterField(
+            model_name="meeting",
+            name="reserved",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name="meeting", name="start", field=models.DateTimeField()
+        ),
+    ]
@@ -3,8 +3,9 @@ from datetime import date, time, datetime, timedelta
 from enum import IntEnum
 from typing import List
 
-
-from django.db import models
+from django.conf import settings
+from django.db import connections, models, transaction
+from django.db.models.functions import Coalesce
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
@@ -25,14 +26,52 @@ def validate_future_date(value):
         raise ValidationError("Date cannot be in the past")
 
 
+def max_meeting_duration() -> timedelta:
+    """The longest a meeting may last (see MeetingQuerySet.overlapping)."""
+    return timedelta(minutes=settings.HOMEVISIT_MAX_MEETING_MINUTES)
+
+
+def validate_duration(meeting) -> None:
+    """Validate that ``meeting`` doesn't last longer than max_meeting_duration()."""
+    if meeting.end - meeting.start > max_meeting_duration():
+        raise ValidationError(
+            f"'{meeting.full_name()}' cannot last longer than "
+            f"{settings.HOMEVISIT_MAX_MEETING_MINUTES} minutes",
+            code="invalid",
+        )
+
+
+class HouseholdQuerySet(models.QuerySet):
+    def with_owner(self):
+        """Prefetches each household's people, used by owner_name()/owner_phone()."""
+        return self.prefetch_related("person_set")
+
+    def with_upcoming_meeting(self):
+        """Pre-loads each household's upcoming meeting (see upcoming_meeting()).
+
+        Also annotates ``upcoming_meeting_start``, which can be sorted on.
+        """
+        now = timezone.now()
+        upcoming = Meeting.objects.filter(start__gte=now).order_by("start")
+        return self.annotate(
+            upcoming_meeting_start=models.Subquery(
+                upcoming.filter(household=models.OuterRef("pk")).values("start")[:1]
+            )
+        ).prefetch_related(
+            models.Prefetch("meeting_set", queryset=upcoming, to_attr="upcoming_meetings")
+        )
+
+
 class Household(models.Model):
     created_date = models.DateTimeField(auto_now_add=True)
     address = models.TextField()
     notes = models.TextField(blank=True)
 
+    objects = HouseholdQuerySet.as_manager()
+
     def _get_owner(self):
-        owner_query = self.person_set.all()
-        return owner_query[0] if owner_query else None
+        # Iterate (rather than index) so people prefetched by with_owner() are reused
+        return next(iter(self.person_set.all()), None)
 
     def owner_name(self):
         owner = self._get_owner()
@@ -45,14 +84,14 @@ class Household(models.Model):
         return owner.phone_number if owner else None
 
     def upcoming_meeting(self):
+        if hasattr(self, "upcoming_meetings"):  # see with_upcoming_meeting()
+            return self.upcoming_meetings[0] if self.upcoming_meetings else None
+
         now = timezone.now()
-        upcoming_meeting = None
-        future_meetings = self.meeting_set.filter(start__gte=now).order_by("start")
-        if future_meetings:
-            upcoming_meeting = future_meetings[0]
-        return upcoming_meeting
+        return self.meeting_set.filter(start__gte=now).order_by("start").first()
 
-    upcoming_meeting.admin_order_field = "meeting__start"  # type: ignore
+    # only sortable on querysets using HouseholdQuerySet.with_upcoming_meeting()
+    upcoming_meeting.admin_order_field = "upcoming_meeting_start"  # type: ignore
 
     def __str__(self):
         return self.address
@@ -92,9 +131,56 @@ class Weekdays(IntEnum):
     SUN = 6
 
 
+def _slot_count(**filters):
+    """Counts each MeetingGroup's meetings (matching ``filters``) in a subquery."""
+    meetings = (
+        Meeting.objects.filter(group=models.OuterRef("pk"), **filters)
+        .order_by()
+        .values("group")
+        .annotate(count=models.Count("pk"))
+        .values("count")
+    )
+    return Coalesce(models.Subquery(meetings, output_field=models.IntegerField()), 0)
+
+
+class MeetingGroupQuerySet(models.QuerySet):
+    def open(self):
+        """Groups none of whose meetings are reserved yet."""
+        return self.filter(open_slots=models.F("total_slots"))
+
+    def with_slot_counts(self):
+        """Annotates the counters' true values: ``slot_count`` and ``open_slot_count``."""
+        return self.annotate(
+            slot_count=_slot_count(), open_slot_count=_slot_count(household__isnull=True)
+        )
+
+    def refresh_counters(self) -> int:
+        """Recounts total_slots and open_slots from the groups' meetings.
+
+        Backends with row-level locking lock the groups first, so concurrent
+        reservations (see reserve_meeting()) are waited for rather than missed.
+
+        :return: the number of groups updated
+        """
+        with transaction.atomic(using=self.db, savepoint=False):
+            if connections[self.db].features.has_select_for_update:
+                list(self.select_for_update().values_list("pk", flat=True))
+            return self.update(
+                total_slots=_slot_count(), open_slots=_slot_count(household__isnull=True)
+            )
+
+
 class MeetingGroup(models.Model):
     name = models.CharField(max_length=50)
     date = models.DateField(validators=[validate_future_date])
+    # Maintained counts of the group's meetings (see MeetingGroupQuerySet)
+    total_slots = models.PositiveIntegerField(default=0, editable=False)
+    open_slots = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = MeetingGroupQuerySet.as_manager()
+
+    class Meta:
+        indexes = [models.Index(fields=["date"], name="homevisit_group_date")]
 
     def date_string(self):
         return self.date.strftime(DATE_ONLY_FORMAT)
@@ -103,26 +189,113 @@ class MeetingGroup(models.Model):
         return self.name
 
 
-class Meeting(models.Model):
+class MeetingQuerySet(models.QuerySet):
+    def overlapping(self, start: datetime, end: datetime):
+        """Meetings that overlap the time between start and end.
+
+        No meeting lasts longer than max_meeting_duration(), so only those starting
+        less than that before ``start`` can still be running: a bounded range of the
+        (start, end) index, however much history precedes it.
+        """
+        return self.filter(
+            start__gt=start - max_meeting_duration(), start__lt=end, end__gt=start
+        )
+
+    def with_owner(self):
+        """Pre-loads each meeting's household, group and owner (see owner_name())."""
+        return self.select_related("household", "group").prefetch_related(
+            "household__person_set"
+        )
+
+
+class AbstractMeeting(models.Model):
+    """The fields and display of Meeting, shared with ArchivedMeeting."""
+
     name = models.CharField(max_length=50)
-    start = models.DateTimeField(validators=[validate_future_date])
-    end = models.DateTimeField(validators=[validate_future_date])
-    reserved = models.DateTimeField(
-        null=True, blank=True, validators=[validate_future_date]
-    )
+    start = models.DateTimeField()
+    end = models.DateTimeField()
+    reserved = models.DateTimeField(null=True, blank=True)
     household = models.ForeignKey(
         Household, on_delete=models.SET_NULL, null=True, blank=True
     )
+
+    class Meta:
+        abstract = True
+
+    def owner_name(self):
+        return self.household.owner_name() if self.household else None
+
+    owner_name.admin_order_field = "household__person__first_name"  # type: ignore
+
+    def full_name(self):
+        """Includes meeting name and start+end datetimes."""
+        return f"{self.name}: {str(self)}"
+
+    full_name.admin_order_field = "start"  # type: ignore
+
+    def time_only(self):
+        start_local = timezone.localtime(self.start)
+        start_str = start_local.strftime(TIME_ONLY_NO_SUFFIX_FORMAT)
+        end_local = timezone.localtime(self.end)
+        end_str = end_local.strftime(TIME_ONLY_FORMAT)
+        return f"{start_str} - {end_str}"
+
+    def __str__(self):
+        start_local = timezone.localtime(self.start)
+        start_str = start_local.strftime(DATE_FORMAT)
+        end_local = timezone.localtime(self.end)
+
+        if start_local.day == end_local.day:
+            end_str = end_local.strftime(TIME_ONLY_FORMAT)
+            date_str = f"{start_str} - {end_str}"
+        else:
+            date_str = f"{start_str} - {end_local.strftime(DATE_FORMAT)}"
+        return date_str
+
+
+class Meeting(AbstractMeeting):
     group = models.ForeignKey(MeetingGroup, on_delete=models.CASCADE)
 
+    objects = MeetingQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["start", "end"], name="homevisit_meeting_start_end"),
+            # A household's meetings by start (Household.upcoming_meeting()), and also
+            # unreserved meetings by start (household IS NULL)
+            models.Index(
+                fields=["household", "start"], name="homevisit_meeting_hh_start"
+            ),
+        ]
+
+    def clean_fields(self, exclude=None):
+        # Unlike archived meetings, scheduled ones can't be (re)set in the past
+        errors = {}
+        try:
+            super().clean_fields(exclude)
+        except ValidationError as error:
+            errors = error.update_error_dict(errors)
+
+        for name in ["start", "end", "reserved"]:
+            if name in (exclude or []) or name in errors:
+                continue
+            try:
+                validate_future_date(getattr(self, name))
+            except ValidationError as error:
+                errors[name] = error.error_list
+        if errors:
+            raise ValidationError(errors)
+
     def clean(self):
         if self.end <= self.start:
             raise ValidationError(
                 {"end": _("End date must come after Start date.")}, code="invalid"
             )
+        validate_duration(self)
 
-        overlap = Meeting.objects.filter(end__gt=self.start).filter(start__lt=self.end)
-        if overlap.count() > 0:
+        # Exclude this meeting, so existing meetings can be edited
+        overlap = Meeting.objects.overlapping(self.start, self.end).exclude(pk=self.pk)
+        if overlap.exists():
             raise ValidationError(
                 {"start": _("Cannot overlap with another meeting")}, code="invalid"
             )
@@ -137,9 +310,13 @@ class Meeting(models.Model):
         start_times: List[time],
         create_after: datetime = None,
         group: MeetingGroup = None,
-    ) -> None:
+        batch_size: int = 500,
+    ) -> List["Meeting"]:
         """Creates recurring Meeting instances based on parameters.
 
+        All meetings are computed up front, checked for overlaps in one query and
+        inserted with batched bulk_create inside a single transaction.
+
         :param name: the name to use for all meeting instances
         :param begin_date: the initial date of the recurring meetings
         :param end_date: the ending date of the recurring meetings
@@ -148,7 +325,13 @@ class Meeting(models.Model):
         :param start_times: a list of starting times for each weekday
         :param create_after: only create meetings if after this datetime.
             If not provided, timezone.now() is used.
+        :param group: the MeetingGroup for all meetings. Created if not provided.
+        :param batch_size: the max number of meetings inserted per INSERT statement
+        :raises ValidationError: if any of the meetings would overlap
+        :return: the created meetings
         """
+        from . import availability, db, overlaps
+
         logger.debug(
             f"Scheduling '{name}' {begin_date} to {end_date} meeting of length "
             f"{duration_mins} mins on [days={weekdays}]. Starting times: {start_times}"
@@ -157,11 +340,9 @@ class Meeting(models.Model):
         _create_after: datetime = timezone.now() if create_after is None else create_after
         initial_date: date = begin_date
         delta = end_date - initial_date
+        duration = timedelta(minutes=duration_mins)
 
-        if not group:
-            group = MeetingGroup(name=f"{name} group: {begin_date}", date=begin_date)
-            group.save()
-
+        meetings: List[Meeting] = []
         # Iterate over each day between _create_after and end_date
         for day_num in range(delta.days):
             loop_date = initial_date + timedelta(days=day_num)
@@ -171,44 +352,57 @@ class Meeting(models.Model):
                     mtg_start = datetime.combine(
                         loop_date, start_time, tzinfo=_create_after.tzinfo
                     )
-                    mtg_end = mtg_start + timedelta(minutes=duration_mins)
 
                     # Create the meeting if start_time is later than _create_after
                     if mtg_start > _create_after:
-                        mtg = Meeting.objects.create(
-                            name=name, start=mtg_start, end=mtg_end, group=group
+                        meetings.append(
+                            Meeting(name=name, start=mtg_start, end=mtg_start + duration)
                         )
-                        logger.info("Created %s", mtg)
 
-    def owner_name(self):
-        return self.household.owner_name() if self.household else None
+        with transaction.atomic():
+            db.lock_schedule()
+            overlaps.validate_no_overlaps(meetings)
+            if not group:
+                group = MeetingGroup(name=f"{name} group: {begin_date}", date=begin_date)
+                group.save()
+            for meeting in meetings:
+                meeting.group = group
+            created = Meeting.objects.bulk_create(meetings, batch_size=batch_size)
+            # bulk_create() doesn't send post_save: count the new meetings here
+            MeetingGroup.objects.filter(pk=group.pk).refresh_counters()
 
-    owner_name.admin_order_field = "household__person__first_name"  # type: ignore
+        availability.invalidate()
+        logger.info("Created %d '%s' meetings in %s", len(created), name, group)
+        return created
 
-    def full_name(self):
-        """Includes meeting name and start+end datetimes."""
-        return f"{self.name}: {str(self)}"
 
-    full_name.admin_order_field = "start"  # type: ignore
+class ArchivedMeetingGroup(models.Model):
+    """A past MeetingGroup, moved out of the schedule's tables (see archive.py)."""
 
-    def time_only(self):
-        start_local = timezone.localtime(self.start)
-        start_str = start_local.strftime(TIME_ONLY_NO_SUFFIX_FORMAT)
-        end_local = timezone.localtime(self.end)
-        end_str = end_local.strftime(TIME_ONLY_FORMAT)
-        return f"{start_str} - {end_str}"
+    id = models.IntegerField(primary_key=True)  # the MeetingGroup's id
+    name = models.CharField(max_length=50)
+    date = models.DateField()
+    archived_date = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["date"], name="homevisit_archgroup_date")]
 
     def __str__(self):
-        start_local = timezone.localtime(self.start)
-        start_str = start_local.strftime(DATE_FORMAT)
-        end_local = timezone.localtime(self.end)
+        return self.name
 
-        if start_local.day == end_local.day:
-            end_str = end_local.strftime(TIME_ONLY_FORMAT)
-            date_str = f"{start_str} - {end_str}"
-        else:
-            date_str = f"{start_str} - {end_local.strftime(DATE_FORMAT)}"
-        return date_str
+
+class ArchivedMeeting(AbstractMeeting):
+    """A past Meeting (and its reservation), moved out of the schedule's tables."""
+
+    id = models.IntegerField(primary_key=True)  # the Meeting's id
+    group = models.ForeignKey(ArchivedMeetingGroup, on_delete=models.CASCADE)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["start"], name="homevisit_archmeeting_start"),
+            # A household's history of meetings
+            models.Index(fields=["household", "start"], name="homevisit_archmeeting_hh"),
+        ]
 
 
 class Feedback(models.Model):
@@ -230,6 +424,12 @@ class Feedback(models.Model):
 
     class Meta:
         verbose_name_plural = "Feedback"
+        indexes = [
+            models.Index(fields=["created_date"], name="homevisit_feedback_created"),
+            models.Index(
+                fields=["responded", "created_date"], name="homevisit_feedback_responded"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name}: {self.id}"
@@ -244,6 +444,41 @@ class Faq(models.Model):
     class Meta:
         verbose_name = "Frequently Asked Question"
         verbose_name_plural = "Frequently Asked Questions"
+        indexes = [models.Index(fields=["created_date"], name="homevisit_faq_created")]
 
     def __str__(self):
         return self.question
+
+
+class QueuedEmail(models.Model):
+    """An outbound email, delivered by the `send_queued_email` management command."""
+
+    PENDING = "PENDING"
+    SENT = "SENT"
+    FAILED = "FAILED"
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.EmailField()
+    to = models.TextField(help_text="Comma-separated recipients")
+    cc = models.TextField(blank=True, help_text="Comma-separated recipients")
+    status = models.CharField(
+        max_length=10,
+        choices=((PENDING, "Pending"), (SENT, "Sent"), (FAILED, "Failed")),
+        default=PENDING,
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_date = models.DateTimeField(auto_now_add=True)
+    sent_date = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Queued email"
+        indexes = [
+            # outbox._claim_due()
+            models.Index(fields=["status", "next_attempt"], name="homevisit_email_due")
+        ]
+
+    def __str__(self):
+        return f"{self.subject} ({self.status})"
@@ -0,0 +1,102 @@
+"""Durable queue for outbound email.
+
+Requests only insert QueuedEmail rows (inside their own transaction, so mail is queued
+if and only if the request's changes commit). The `send_queued_email` management
+command delivers them in the background (over pooled connections, see mail.py),
+retrying failures with exponential backoff.
+"""
+import logging
+from datetime import timedelta
+from typing import List, Tuple
+
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.utils import timezone
+
+from .mail import pool
+from .models import QueuedEmail
+
+logger = logging.getLogger(__name__)
+
+# How long a worker may hold a claimed message before other workers may retry it
+CLAIM_TIMEOUT = timedelta(minutes=5)
+
+
+def queue_email(subject, body, from_email, to_email, cc_emails=None) -> QueuedEmail:
+    """Queues an HTML email for delivery by the background worker."""
+    return QueuedEmail.objects.create(
+        subject=subject,
+        body=body,
+        from_email=from_email,
+        to=to_email,
+        cc=",".join(cc_emails or []),
+    )
+
+
+def to_message(queued: QueuedEmail) -> EmailMessage:
+    message = EmailMessage(
+        queued.subject,
+        queued.body,
+        from_email=queued.from_email,
+        to=queued.to.split(","),
+        cc=queued.cc.split(",") if queued.cc else [],
+    )
+    message.content_subtype = "html"
+    return message
+
+
+def _claim_due(batch_size: int) -> List[QueuedEmail]:
+    """Claims up to batch_size due messages, so concurrent workers don't double-send.
+
+    Each message is claimed with a conditional UPDATE that pushes its next_attempt out
+    by CLAIM_TIMEOUT; only the worker whose UPDATE matched sends it.
+    """
+    now = timezone.now()
+    due = QueuedEmail.objects.filter(status=QueuedEmail.PENDING, next_attempt__lte=now)
+    claimed = []
+    for queued in due.order_by("next_attempt")[:batch_size]:
+        if due.filter(pk=queued.pk).update(next_attempt=now + CLAIM_TIMEOUT):
+            claimed.append(queued)
+    return claimed
+
+
+def _record_failure(queued: QueuedEmail, error: Exception, max_attempts: int) -> None:
+    queued.attempts += 1
+    queued.last_error = f"{type(error).__name__}: {error}"
+    if queued.attempts >= max_attempts:
+        queued.status = QueuedEmail.FAILED
+        logger.error("Giving up on %s after %d attempts", queued, queued.attempts)
+    else:
+        backoff = settings.HOMEVISIT_EMAIL_RETRY_SECONDS * 2 ** (queued.attempts - 1)
+        queued.next_attempt = timezone.now() + timedelta(seconds=backoff)
+        logger.warning("Failed to send %s (retrying in %ds): %s", queued, backoff, error)
+    queued.save(update_fields=["attempts", "last_error", "status", "next_attempt"])
+
+
+def send_due(batch_size: int = 50, max_attempts: int = None) -> Tuple[int, int]:
+    """Sends up to batch_size queued messages that are due.
+
+    :param batch_size: the max number of messages to send
+    :param max_attempts: mark a message FAILED after this many failed attempts
+    :return: the number of messages (sent, failed)
+    """
+    if max_attempts is None:
+        max_attempts = settings.HOMEVISIT_EMAIL_MAX_ATTEMPTS
+
+    sent = failed = 0
+    claimed = _claim_due(batch_size)
+    # One batch over a pooled connection, rather than a new connection per message
+    errors = pool.send_messages([to_message(queued) for queued in claimed])
+    for queued, error in zip(claimed, errors):
+        if error is not None:
+            _record_failure(queued, error, max_attempts)
+            failed += 1
+            continue
+
+        queued.status = QueuedEmail.SENT
+        queued.attempts += 1
+        queued.sent_date = timezone.now()
+        queued.save(update_fields=["status", "attempts", "sent_date"])
+        logger.info("Sent %s", queued)
+        sent += 1
+    return sent, failed
@@ -0,0 +1,77 @@
+"""Detects meetings that overlap in time.
+
+A single meeting is checked with an indexed ``exists()`` probe (see
+``MeetingQuerySet.overlapping``). A batch of new meetings is checked with one query for
+the existing meetings in the batch's window, followed by an in-memory sweep-line over
+the batch and those meetings.
+"""
+import logging
+from typing import Iterable, List, Tuple
+
+from django.core.exceptions import ValidationError
+from django.utils.translation import gettext_lazy as _
+
+from .models import Meeting, validate_duration
+
+logger = logging.getLogger(__name__)
+
+OVERLAP_ERROR = _("Cannot overlap with another meeting")
+
+
+def find_conflicts(meetings: Iterable[Meeting]) -> List[Tuple[Meeting, Meeting]]:
+    """Finds overlaps between a batch of meetings and each other or existing meetings.
+
+    Overlaps among meetings already in the database are ignored. At least one pair is
+    returned for every batch meeting that overlaps something (though not every
+    overlapping pair is returned).
+
+    :param meetings: the (typically unsaved) meetings to check
+    :return: ``(batch meeting, conflicting meeting)`` pairs; empty if there are none
+    """
+    batch = list(meetings)
+    if not batch:
+        return []
+
+    window_start = min(meeting.start for meeting in batch)
+    window_end = max(meeting.end for meeting in batch)
+    existing = (
+        Meeting.objects.overlapping(window_start, window_end)
+        .exclude(pk__in=[meeting.pk for meeting in batch if meeting.pk is not None])
+        .only("pk", "name", "start", "end")
+    )
+
+    # (start, end, is_new, meeting), sorted by start
+    intervals = [(m.start, m.end, True, m) for m in batch]
+    intervals += [(m.start, m.end, False, m) for m in existing]
+    intervals.sort(key=lambda interval: (interval[0], interval[1]))
+
+    conflicts = []
+    latest = latest_new = None  # the intervals seen so far that end last
+    for interval in intervals:
+        start, end, is_new, meeting = interval
+        if is_new and latest and latest[1] > start:
+            conflicts.append((meeting, latest[3]))
+        elif not is_new and latest_new and latest_new[1] > start:
+            conflicts.append((latest_new[3], meeting))
+
+        if latest is None or end > latest[1]:
+            latest = interval
+        if is_new and (latest_new is None or end > latest_new[1]):
+            latest_new = interval
+    return conflicts
+
+
+def validate_no_overlaps(meetings: Iterable[Meeting]) -> None:
+    """Raises ValidationError if any of ``meetings`` overlap (see find_conflicts), or
+    last longer than max_meeting_duration() (which find_conflicts relies on)."""
+    meetings = list(meetings)
+    for meeting in meetings:
+        validate_duration(meeting)
+    conflicts = find_conflicts(meetings)
+    if conflicts:
+        logger.debug("Found %d overlapping meetings: %s", len(conflicts), conflicts)
+        meeting, other = conflicts[0]
+        raise ValidationError(
+            f"{OVERLAP_ERROR}: '{meeting.full_name()}' and '{other.full_name()}'",
+            code="invalid",
+        )
@@ -0,0 +1,55 @@
+"""Versioned cache of the rendered FAQ and About pages.
+
+Their content only changes when a Faq is saved or deleted, which bumps the version (see
+``homevisit.signals``), so each page is rendered once per version and otherwise served
+straight from the cache.
+"""
+import hashlib
+import logging
+from datetime import datetime
+from typing import Callable, NamedTuple
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils import timezone
+
+from . import versions
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "homevisit:pages:version"
+
+
+class CachedPage(NamedTuple):
+    content: bytes
+    content_type: str
+    etag: str
+    last_modified: datetime
+
+
+def invalidate() -> None:
+    """Discards all cached pages (see versions.bump)."""
+    versions.bump(VERSION_KEY)
+    logger.debug("Invalidated cached FAQ pages")
+
+
+def get_page(path: str, render: Callable[[], HttpResponse]) -> CachedPage:
+    """Returns the cached page at ``path``, rendering (and caching) it if needed.
+
+    :param path: the page's URL path
+    :param render: renders the page, if it is not cached
+    """
+    key = f"homevisit:pages:{versions.get_version(VERSION_KEY)}:{path}"
+
+    cache = versions.get_cache()
+    page = cache.get(key)
+    if page is None:
+        response = render()
+        page = CachedPage(
+            response.content,
+            response["Content-Type"],
+            f'"{hashlib.md5(response.content).hexdigest()}"',
+            timezone.now().replace(microsecond=0),
+        )
+        cache.set(key, page, timeout=settings.HOMEVISIT_PAGES_TIMEOUT)
+    return page
@@ -0,0 +1,240 @@
+"""Keyset ("seek") pagination and estimated counts for large admin changelists.
+
+OFFSET pagination reads (and throws away) every row before the requested page, so
+pages get slower the deeper they are. Instead, each page links to the next one with a
+cursor: the sort key of its last row. The next page is then read with
+``WHERE (key) > (cursor) ... LIMIT n``, which an index can serve directly, however deep
+the page is.
+
+Counting every row of a large, unfiltered table is a full scan too, so the planner's
+row estimate is shown instead (SQLite's ``sqlite_stat1``, kept by ``ANALYZE``, or
+PostgreSQL's ``pg_class.reltuples``), once the table has at least
+HOMEVISIT_ESTIMATED_COUNT_MIN rows.
+"""
+import base64
+import binascii
+import json
+import logging
+from datetime import date, datetime
+from typing import Any, List, NamedTuple, Optional
+
+from django.conf import settings
+from django.contrib.admin.views.main import PAGE_VAR, ChangeList
+from django.core.exceptions import FieldDoesNotExist
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.db.models import F, Q, QuerySet
+from django.db.models.expressions import OrderBy
+from django.utils.functional import cached_property
+
+logger = logging.getLogger(__name__)
+
+CURSOR_VAR = "cursor"
+
+
+class Key(NamedTuple):
+    """One column of a sort key."""
+
+    name: str
+    descending: bool
+    nullable: bool  # if so, NULLs must sort last
+    field: Any  # converts cursor values back to Python (see Field.to_python)
+
+
+def _key(queryset: QuerySet, part) -> Optional[Key]:
+    nulls_last = False
+    if isinstance(part, str):
+        name, descending = part.lstrip("-"), part.startswith("-")
+    elif isinstance(part, OrderBy) and isinstance(part.expression, F):
+        name, descending = part.expression.name, part.descending
+        nulls_last = part.nulls_last
+    else:
+        return None
+
+    opts = queryset.model._meta
+    if name in queryset.query.annotations:
+        field = queryset.query.annotations[name].output_field
+        nullable = True
+    else:
+        try:
+            field = opts.pk if name == "pk" else opts.get_field(name)
+        except FieldDoesNotExist:
+            return None  # ex: "household__address"
+        if field.is_relation:
+            return None  # sorts by the related model's ordering
+        nullable = field.null
+
+    # Where NULLs sort differs between databases, unless set explicitly
+    if nullable and not nulls_last:
+        return None
+    return Key(name, descending, nullable, field)
+
+
+def get_keys(queryset: QuerySet) -> Optional[List[Key]]:
+    """Returns the sort key of an ordered queryset, or None if it can't be seeked.
+
+    :param queryset: must have a total (deterministic) ordering, ex: ending in "pk"
+    """
+    keys: List[Key] = []
+    for part in queryset.query.order_by:
+        key = _key(queryset, part)
+        if key is None:
+            return None
+        # ex: the admin's ordering, followed by the same default ordering again
+        if key.name not in [previous.name for previous in keys]:
+            keys.append(key)
+    return keys or None
+
+
+def _to_json(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def encode_cursor(keys: List[Key], obj) -> str:
+    """The cursor pointing right after ``obj`` (see seek())."""
+    values = [_to_json(getattr(obj, key.name)) for key in keys]
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def decode_cursor(keys: List[Key], cursor: str) -> Optional[List]:
+    """Returns the cursor's key values, or None if it isn't valid for ``keys``."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(values, list) or len(values) != len(keys):
+            return None
+        return [
+            None if value is None else key.field.to_python(value)
+            for key, value in zip(keys, values)
+        ]
+    except (ValueError, TypeError, binascii.Error) as error:
+        logger.debug("Ignoring invalid cursor %r: %s", cursor, error)
+        return None
+
+
+def seek(queryset: QuerySet, keys: List[Key], values: List) -> QuerySet:
+    """Filters to the rows sorted after ``values`` (NULLs sort last).
+
+    ``(a, b) > (1, 2)`` is expanded to ``a >= 1 AND (a > 1 OR (a = 1 AND b > 2))``.
+    """
+    after = []
+    equal = Q()
+    for key, value in zip(keys, values):
+        if value is not None:
+            lookup = "lt" if key.descending else "gt"
+            greater = Q(**{f"{key.name}__{lookup}": value})
+            if key.nullable:
+                greater |= Q(**{f"{key.name}__isnull": True})
+            after.append(equal & greater)
+        equal &= Q(**{key.name: value})
+
+    if not after:
+        return queryset.none()
+    condition = after[0]
+    for other in after[1:]:
+        condition |= other
+
+    # Redundant, but a range on the first column is what an index can seek to
+    first, value = keys[0], values[0]
+    if not first.nullable:
+        lookup = "lte" if first.descending else "gte"
+        condition &= Q(**{f"{first.name}__{lookup}": value})
+    return queryset.filter(condition)
+
+
+def estimate_count(queryset: QuerySet) -> Optional[int]:
+    """Returns the database's estimate of the table's rows, if it has one."""
+    connection = connections[queryset.db]
+    table = queryset.model._meta.db_table
+    if connection.vendor == "sqlite":
+        sql, params = "SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1", [table]
+    elif connection.vendor == "postgresql":
+        sql, params = "SELECT reltuples FROM pg_class WHERE oid = %s::regclass", [table]
+    else:
+        return None
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            row = cursor.fetchone()
+    except DatabaseError:
+        # ex: sqlite_stat1 doesn't exist until the first ANALYZE. SQLite carries on
+        # with the current transaction (unlike PostgreSQL, whose query can't fail).
+        return None
+    if row is None:
+        return None
+    estimate = int(str(row[0]).split()[0].split(".")[0])
+    return estimate if estimate >= 0 else None
+
+
+class KeysetPaginator(Paginator):
+    """Pages through a queryset by seeking past a cursor (instead of OFFSET).
+
+    Falls back to OFFSET pagination when the ordering can't be seeked (see get_keys).
+    Page numbers are then only informational.
+    """
+
+    def __init__(self, object_list, per_page, cursor: str = None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.keys = get_keys(object_list)
+        self.cursor = decode_cursor(self.keys, cursor) if self.keys and cursor else None
+        self.next_cursor: Optional[str] = None
+        self.estimated = False
+
+    @property
+    def keyset(self) -> bool:
+        return self.keys is not None
+
+    @cached_property
+    def count(self):
+        # Only for the whole table: filters (and searches) need an exact count
+        if not self.object_list.query.where:
+            estimate = estimate_count(self.object_list)
+            if (
+                estimate is not None
+                and estimate >= settings.HOMEVISIT_ESTIMATED_COUNT_MIN
+            ):
+                self.estimated = True
+                return estimate
+        return super().count
+
+    def page(self, number):
+        # Read one extra row to know whether there is a next page
+        limit = self.per_page + 1
+        if self.cursor is None:
+            number = self.validate_number(number)
+            offset = (number - 1) * self.per_page
+            end = offset + limit
+            rows = list(self.object_list[offset:end])
+        else:
+            rows = list(seek(self.object_list, self.keys, self.cursor)[:limit])
+
+        has_next = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        if has_next and self.keys:
+            self.next_cursor = encode_cursor(self.keys, rows[-1])
+        return self._get_page(rows, number, self)
+
+
+class KeysetChangeList(ChangeList):
+    """Links each page to the next one with a cursor (see KeysetPaginator)."""
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(CURSOR_VAR, None)
+        return lookup_params
+
+    def get_query_string(self, new_params=None, remove=None):
+        # A cursor only applies to the (filtered and sorted) list it was made for
+        return super().get_query_string(new_params, [*(remove or []), CURSOR_VAR])
+
+    def get_results(self, request):
+        super().get_results(request)
+        self.first_page_url = self.get_query_string(remove=[PAGE_VAR])
+        self.next_page_url = None
+        next_cursor = getattr(self.paginator, "next_cursor", None)
+        if next_cursor:
+            self.next_page_url = self.get_query_string(
+                {CURSOR_VAR: next_cursor, PAGE_VAR: self.page_num + 1}
+            )
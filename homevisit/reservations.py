@@ -0,0 +1,52 @@
+"""Claims meeting slots for households without racing concurrent submitters."""
+import logging
+
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import availability
+from .models import Household, Meeting, MeetingGroup
+
+logger = logging.getLogger(__name__)
+
+
+class SlotTakenError(Exception):
+    """Raised when the requested meeting was reserved by someone else first."""
+
+
+def reserve_meeting(meeting: Meeting, household: Household) -> Meeting:
+    """Reserves ``meeting`` for ``household``.
+
+    The slot is claimed with a single conditional UPDATE that only matches while the
+    meeting (and every other meeting in its group) is still unreserved, so exactly one
+    of several concurrent callers can win. Backends with row-level locking also lock
+    the group row first, so the group-wide check can't be raced under MVCC. The
+    group's open_slots counter is decremented in the same transaction.
+
+    :param meeting: the (previously unreserved) meeting to claim
+    :param household: the household reserving the meeting
+    :raises SlotTakenError: if the meeting or its group was reserved in the meantime
+    :return: ``meeting``, updated with its new reservation
+    """
+    reserved = timezone.now()
+    with transaction.atomic():
+        if connection.features.has_select_for_update:
+            list(MeetingGroup.objects.select_for_update().filter(pk=meeting.group_id))
+
+        claimed = (
+            Meeting.objects.filter(pk=meeting.pk, household__isnull=True)
+            .exclude(group__meeting__household__isnull=False)
+            .update(household=household, reserved=reserved)
+        )
+        if not claimed:
+            logger.info("Meeting %s was reserved by someone else first", meeting.pk)
+            raise SlotTakenError(f"Meeting {meeting.pk} is no longer available")
+        MeetingGroup.objects.filter(pk=meeting.group_id).update(
+            open_slots=F("open_slots") - 1
+        )
+
+    availability.invalidate()
+    meeting.household = household
+    meeting.reserved = reserved
+    return meeting
@@ -0,0 +1,166 @@
+"""Full-text search over households: their address and their people's names and phones.
+
+The admin's default search runs ``LIKE '%term%'`` against the address and (joined)
+people's names and phone numbers, which needs a DISTINCT and scans every household on
+every search. Instead, each household gets one document in a full-text index: an FTS5
+virtual table on SQLite, or a tsvector column with a GIN index on PostgreSQL (both
+created by migration 0012). The index is kept up to date by signals (see
+homevisit.signals) and can be rebuilt with the `rebuild_search_index` command.
+
+Every word of a search must match (the start of) a word in the household's document:
+"mai 12" finds "12 Main Street".
+"""
+import functools
+import logging
+import re
+import sqlite3
+from typing import Iterable, List, Tuple
+
+from django.db import connection as default_connection, transaction
+from django.db.models import QuerySet
+from django.db.models.expressions import RawSQL
+
+from .models import Household
+
+logger = logging.getLogger(__name__)
+
+TABLE = "homevisit_household_search"
+BATCH_SIZE = 500
+
+_WORD = re.compile(r"\w+")
+
+
+@functools.lru_cache()
+def _sqlite_has_fts5() -> bool:
+    db = sqlite3.connect(":memory:")
+    try:
+        db.execute("CREATE VIRTUAL TABLE fts5_check USING fts5(document)")
+        return True
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        db.close()
+
+
+def is_available(connection=default_connection) -> bool:
+    """Whether the database supports (and so has) the full-text index."""
+    if connection.vendor == "sqlite":
+        return _sqlite_has_fts5()
+    return connection.vendor == "postgresql"
+
+
+def _words(text: str) -> List[str]:
+    return _WORD.findall(text.lower())
+
+
+def _phone_forms(phone_number) -> str:
+    """E.164 plus national forms, so "+15305551234", "5305551234" and "530-555"
+    all match."""
+    if not phone_number.is_valid():
+        return str(phone_number)
+    return (
+        f"{phone_number.as_e164} {phone_number.national_number} "
+        f"{phone_number.as_national}"
+    )
+
+
+def document(household) -> str:
+    """The searchable text of a household (with its people prefetched)."""
+    parts = [household.address]
+    for person in household.person_set.all():
+        parts += [person.first_name, person.last_name]
+        if person.phone_number:
+            parts.append(_phone_forms(person.phone_number))
+    return " ".join(_words(" ".join(parts)))
+
+
+def _write(connection, household_ids: List[int], rows: List[Tuple[int, str]]) -> None:
+    with connection.cursor() as cursor:
+        placeholders = ", ".join(["%s"] * len(household_ids))
+        if connection.vendor == "sqlite":
+            cursor.execute(
+                f"DELETE FROM {TABLE} WHERE rowid IN ({placeholders})", household_ids
+            )
+            cursor.executemany(
+                f"INSERT INTO {TABLE} (rowid, document) VALUES (%s, %s)", rows
+            )
+        else:
+            cursor.execute(
+                f"DELETE FROM {TABLE} WHERE household_id IN ({placeholders})",
+                household_ids,
+            )
+            cursor.executemany(
+                f"INSERT INTO {TABLE} (household_id, document) "
+                "VALUES (%s, to_tsvector('simple', %s))",
+                rows,
+            )
+
+
+def index_households(
+    household_ids: Iterable[int], households: QuerySet = None, connection=None
+) -> None:
+    """Re-indexes the given households (and un-indexes those that no longer exist).
+
+    :param household_ids: the households to re-index
+    :param households: the Household queryset to read from. Default: all households
+    :param connection: the database connection. Default: the households' database
+    """
+    if households is None:
+        households = Household.objects.all()
+    connection = connection or default_connection
+    if not is_available(connection):
+        return
+
+    household_ids = list(household_ids)
+    for start in range(0, len(household_ids), BATCH_SIZE):
+        end = start + BATCH_SIZE
+        batch = household_ids[start:end]
+        found = households.filter(pk__in=batch).prefetch_related("person_set")
+        _write(connection, batch, [(house.pk, document(house)) for house in found])
+
+
+def rebuild(households: QuerySet = None, connection=None) -> int:
+    """Re-indexes every household.
+
+    :return: the number of households indexed
+    """
+    if households is None:
+        households = Household.objects.all()
+    connection = connection or default_connection
+    if not is_available(connection):
+        return 0
+
+    with transaction.atomic(using=connection.alias):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {TABLE}")
+        household_ids = list(households.order_by("pk").values_list("pk", flat=True))
+        index_households(household_ids, households, connection)
+    logger.info("Indexed %d households for search", len(household_ids))
+    return len(household_ids)
+
+
+class _InSubquery(RawSQL):
+    """A raw subquery for the right-hand side of ``__in``, which (in Django 2.2) adds
+    its own parentheses: RawSQL's would make it a scalar subquery."""
+
+    def as_sql(self, compiler, connection):
+        return self.sql, self.params
+
+
+def search(queryset: QuerySet, term: str, connection=default_connection) -> QuerySet:
+    """Filters households to those matching every word of ``term`` (by prefix)."""
+    words = _words(term)
+    if not words:
+        return queryset
+
+    if connection.vendor == "sqlite":
+        # Quoted, so words are never parsed as FTS5 operators (ex: "and", "or")
+        query = " AND ".join(f'"{word}"*' for word in words)
+        matches = f"SELECT rowid FROM {TABLE} WHERE {TABLE} MATCH %s"
+    else:
+        query = " & ".join(f"{word}:*" for word in words)
+        matches = (
+            f"SELECT household_id FROM {TABLE} "
+            "WHERE document @@ to_tsquery('simple', %s)"
+        )
+    return queryset.filter(pk__in=_InSubquery(matches, [query]))
@@ -0,0 +1,92 @@
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from . import availability, db, pages, search
+from .models import Faq, Household, Meeting, MeetingGroup, Person
+
+
+@receiver(post_save, sender=Meeting)
+@receiver(post_delete, sender=Meeting)
+@receiver(post_save, sender=MeetingGroup)
+@receiver(post_delete, sender=MeetingGroup)
+def invalidate_availability(sender, **kwargs):
+    availability.invalidate()
+
+
+@receiver(pre_save, sender=Meeting)
+def remember_meeting_group(sender, instance, raw, **kwargs):
+    """Notes a saved meeting's previous group, whose counters it may be leaving."""
+    instance._previous_group_id = None
+    if instance.pk and not raw:
+        instance._previous_group_id = (
+            Meeting.objects.filter(pk=instance.pk)
+            .values_list("group_id", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Meeting)
+@receiver(post_delete, sender=Meeting)
+def refresh_group_counters(sender, instance, **kwargs):
+    group_ids = {instance.group_id, getattr(instance, "_previous_group_id", None)}
+    MeetingGroup.objects.filter(pk__in=group_ids - {None}).refresh_counters()
+
+
+@receiver(pre_delete, sender=Household)
+def remember_household_groups(sender, instance, **kwargs):
+    # Deleting a household frees its meetings (household is SET_NULL), which happens
+    # in a single UPDATE that doesn't send post_save
+    instance._meeting_group_ids = list(
+        instance.meeting_set.values_list("group_id", flat=True)
+    )
+
+
+@receiver(post_delete, sender=Household)
+def free_household_meetings(sender, instance, **kwargs):
+    group_ids = getattr(instance, "_meeting_group_ids", [])
+    if group_ids:
+        MeetingGroup.objects.filter(pk__in=group_ids).refresh_counters()
+        availability.invalidate()
+
+
+@receiver(post_save, sender=Household)
+@receiver(post_delete, sender=Household)
+def index_household(sender, instance, raw=False, **kwargs):
+    if not raw:
+        search.index_households([instance.pk])
+
+
+@receiver(pre_save, sender=Person)
+def remember_person_household(sender, instance, raw, **kwargs):
+    """Notes a saved person's previous household, which must be re-indexed too."""
+    instance._previous_household_id = None
+    if instance.pk and not raw:
+        instance._previous_household_id = (
+            Person.objects.filter(pk=instance.pk)
+            .values_list("household_id", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Person)
+@receiver(post_delete, sender=Person)
+def index_person_household(sender, instance, raw=False, **kwargs):
+    household_ids = {
+        instance.household_id,
+        getattr(instance, "_previous_household_id", None),
+    }
+    household_ids.discard(None)
+    if household_ids and not raw:
+        search.index_households(household_ids)
+
+
+@receiver(post_save, sender=Faq)
+@receiver(post_delete, sender=Faq)
+def invalidate_pages(sender, **kwargs):
+    pages.invalidate()
+
+
+@receiver(connection_created)
+def configure_connection(sender, connection, **kwargs):
+    db.configure_connection(connection)
@@ -0,0 +1,275 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+
+from . import archive
+from .models import ArchivedMeeting, Feedback, Household, Meeting, MeetingGroup
+from .test_archive import create_day
+from .test_models import create_person
+
+
+def populate_households(count, meetings_per_household=2):
+    """Creates households, each with an owner and some future meetings (back-to-back,
+    from 9:00 tomorrow)."""
+    tomorrow = timezone.localtime() + timedelta(days=1)
+    start = tomorrow.replace(hour=9, minute=0, second=0, microsecond=0)
+    group = MeetingGroup.objects.create(name="Admin test", date=start.date())
+    for ndx in range(count):
+        household = Household.objects.create(address=f"{ndx} Test Street")
+        create_person(
+            f"First{ndx}", "Last", f"user{ndx}@test.com", "530-777-7777", household
+        )
+        for _ in range(meetings_per_household):
+            Meeting.objects.create(
+                name="Test",
+                start=start,
+                end=start + timedelta(hours=1),
+                household=household,
+                group=group,
+            )
+            start = start + timedelta(hours=1)
+
+
+def populate_groups(count):
+    today = timezone.now().date()
+    MeetingGroup.objects.bulk_create(
+        MeetingGroup(name=f"Group {ndx}", date=today + timedelta(days=ndx))
+        for ndx in range(count)
+    )
+
+
+class AdminTestCase(TestCase):
+    def setUp(self):
+        admin = User.objects.create_superuser("admin", "admin@test.com", "password")
+        self.client.force_login(admin)
+
+    def _count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(200, response.status_code)
+        return len(queries), response
+
+    def assertConstantChangePage(self, url):
+        """The page doesn't grow with the number of households and groups."""
+        self._count_queries(url)  # warm up (ex: the ContentType cache)
+        small_count, response = self._count_queries(url)
+        small_size = len(response.content)
+
+        populate_households(50, meetings_per_household=0)
+        populate_groups(50)
+        large_count, response = self._count_queries(url)
+        self.assertEqual(small_count, large_count)
+        self.assertEqual(small_size, len(response.content))
+
+
+class HouseholdAdminTests(AdminTestCase):
+    url = reverse("admin:homevisit_household_changelist")
+
+    def test_changelist_constant_queries(self):
+        populate_households(3)
+        small_count, response = self._count_queries(self.url)
+        self.assertEqual(3, len(response.context["cl"].result_list))
+
+        populate_households(30)
+        large_count, response = self._count_queries(self.url)
+        self.assertEqual(33, len(response.context["cl"].result_list))
+        self.assertEqual(small_count, large_count)
+
+    def test_changelist_columns(self):
+        populate_households(1)
+        household = Household.objects.get()
+        upcoming = household.meeting_set.order_by("start").first()
+
+        _, response = self._count_queries(self.url)
+        content = response.content.decode()
+        self.assertIn("First0 Last", content)
+        self.assertIn("+15307777777", content)
+        self.assertIn(str(upcoming), content)
+
+        row = response.context["cl"].result_list[0]
+        self.assertEqual(upcoming, row.upcoming_meeting())
+        self.assertEqual(upcoming.start, row.upcoming_meeting_start)
+
+    def test_changelist_sort_by_upcoming_meeting(self):
+        populate_households(3)
+        # "o=4" sorts by the 4th list_display column (upcoming_meeting), descending
+        _, response = self._count_queries(self.url + "?o=-4")
+        addresses = [house.address for house in response.context["cl"].result_list]
+        self.assertEqual(["2 Test Street", "1 Test Street", "0 Test Street"], addresses)
+
+    def test_export_action(self):
+        populate_households(3)
+        selected = Household.objects.exclude(address="1 Test Street")
+        data = {
+            "action": "export_csv",
+            "_selected_action": [house.pk for house in selected],
+        }
+        response = self.client.post(self.url, data)
+
+        self.assertTrue(response.streaming)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(3, len(lines))
+        self.assertTrue(lines[1].startswith(f"{selected[0].pk},0 Test Street,First0"))
+
+    def test_change_page_constant_size(self):
+        populate_households(1)
+        household = Household.objects.get()
+        url = reverse("admin:homevisit_household_change", args=[household.pk])
+        self.assertConstantChangePage(url)
+
+    def test_autocomplete(self):
+        populate_households(3)
+        url = reverse("admin:homevisit_household_autocomplete")
+        response = self.client.get(url, {"term": "First1"})
+        self.assertEqual(
+            ["1 Test Street"], [r["text"] for r in response.json()["results"]]
+        )
+
+
+class MeetingAdminTests(AdminTestCase):
+    url = reverse("admin:homevisit_meeting_changelist")
+
+    def test_changelist_constant_queries(self):
+        populate_households(2)
+        small_count, response = self._count_queries(self.url)
+        self.assertEqual(4, len(response.context["cl"].result_list))
+
+        populate_households(20)
+        large_count, response = self._count_queries(self.url)
+        self.assertEqual(44, len(response.context["cl"].result_list))
+        self.assertEqual(small_count, large_count)
+
+    def test_changelist_columns(self):
+        populate_households(1)
+        _, response = self._count_queries(self.url)
+
+        content = response.content.decode()
+        self.assertEqual(2, content.count("First0 Last"))
+        self.assertEqual(2, content.count("0 Test Street"))
+
+    def test_change_page_constant_size(self):
+        populate_households(1)
+        meeting = Meeting.objects.first()
+        url = reverse("admin:homevisit_meeting_change", args=[meeting.pk])
+        self.assertConstantChangePage(url)
+
+
+class MeetingActionTests(AdminTestCase):
+    url = reverse("admin:homevisit_meeting_changelist")
+
+    def _act(self, action, meetings, **data):
+        data.update(action=action, _selected_action=[m.pk for m in meetings])
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, data)
+        self.assertEqual(302, response.status_code)
+        response = self.client.get(self.url)
+        messages = [str(message) for message in response.context["messages"]]
+        return len(queries), messages
+
+    def test_release_reservations(self):
+        populate_households(12)
+        meetings = list(Meeting.objects.order_by("pk"))
+        small_count, messages = self._act("release_reservations", meetings[:2])
+        self.assertEqual(["Released 2 reserved meetings"], messages)
+
+        large_count, messages = self._act("release_reservations", meetings[2:])
+        self.assertEqual(["Released 22 reserved meetings"], messages)
+        self.assertEqual(small_count, large_count)
+        self.assertFalse(Meeting.objects.filter(household__isnull=False).exists())
+        self.assertEqual(24, MeetingGroup.objects.get().open_slots)
+
+    def test_cancel_meetings(self):
+        populate_households(12)
+        meetings = list(Meeting.objects.order_by("pk"))
+        small_count, messages = self._act("cancel_meetings", meetings[:2])
+        self.assertEqual(
+            ["Cancelled 2 meetings and deleted 0 emptied meeting groups"], messages
+        )
+
+        large_count, _ = self._act("cancel_meetings", meetings[2:-1])
+        self.assertEqual(small_count, large_count)
+        self.assertEqual(1, Meeting.objects.count())
+
+    def test_shift_meetings(self):
+        populate_households(1)
+        meetings = list(Meeting.objects.order_by("start"))
+        _, messages = self._act("shift_meetings", meetings, minutes=90)
+        self.assertEqual(["Shifted 2 meetings by 90 minutes"], messages)
+        shifted = Meeting.objects.order_by("start").first()
+        self.assertEqual(meetings[0].start + timedelta(minutes=90), shifted.start)
+
+        _, messages = self._act("shift_meetings", meetings[:1], minutes=60)
+        self.assertIn("Cannot overlap with another meeting", messages[0])
+        _, messages = self._act("shift_meetings", meetings)
+        self.assertEqual(["Enter the minutes to shift the meetings by"], messages)
+        self.assertEqual(shifted.start, Meeting.objects.order_by("start").first().start)
+
+
+class FeedbackAdminTests(AdminTestCase):
+    url = reverse("admin:homevisit_feedback_changelist")
+
+    def test_mark_responded(self):
+        Feedback.objects.bulk_create(
+            Feedback(name=f"Test {ndx}", email="test@test.com", comment="Test")
+            for ndx in range(3)
+        )
+        selected = Feedback.objects.order_by("pk")[:2]
+        data = {"action": "mark_responded", "_selected_action": [f.pk for f in selected]}
+        # The session and user, the changelist's count (its estimate and then the
+        # exact count) and a single UPDATE
+        with self.assertNumQueries(5):
+            self.client.post(self.url, data)
+        self.assertEqual(2, Feedback.objects.filter(responded=True).count())
+
+
+class ArchivedMeetingAdminTests(AdminTestCase):
+    url = reverse("admin:homevisit_archivedmeeting_changelist")
+
+    def archive(self, count):
+        populate_households(count, meetings_per_household=0)
+        for ndx, household in enumerate(Household.objects.order_by("pk")[:count]):
+            create_day(ndx + 40, household=household)
+        archive.archive_past()
+
+    def test_changelist_constant_queries(self):
+        self.archive(2)
+        small_count, response = self._count_queries(self.url)
+        self.assertEqual(4, len(response.context["cl"].result_list))
+        self.assertContains(response, "First0 Last")
+
+        self.archive(10)
+        large_count, response = self._count_queries(self.url)
+        self.assertEqual(24, len(response.context["cl"].result_list))
+        self.assertEqual(small_count, large_count)
+
+    def test_read_only(self):
+        self.archive(1)
+        meeting = ArchivedMeeting.objects.get(household__isnull=False)
+        url = reverse("admin:homevisit_archivedmeeting_change", args=[meeting.pk])
+        response = self.client.post(url, {"name": "Changed"})
+        self.assertEqual(403, response.status_code)
+
+        # Listed with the household's (current) meetings
+        url = reverse("admin:homevisit_household_change", args=[meeting.household_id])
+        self.assertContains(self.client.get(url), "Archived meetings")
+
+
+class MeetingGroupAdminTests(AdminTestCase):
+    url = reverse("admin:homevisit_meetinggroup_changelist")
+
+    def test_changelist_columns(self):
+        populate_households(1)
+        _, response = self._count_queries(self.url)
+        group = response.context["cl"].result_list[0]
+        self.assertEqual((2, 0), (group.total_slots, group.open_slots))
+
+    def test_autocomplete(self):
+        populate_groups(3)
+        url = reverse("admin:homevisit_meetinggroup_autocomplete")
+        response = self.client.get(url, {"term": "Group 2"})
+        self.assertEqual(["Group 2"], [r["text"] for r in response.json()["results"]])
@@ -0,0 +1,97 @@
+from datetime import datetime, time, timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from . import archive, availability
+from .models import (
+    ArchivedMeeting,
+    ArchivedMeetingGroup,
+    Household,
+    Meeting,
+    MeetingGroup,
+)
+
+
+def create_day(days_ago, meetings=2, household=None):
+    """Creates a group of back-to-back meetings, the first reserved by ``household``."""
+    day = timezone.localdate() - timedelta(days=days_ago)
+    group = MeetingGroup.objects.create(name=f"Day {days_ago}", date=day)
+    start = timezone.make_aware(datetime.combine(day, time(10)))
+    for ndx in range(meetings):
+        Meeting.objects.create(
+            name="Test",
+            start=start + timedelta(hours=ndx),
+            end=start + timedelta(hours=ndx + 1),
+            household=household if ndx == 0 else None,
+            reserved=start - timedelta(days=7) if household and ndx == 0 else None,
+            group=group,
+        )
+    return group
+
+
+class ArchiveTests(TestCase):
+    def setUp(self):
+        self.household = Household.objects.create(address="1 Test Street")
+        self.old_groups = [
+            create_day(days_ago, household=self.household) for days_ago in [60, 45, 31]
+        ]
+        self.recent = create_day(10)
+        self.upcoming = create_day(-7)
+
+    def test_archive(self):
+        old_meetings = list(
+            Meeting.objects.filter(group__in=self.old_groups).order_by("pk").values()
+        )
+        version = availability.get_version()
+
+        self.assertEqual((6, 3), archive.archive_past(archive.get_cutoff(30)))
+
+        # Moved, keeping their ids (and reservations)
+        self.assertEqual(
+            {self.recent.pk, self.upcoming.pk},
+            set(MeetingGroup.objects.values_list("pk", flat=True)),
+        )
+        self.assertEqual(4, Meeting.objects.count())
+        self.assertEqual(
+            old_meetings, list(ArchivedMeeting.objects.order_by("pk").values())
+        )
+        self.assertEqual(
+            [group.name for group in self.old_groups],
+            list(
+                ArchivedMeetingGroup.objects.order_by("date").values_list(
+                    "name", flat=True
+                )
+            ),
+        )
+        self.assertNotEqual(version, availability.get_version())
+
+        # The household's history
+        history = self.household.archivedmeeting_set.order_by("start")
+        self.assertEqual(3, history.count())
+        self.assertEqual(self.old_groups[0].name, history[0].group.name)
+
+    def test_batches(self):
+        self.assertEqual((6, 3), archive.archive_past(archive.get_cutoff(30), 1))
+        self.assertEqual(3, ArchivedMeetingGroup.objects.count())
+        # Nothing left to archive
+        self.assertEqual((0, 0), archive.archive_past(archive.get_cutoff(30), 1))
+
+    def test_group_still_meeting_kept(self):
+        # A group is archived (or kept) as a whole
+        group = self.old_groups[-1]
+        meeting = group.meeting_set.last()
+        meeting.end = archive.get_cutoff(30) + timedelta(minutes=1)
+        meeting.save()
+
+        self.assertEqual((4, 2), archive.archive_past(archive.get_cutoff(30)))
+        self.assertEqual(2, group.meeting_set.count())
+
+    def test_default_cutoff(self):
+        with self.settings(HOMEVISIT_ARCHIVE_AFTER_DAYS=50):
+            self.assertEqual((2, 1), archive.archive_past())
+
+    def test_household_deleted(self):
+        archive.archive_past(archive.get_cutoff(30))
+        self.household.delete()
+        self.assertEqual(6, ArchivedMeeting.objects.filter(household=None).count())
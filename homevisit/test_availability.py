@@ -0,0 +1,64 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from . import availability
+from .models import Meeting, MeetingGroup
+from .test_models import create_household, create_meeting
+
+
+class AvailabilityCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        start = timezone.now() + timedelta(days=1)
+        self.meeting = create_meeting(start, start + timedelta(hours=1))
+        self.group = self.meeting.group
+
+    def test_open_groups_cached(self):
+        with self.assertNumQueries(1):
+            open_groups = availability.get_open_groups()
+        self.assertEqual([(self.group.id, self.group.date_string())], open_groups)
+
+        # warm cache: no more queries
+        with self.assertNumQueries(0):
+            self.assertEqual(open_groups, availability.get_open_groups())
+
+    def test_invalidate_bumps_version(self):
+        version = availability.get_version()
+        availability.invalidate()
+        self.assertGreater(availability.get_version(), version)
+
+    def test_version_recreated_when_evicted(self):
+        cache.delete(availability.VERSION_KEY)
+        availability.invalidate()
+        self.assertIsNotNone(cache.get(availability.VERSION_KEY))
+
+    def test_meeting_save_invalidates(self):
+        availability.get_open_groups()
+
+        self.meeting.household = create_household("Test Address")
+        self.meeting.save()
+        self.assertEqual([], availability.get_open_groups())
+
+    def test_meeting_delete_invalidates(self):
+        self.meeting.household = create_household("Test Address")
+        self.meeting.save()
+        self.assertEqual([], availability.get_open_groups())
+
+        Meeting.objects.all().delete()
+        self.assertEqual(
+            [(self.group.id, self.group.date_string())], availability.get_open_groups()
+        )
+
+    def test_group_changes_invalidate(self):
+        availability.get_open_groups()
+
+        group = MeetingGroup.objects.create(
+            name="Another", date=self.group.date + timedelta(days=1)
+        )
+        self.assertIn((group.id, group.date_string()), availability.get_open_groups())
+
+        group.delete()
+        self.assertNotIn((group.id, group.date_string()), availability.get_open_groups())
@@ -0,0 +1,163 @@
+import os
+import tempfile
+from unittest import mock, skipUnless
+
+from django.db import connection
+from django.http import HttpResponse
+from django.test import Client, TestCase, override_settings
+
+from . import search as household_search
+from .admin import MeetingAdmin
+from .benchmarks import booking, pagination, rendering, results, scheduling, search
+from .forms import HouseholdForm
+from .models import Feedback, Household, Meeting, MeetingGroup, Person
+
+
+class SchedulingBenchmarkTests(TestCase):
+    def test_run(self):
+        results = scheduling.run(sizes=[24], batch_size=10)
+
+        self.assertEqual(["per-row", "bulk"], [result["name"] for result in results])
+        for result in results:
+            self.assertEqual(24, result["size"])
+            self.assertGreater(result["per_second"], 0)
+
+        # benchmark data is cleaned up afterwards
+        self.assertEqual(0, Meeting.objects.count())
+        self.assertEqual(0, MeetingGroup.objects.count())
+
+
+class BookingBenchmarkTests(TestCase):
+    def test_run(self):
+        results = booking.run(sizes=[30], requests=3)
+
+        names = ["index", "load_times", "faqs", "about", "contact", "booking"]
+        self.assertEqual(names, [result["name"] for result in results])
+        for result in results:
+            self.assertEqual(30, result["size"])
+            self.assertEqual(3, result["requests"])
+            self.assertLessEqual(result["p50_ms"], result["p95_ms"])
+            self.assertLessEqual(result["p95_ms"], result["p99_ms"])
+            self.assertGreaterEqual(result["queries_per_request"], 0)
+
+        # benchmark data is cleaned up afterwards
+        self.assertEqual(0, Meeting.objects.count())
+        self.assertEqual(0, Household.objects.count())
+        self.assertEqual(0, Feedback.objects.count())
+
+    def test_measure_full_query_log(self):
+        # ex: after seeding a large data set
+        connection.queries_log.extend([{}] * connection.queries_limit)
+
+        def request(client, iteration):
+            Household.objects.count()
+            return HttpResponse()
+
+        result = booking.measure(Client(), request, 2)
+        self.assertEqual(1, result["queries_per_request"])
+
+    def test_measure_db_time(self):
+        def request(client, iteration):
+            Household.objects.count()
+            return HttpResponse()
+
+        # Timed per call: the query log would round this (sub-millisecond) query to 0
+        result = booking.measure(Client(), request, 2)
+        self.assertGreater(result["db_ms"], 0)
+
+
+class BenchmarkResultsTests(TestCase):
+    def _result(self, per_second, p95_ms):
+        return {
+            "suite": "booking",
+            "name": "index",
+            "size": 100,
+            "per_second": per_second,
+            "p95_ms": p95_ms,
+        }
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.json")
+            results.save(path, [self._result(100, 10)])
+            self.assertEqual([self._result(100, 10)], results.load(path))
+
+    def test_find_regressions(self):
+        baseline = [self._result(100, 10)]
+        self.assertEqual(
+            [], results.find_regressions(baseline, [self._result(85, 11.5)], 20)
+        )
+
+        regressions = results.find_regressions(baseline, [self._result(70, 13)], 20)
+        self.assertEqual(2, len(regressions))
+        self.assertIn("per_second: 100.00 -> 70.00 (30% worse)", regressions[0])
+        self.assertIn("p95_ms: 10.00 -> 13.00 (30% worse)", regressions[1])
+
+        # More queries per request, including from none at all
+        baseline[0]["queries_per_request"] = 4
+        regressions = results.find_regressions(
+            baseline, [dict(self._result(100, 10), queries_per_request=5)], 20
+        )
+        self.assertEqual(
+            ["booking index 100 queries_per_request: 4.00 -> 5.00 (25% worse)"],
+            regressions,
+        )
+        baseline[0]["queries_per_request"] = 0
+        regressions = results.find_regressions(
+            baseline, [dict(self._result(100, 10), queries_per_request=1)], 20
+        )
+        self.assertEqual(1, len(regressions))
+
+        # New benchmarks have nothing to regress from
+        new = dict(self._result(1, 1000), name="new")
+        self.assertEqual([], results.find_regressions(baseline, [new], 20))
+
+
+class RenderingBenchmarkTests(TestCase):
+    def test_run(self):
+        shared_helper = HouseholdForm.helper
+        results = rendering.run(sizes=[30], requests=2)
+
+        names = ["index/rebuilt", "index/shared", "contact/rebuilt", "contact/shared"]
+        self.assertEqual(names, [result["name"] for result in results])
+        for result in results:
+            self.assertGreater(result["cpu_ms"], 0)
+            self.assertIn("cached_templates", result)
+
+        # The shared helpers are restored afterwards
+        self.assertIs(shared_helper, HouseholdForm.helper)
+        self.assertEqual(0, Meeting.objects.count())
+
+
+@skipUnless(household_search.is_available(), "Full-text search isn't supported")
+class SearchBenchmarkTests(TestCase):
+    def test_run(self):
+        results = search.run(sizes=[40], requests=len(search.TERMS))
+
+        self.assertEqual(["like", "full_text"], [result["name"] for result in results])
+        for result in results:
+            self.assertEqual(40, result["size"])
+            # count() and the first page
+            self.assertEqual(2, result["queries_per_request"])
+
+        # benchmark data is cleaned up afterwards
+        self.assertEqual(0, Household.objects.count())
+        self.assertEqual(0, Person.objects.count())
+        self.assertEqual([], list(household_search.search(Household.objects, "main")))
+
+
+class PaginationBenchmarkTests(TestCase):
+    @override_settings(HOMEVISIT_ESTIMATED_COUNT_MIN=10)
+    @mock.patch.object(MeetingAdmin, "list_per_page", 2)
+    def test_run(self):
+        results = pagination.run(sizes=[30], requests=2)
+
+        names = [result["name"] for result in results]
+        self.assertEqual(["offset_1", "keyset_1", "offset_10", "keyset_10"], names)
+        queries = {result["name"]: result["queries_per_request"] for result in results}
+        # Keyset pages estimate the count, rather than count every row
+        self.assertEqual(queries["offset_10"] - 1, queries["keyset_10"])
+
+        # benchmark data is cleaned up afterwards
+        self.assertEqual(0, MeetingGroup.objects.count())
+        self.assertEqual(0, Meeting.objects.count())
@@ -0,0 +1,146 @@
+from datetime import timedelta
+
+from django.core.exceptions import ValidationError
+from django.db.models.signals import post_delete, pre_delete
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+
+from . import availability, bulk, signals
+from .models import Household, Meeting, MeetingGroup
+from .test_admin import populate_households
+
+
+class BulkTestCase(TestCase):
+    def assertConstantQueries(self, change, small, large):
+        """``change`` issues as many queries for the ``large`` as the ``small`` batch."""
+        counts = []
+        for meetings in [small, large]:
+            with CaptureQueriesContext(connection) as queries:
+                change(meetings)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+
+class RawDeleteTests(TestCase):
+    """What raw_delete()'s callers rely on: nothing else references or listens."""
+
+    def assertDeleteReceivers(self, model, receivers):
+        """Only ``receivers`` are told of ``model``'s deletes (after they happen)."""
+        self.assertFalse(pre_delete.has_listeners(model))
+        for receiver in receivers:
+            self.assertTrue(post_delete.disconnect(receiver, sender=model))
+            self.addCleanup(post_delete.connect, receiver, sender=model)
+        self.assertFalse(post_delete.has_listeners(model))
+
+    def test_meetings(self):
+        # cancel_meetings() then recounts the groups' slots and invalidates
+        self.assertEqual([], list(Meeting._meta.related_objects))
+        self.assertDeleteReceivers(
+            Meeting, [signals.invalidate_availability, signals.refresh_group_counters]
+        )
+
+    def test_meeting_groups(self):
+        # Only meetings reference groups: the archive deletes them first, and then
+        # invalidates
+        related = [rel.related_model for rel in MeetingGroup._meta.related_objects]
+        self.assertEqual([Meeting], related)
+        self.assertDeleteReceivers(MeetingGroup, [signals.invalidate_availability])
+
+
+class ReleaseMeetingsTests(BulkTestCase):
+    def test_release(self):
+        populate_households(2)
+        household = Household.objects.get(address="0 Test Street")
+        version = availability.get_version()
+
+        released = bulk.release_meetings(household.meeting_set.all())
+
+        self.assertEqual(2, released)
+        self.assertFalse(household.meeting_set.exists())
+        self.assertFalse(Meeting.objects.filter(reserved__isnull=False, household=None))
+        group = MeetingGroup.objects.get()
+        self.assertEqual((4, 2), (group.total_slots, group.open_slots))
+        self.assertNotEqual(version, availability.get_version())
+
+    def test_constant_queries(self):
+        populate_households(12)
+        meetings = Meeting.objects.order_by("pk")
+        small = meetings.filter(pk__in=meetings.values_list("pk", flat=True)[:2])
+        self.assertConstantQueries(
+            bulk.release_meetings, small, meetings.filter(household__isnull=False)
+        )
+
+
+class CancelMeetingsTests(BulkTestCase):
+    def test_cancel(self):
+        populate_households(2)
+        household = Household.objects.get(address="0 Test Street")
+
+        self.assertEqual((2, 0), bulk.cancel_meetings(household.meeting_set.all()))
+        group = MeetingGroup.objects.get()
+        self.assertEqual((2, 0), (group.total_slots, group.open_slots))
+
+        self.assertEqual((2, 1), bulk.cancel_meetings(Meeting.objects.all()))
+        self.assertFalse(MeetingGroup.objects.exists())
+
+    def test_constant_queries(self):
+        populate_households(12)
+        meetings = Meeting.objects.order_by("pk")
+        pks = list(meetings.values_list("pk", flat=True))
+        # Neither empties the group (which would then be deleted as well)
+        self.assertConstantQueries(
+            bulk.cancel_meetings,
+            meetings.filter(pk__in=pks[:2]),
+            meetings.filter(pk__in=pks[2:-1]),
+        )
+
+
+class ShiftMeetingsTests(BulkTestCase):
+    def setUp(self):
+        # Back-to-back, hour-long meetings
+        populate_households(3)
+        self.meetings = Meeting.objects.order_by("start")
+
+    def test_shift(self):
+        before = [(m.start, m.end) for m in self.meetings.all()]
+        version = availability.get_version()
+
+        # Together, the meetings can move anywhere they don't overlap each other
+        self.assertEqual(6, bulk.shift_meetings(self.meetings.all(), 30))
+
+        delta = timedelta(minutes=30)
+        after = [(m.start - delta, m.end - delta) for m in self.meetings.all()]
+        self.assertEqual(before, after)
+        # Still comparable with (and sorted like) the other meetings' times
+        self.assertEqual(
+            6, Meeting.objects.filter(start__gte=before[0][0] + delta).count()
+        )
+        self.assertNotEqual(version, availability.get_version())
+
+    def test_overlap(self):
+        meeting = self.meetings.first()
+        first = self.meetings.filter(pk=meeting.pk)
+        with self.assertRaisesMessage(ValidationError, "Cannot overlap"):
+            bulk.shift_meetings(first, 30)
+        with self.assertRaisesMessage(ValidationError, "past"):
+            bulk.shift_meetings(first, -2 * 24 * 60)
+        self.assertEqual(meeting.start, first.get().start)
+
+    def test_other_day(self):
+        # Past midnight, off the group's date
+        with self.assertRaisesMessage(ValidationError, "its group's date"):
+            bulk.shift_meetings(self.meetings.all(), 24 * 60)
+        with self.assertRaisesMessage(ValidationError, "its group's date"):
+            bulk.shift_meetings(self.meetings.filter(pk=self.meetings.last().pk), 10 * 60)
+
+    def test_nothing_selected(self):
+        self.assertEqual(0, bulk.shift_meetings(Meeting.objects.none(), 30))
+
+    def test_constant_queries(self):
+        small = Meeting.objects.filter(pk__in=self.meetings.values_list("pk")[:2])
+        self.assertConstantQueries(
+            lambda meetings: bulk.shift_meetings(meetings, 6 * 60),
+            small,
+            Meeting.objects.all(),
+        )
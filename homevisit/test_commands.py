@@ -0,0 +1,241 @@
+from datetime import datetime, time, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from .models import ArchivedMeeting, Meeting, MeetingGroup, Weekdays
+from .test_archive import create_day
+
+
+class CreateMeetingsCommandTests(TestCase):
+    def setUp(self):
+        # Two full weeks, starting next Monday
+        today = timezone.now().date()
+        self.begin_date = today + timedelta(days=7 - today.weekday())
+        self.final_date = self.begin_date + timedelta(days=13)
+
+    def _create(self, *options):
+        out = StringIO()
+        call_command(
+            "create_meetings",
+            "Test",
+            str(self.begin_date),
+            str(self.final_date),
+            "18:00",
+            "19:30",
+            "MON",
+            *options,
+            stdout=out,
+        )
+        return out.getvalue()
+
+    def _verify_created(self):
+        self.assertEqual(2, MeetingGroup.objects.count())
+        self.assertEqual(4, Meeting.objects.count())
+        for group in MeetingGroup.objects.all():
+            self.assertIn(group.date, (self.begin_date, self.begin_date + timedelta(7)))
+            self.assertEqual(2, group.meeting_set.count())
+            for meeting in group.meeting_set.all():
+                self.assertEqual(timedelta(minutes=60), meeting.end - meeting.start)
+                self.assertEqual(group.date, timezone.localtime(meeting.start).date())
+
+    def test_bulk(self):
+        # The overlap check, the groups (then their ids), the meetings and the slots'
+        # recount, however many days are created. PostgreSQL returns the ids, but
+        # also takes the schedule lock and locks the groups.
+        queries = 10 if connection.vendor == "postgresql" else 9
+        with self.assertNumQueries(queries):
+            out = self._create("--bulk")
+        self._verify_created()
+        self.assertIn("Created 2 meeting groups and 4 meetings", out)
+        self.assertNotIn("Created meeting:", out)
+
+    def test_bulk_existing_groups_with_same_name(self):
+        MeetingGroup.objects.create(name=f"Test: {self.begin_date}", date=self.begin_date)
+        self._create("--batch-size", "1")
+
+        groups = MeetingGroup.objects.filter(date=self.begin_date).order_by("pk")
+        self.assertEqual(0, groups[0].meeting_set.count())
+        self.assertEqual(2, groups[1].meeting_set.count())
+
+    def test_no_bulk(self):
+        self._create("--no-bulk")
+        self._verify_created()
+
+    def test_counts_slots(self):
+        for options in [(), ("--no-bulk",)]:
+            with self.subTest(options=options):
+                MeetingGroup.objects.all().delete()
+                self._create(*options)
+                self.assertEqual(
+                    [(2, 2), (2, 2)],
+                    list(MeetingGroup.objects.values_list("total_slots", "open_slots")),
+                )
+
+    def test_verbose(self):
+        out = self._create("--verbose")
+        self.assertEqual(2, out.count("Created meeting group:"))
+        self.assertEqual(4, out.count("Created meeting:"))
+
+    def test_dry_run(self):
+        out = self._create("--dry-run")
+        self.assertIn("would create 2 meeting groups and 4 meetings", out)
+        self.assertEqual(0, MeetingGroup.objects.count())
+        self.assertEqual(0, Meeting.objects.count())
+
+    def test_overlaps_existing_meetings(self):
+        self._create()
+        with self.assertRaisesRegex(CommandError, "Cannot overlap with another meeting"):
+            self._create()
+        self._verify_created()
+
+
+class CancelMeetingsCommandTests(TestCase):
+    def setUp(self):
+        # Three weeks of Monday + Wednesday meetings (2 per day), starting next Monday
+        today = timezone.now().date()
+        self.monday = today + timedelta(days=7 - today.weekday())
+        for week in range(3):
+            for day in (0, 2):
+                group_date = self.monday + timedelta(weeks=week, days=day)
+                group = MeetingGroup.objects.create(name="Test", date=group_date)
+                for hour in (18, 19):
+                    start = timezone.make_aware(datetime.combine(group_date, time(hour)))
+                    Meeting.objects.create(
+                        name="Test",
+                        start=start,
+                        end=start + timedelta(hours=1),
+                        group=group,
+                    )
+
+    def _cancel(self, *args):
+        out = StringIO()
+        call_command("cancel_meetings", *args, stdout=out)
+        return out.getvalue()
+
+    def test_dates(self):
+        wednesday = self.monday + timedelta(days=2)
+        # One DELETE for all meetings; the rest find and delete emptied groups, then
+        # recount the remaining groups' slots in one UPDATE (after locking them, on
+        # backends that can)
+        queries = 9 if connection.features.has_select_for_update else 8
+        with self.assertNumQueries(queries):
+            out = self._cancel(str(self.monday), str(wednesday))
+
+        self.assertIn("Cancelled 4 meetings and deleted 2 emptied meeting groups", out)
+        self.assertEqual(8, Meeting.objects.count())
+        self.assertFalse(MeetingGroup.objects.filter(date__in=[self.monday, wednesday]))
+
+    def test_range(self):
+        out = self._cancel("--from", str(self.monday + timedelta(weeks=1)))
+        self.assertIn("Cancelled 8 meetings", out)
+        self.assertEqual(2, MeetingGroup.objects.count())
+
+        out = self._cancel("--to", str(self.monday))
+        self.assertIn("Cancelled 2 meetings", out)
+        self.assertEqual(1, MeetingGroup.objects.count())
+
+    def test_range_with_days(self):
+        out = self._cancel(
+            "--from",
+            str(self.monday),
+            "--to",
+            str(self.monday + timedelta(weeks=3)),
+            "--days",
+            "WED",
+        )
+        self.assertIn("Cancelled 6 meetings and deleted 3 emptied meeting groups", out)
+        for meeting in Meeting.objects.all():
+            self.assertEqual(
+                Weekdays.MON, timezone.localtime(meeting.start).weekday(), meeting
+            )
+
+    def test_partially_cancelled_group_kept(self):
+        group = MeetingGroup.objects.get(date=self.monday)
+        late = group.meeting_set.order_by("start").last()
+        late.start = late.start + timedelta(days=1)
+        late.end = late.end + timedelta(days=1)
+        late.save()
+
+        out = self._cancel(str(self.monday))
+        self.assertIn("Cancelled 1 meetings and deleted 0 emptied meeting groups", out)
+        group.refresh_from_db()
+        self.assertEqual((1, 1), (group.total_slots, group.open_slots))
+
+    def test_requires_dates(self):
+        with self.assertRaisesRegex(CommandError, "Provide the dates"):
+            self._cancel()
+        with self.assertRaisesRegex(CommandError, "--to must not be before --from"):
+            self._cancel(
+                "--from", str(self.monday), "--to", str(self.monday - timedelta(1))
+            )
+
+
+class RebuildGroupCountersCommandTests(TestCase):
+    def setUp(self):
+        start = timezone.now() + timedelta(days=1)
+        self.group = MeetingGroup.objects.create(name="Test", date=start.date())
+        for hour in range(3):
+            Meeting.objects.create(
+                name="Test",
+                start=start + timedelta(hours=hour),
+                end=start + timedelta(hours=hour, minutes=30),
+                group=self.group,
+            )
+        MeetingGroup.objects.create(name="Empty", date=start.date())
+        # Drift, like after a raw SQL change
+        MeetingGroup.objects.filter(pk=self.group.pk).update(total_slots=1, open_slots=0)
+
+    def _rebuild(self, *args):
+        out = StringIO()
+        call_command("rebuild_group_counters", *args, stdout=out)
+        return out.getvalue()
+
+    def test_rebuild(self):
+        out = self._rebuild()
+        self.assertIn("Rebuilt the counters of 2 meeting groups (1 had drifted)", out)
+        self.group.refresh_from_db()
+        self.assertEqual((3, 3), (self.group.total_slots, self.group.open_slots))
+
+    def test_dry_run(self):
+        out = self._rebuild("--dry-run")
+        self.assertIn("Dry run: 1 meeting groups drifted", out)
+        self.group.refresh_from_db()
+        self.assertEqual((1, 0), (self.group.total_slots, self.group.open_slots))
+
+
+class ArchivePastMeetingsCommandTests(TestCase):
+    def setUp(self):
+        create_day(45, meetings=3)
+        create_day(40)
+        create_day(5)
+
+    def _archive(self, *args):
+        out = StringIO()
+        call_command("archive_past_meetings", *args, stdout=out)
+        return out.getvalue()
+
+    def test_archive(self):
+        out = self._archive("--days", "30", "--batch-size", "1")
+        self.assertIn("Archived 5 meetings in 2 meeting groups", out)
+        self.assertEqual(5, ArchivedMeeting.objects.count())
+        self.assertEqual(2, Meeting.objects.count())
+
+    def test_dry_run(self):
+        out = self._archive("--days", "30", "--dry-run")
+        self.assertIn("Dry run: would archive 5 meetings in 2 meeting groups", out)
+        self.assertEqual(0, ArchivedMeeting.objects.count())
+
+    def test_default_days(self):
+        with self.settings(HOMEVISIT_ARCHIVE_AFTER_DAYS=42):
+            self.assertIn("Archived 3 meetings in 1 meeting groups", self._archive())
+
+    def test_invalid(self):
+        with self.assertRaisesMessage(CommandError, "--days"):
+            self._archive("--days", "-1")
+        with self.assertRaisesMessage(CommandError, "--batch-size"):
+            self._archive("--batch-size", "0")
@@ -0,0 +1,116 @@
+import threading
+from datetime import timedelta
+from unittest import skipUnless
+
+from django.conf import settings
+from django.db import OperationalError, connection
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Feedback, Household, MeetingGroup
+from .test_models import create_meeting
+
+
+@skipUnless(connection.vendor == "sqlite", "SQLite-specific tuning")
+class SQLiteTuningTests(TestCase):
+    def _pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    def test_pragmas(self):
+        self.assertEqual("wal", self._pragma("journal_mode"))
+        self.assertEqual(1, self._pragma("synchronous"))  # NORMAL
+        pragmas = settings.HOMEVISIT_SQLITE_PRAGMAS
+        self.assertEqual(pragmas["cache_size"], self._pragma("cache_size"))
+        self.assertEqual(pragmas["mmap_size"], self._pragma("mmap_size"))
+
+
+class ConcurrentReadWriteTests(TransactionTestCase):
+    """Bookings and feedback are written while other visitors keep browsing."""
+
+    bookings = 20
+    readers = 20
+    requests_per_reader = 5
+
+    def setUp(self):
+        settings.EMAIL_HOST_USER = None
+        start = timezone.now() + timedelta(days=1)
+        self.meetings = [
+            create_meeting(
+                start + timedelta(hours=2 * ndx), start + timedelta(hours=2 * ndx + 1)
+            )
+            for ndx in range(self.bookings)
+        ]
+        # Warm up imports and template loading, like a long-running server process
+        self.client.get(reverse("index"))
+
+    def _book(self, ndx):
+        meeting = self.meetings[ndx]
+        data = {
+            "ownerForm-first_name": f"User{ndx}",
+            "ownerForm-last_name": "LastName",
+            "ownerForm-email": f"user{ndx}@test.com",
+            "ownerForm-phone_number": "",
+            "address": f"User {ndx} Address",
+            "meeting_dates": meeting.group.id,
+            "meeting": meeting.id,
+        }
+        return [self.client_class().post(reverse("index"), data)]
+
+    def _send_feedback(self, ndx):
+        data = {
+            "name": f"User{ndx}",
+            "email": f"user{ndx}@test.com",
+            "phone_number": "",
+            "issue": "GENERAL",
+            "comment": "Concurrent feedback",
+        }
+        return [self.client_class().post(reverse("contact"), data)]
+
+    def _browse(self, ndx):
+        client = self.client_class()
+        group = self.meetings[ndx % self.bookings].group
+        responses = []
+        for _ in range(self.requests_per_reader):
+            responses.append(client.get(reverse("index")))
+            responses.append(client.get(reverse("ajax_load_times"), {"group": group.id}))
+        return responses
+
+    def _run(self, target, ndx, barrier, results):
+        try:
+            barrier.wait()
+            results[(target.__name__, ndx)] = [r.status_code for r in target(ndx)]
+        except OperationalError as error:
+            results[(target.__name__, ndx)] = error
+        finally:
+            connection.close()
+
+    def test_concurrent_reads_and_writes(self):
+        targets = [(self._book, ndx) for ndx in range(self.bookings)]
+        targets += [(self._send_feedback, ndx) for ndx in range(self.bookings)]
+        targets += [(self._browse, ndx) for ndx in range(self.readers)]
+
+        barrier = threading.Barrier(len(targets))
+        results = {}
+        threads = [
+            threading.Thread(target=self._run, args=(target, ndx, barrier, results))
+            for target, ndx in targets
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        errors = [r for r in results.values() if isinstance(r, OperationalError)]
+        self.assertEqual([], errors)
+        for (name, ndx), statuses in results.items():
+            expected = 200 if name == "_browse" else 302
+            self.assertEqual({expected}, set(statuses), (name, ndx))
+
+        self.assertEqual(self.bookings, Household.objects.count())
+        self.assertEqual(self.bookings, Feedback.objects.count())
+        self.assertFalse(
+            MeetingGroup.objects.exclude(meeting__household__isnull=False).exists()
+        )
@@ -0,0 +1,111 @@
+import csv
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from . import exports
+from .models import Feedback, Household, Meeting
+from .test_admin import populate_households
+
+
+class ExportTests(TestCase):
+    def _csv(self, name, queryset=None, **kwargs):
+        content = "".join(exports.stream(name, "csv", queryset, **kwargs))
+        return list(csv.DictReader(StringIO(content)))
+
+    def test_households(self):
+        populate_households(2)
+        household = Household.objects.order_by("pk").first()
+        upcoming = household.meeting_set.order_by("start").first()
+
+        with self.assertNumQueries(1):
+            rows = self._csv("households")
+
+        self.assertEqual(2, len(rows))
+        self.assertEqual(
+            {
+                "id": str(household.pk),
+                "address": "0 Test Street",
+                "owner_first_name": "First0",
+                "owner_last_name": "Last",
+                "owner_email": "user0@test.com",
+                "owner_phone_number": "+15307777777",
+                "next_meeting": timezone.localtime(upcoming.start).isoformat(),
+                "created_date": timezone.localtime(household.created_date).isoformat(),
+            },
+            rows[0],
+        )
+
+    def test_household_without_owner(self):
+        Household.objects.create(address="Nobody's home")
+        row = self._csv("households")[0]
+        self.assertEqual("", row["owner_first_name"])
+        self.assertEqual("", row["next_meeting"])
+
+    def test_meetings_chunked(self):
+        populate_households(3)
+        rows = self._csv("meetings", chunk_size=2)
+        self.assertEqual(6, len(rows))
+        self.assertEqual(
+            list(Meeting.objects.order_by("pk").values_list("pk", flat=True)),
+            [int(row["id"]) for row in rows],
+        )
+        self.assertEqual("0 Test Street", rows[0]["household_address"])
+
+    def test_selection(self):
+        populate_households(3)
+        selected = Household.objects.filter(address="1 Test Street").with_owner()
+        rows = self._csv("households", selected)
+        self.assertEqual(["1 Test Street"], [row["address"] for row in rows])
+
+    def test_json(self):
+        Feedback.objects.create(
+            name="Someone",
+            email="someone@test.com",
+            phone_number="530-777-7777",
+            issue="GENERAL",
+            comment='Quotes " and\nnewlines',
+        )
+        rows = json.loads("".join(exports.stream("feedback", "json")))
+        self.assertEqual(1, len(rows))
+        self.assertEqual('Quotes " and\nnewlines', rows[0]["comment"])
+        self.assertEqual("+15307777777", rows[0]["phone_number"])
+        self.assertFalse(rows[0]["responded"])
+
+    def test_json_empty(self):
+        self.assertEqual([], json.loads("".join(exports.stream("feedback", "json"))))
+
+    def test_streaming_response(self):
+        populate_households(1)
+        response = exports.streaming_response("meetings", "csv")
+        self.assertTrue(response.streaming)
+        self.assertEqual("text/csv", response["Content-Type"])
+        self.assertIn('filename="meetings.csv"', response["Content-Disposition"])
+        content = b"".join(response.streaming_content).decode()
+        self.assertEqual(3, len(content.splitlines()))
+
+
+class ExportCommandTests(TestCase):
+    def test_stdout(self):
+        populate_households(1)
+        out = StringIO()
+        call_command("export", "meetings", "--format", "json", stdout=out)
+        self.assertEqual(2, len(json.loads(out.getvalue())))
+
+    def test_output_file(self):
+        populate_households(2)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "households.csv")
+            out = StringIO()
+            call_command("export", "households", "--output", path, stdout=out)
+            self.assertIn(f"Exported households to {path}", out.getvalue())
+            with open(path, newline="") as exported:
+                rows = list(csv.DictReader(exported))
+
+        self.assertEqual(["0 Test Street", "1 Test Street"], [r["address"] for r in rows])
+        self.assertNotEqual("", rows[0]["next_meeting"])
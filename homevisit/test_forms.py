@@ -2,7 +2,7 @@ from django.test import TestCase
 from django.conf import settings
 
 from .forms import OwnerForm, HouseholdForm
-from .models import Meeting, MeetingGroup
+from .models import Household, Meeting, MeetingGroup
 from .test_models import RecurringMeetingTestConfig, populate_example_meetings
 
 
@@ -71,6 +71,11 @@ class HouseholdFormTests(TestCase):
         choices = [choice for choice in meeting_choice_field.choices]
         self.assertTrue(len(choices) > 0)
 
+    def test_layout_shared(self):
+        # Layouts are built once, not per form instance
+        self.assertIs(HouseholdForm().helper, HouseholdForm().helper)
+        self.assertEqual("4", HouseholdForm().fields["address"].widget.attrs["rows"])
+
     def test_initial_form_no_meetings(self):
         self._clean_setup_data()
         form = HouseholdForm()
@@ -130,3 +135,21 @@ class HouseholdFormTests(TestCase):
         form = self._verify_form(form_data, True)
 
         self.assertEqual(meeting, form.cleaned_data["meeting_obj"])
+
+    def test_meeting_taken(self):
+        group = MeetingGroup.objects.all()[0]
+        meeting = group.meeting_set.first()
+        meeting.household = Household.objects.create(address="Taken")
+        meeting.save()
+
+        form_data = dict(
+            address="Test Address Value", meeting_dates=group.id, meeting=meeting.id
+        )
+        form = self._verify_form(form_data, False)
+        self._verify_error(form.errors, "meeting", "just reserved by someone else")
+
+    def test_meeting_invalid(self):
+        group = MeetingGroup.objects.all()[0]
+        form_data = dict(address="Test Address", meeting_dates=group.id, meeting="bad")
+        form = self._verify_form(form_data, False)
+        self._verify_error(form.errors, "meeting", "just reserved by someone else")
@@ -0,0 +1,137 @@
+import socketserver
+import threading
+
+from django.core.mail import EmailMessage
+from django.test import TestCase, override_settings
+
+from . import outbox
+from .mail import ConnectionPool, pool
+from .models import QueuedEmail
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough of SMTP to accept messages from smtplib."""
+
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        self.server.connections += 1
+        self.reply("220 localhost ESMTP test server")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                break
+            command = line.decode().strip().upper()
+            if command.startswith("EHLO"):
+                self.reply("250-localhost")
+                self.reply("250 8BITMIME")
+            elif command.startswith("RCPT") and "REJECT@" in command:
+                self.reply("550 No such user")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                self.server.messages += 1
+                self.reply("250 OK")
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                break
+            else:
+                self.reply("250 OK")
+
+
+class _SMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _SMTPHandler)
+        self.connections = 0
+        self.messages = 0
+
+
+class ConnectionPoolTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = _SMTPServer()
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.server.connections = self.server.messages = 0
+        settings_override = override_settings(
+            EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend",
+            EMAIL_HOST="127.0.0.1",
+            EMAIL_PORT=self.server.server_address[1],
+            EMAIL_USE_TLS=False,
+            EMAIL_HOST_USER=None,
+            EMAIL_HOST_PASSWORD=None,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        # The shared pool may hold a connection from another email backend
+        pool.close()
+        self.addCleanup(pool.close)
+
+    def _messages(self, count):
+        return [
+            EmailMessage(f"Subject {i}", "Body", "owner@test.com", ["user@test.com"])
+            for i in range(count)
+        ]
+
+    def test_reuses_connection(self):
+        test_pool = ConnectionPool(idle_timeout=60)
+        self.assertEqual([None] * 3, test_pool.send_messages(self._messages(3)))
+        self.assertEqual([None] * 2, test_pool.send_messages(self._messages(2)))
+        test_pool.close()
+
+        self.assertEqual(1, self.server.connections)
+        self.assertEqual(5, self.server.messages)
+        stats = test_pool.stats()
+        self.assertEqual(1, stats["handshakes"])
+        self.assertEqual(5, stats["messages_sent"])
+        self.assertEqual(4, stats["handshakes_saved"])
+        self.assertGreater(stats["send_seconds"], 0)
+
+    def test_idle_timeout(self):
+        test_pool = ConnectionPool(idle_timeout=0)
+        test_pool.send_messages(self._messages(1))
+        test_pool.send_messages(self._messages(1))
+        test_pool.close()
+
+        self.assertEqual(2, self.server.connections)
+        self.assertEqual(2, test_pool.handshakes)
+        self.assertEqual(0, test_pool.handshakes_saved)
+
+    def test_send_due_batches_contact_emails(self):
+        # The contact form queues a notice for the site owner and an acknowledgement
+        for to_email in ("owner@test.com", "user@test.com"):
+            outbox.queue_email("Feedback", "<p>Body</p>", "owner@test.com", to_email)
+
+        self.assertEqual((2, 0), outbox.send_due())
+        pool.close()
+
+        self.assertEqual(1, self.server.connections)
+        self.assertEqual(2, self.server.messages)
+        self.assertEqual(2, QueuedEmail.objects.filter(status=QueuedEmail.SENT).count())
+
+    def test_failed_message_does_not_stop_batch(self):
+        test_pool = ConnectionPool(idle_timeout=60)
+        messages = self._messages(3)
+        messages[1].to = ["reject@test.com"]
+
+        errors = test_pool.send_messages(messages)
+        test_pool.close()
+
+        self.assertIsNone(errors[0])
+        self.assertIsNotNone(errors[1])
+        self.assertIsNone(errors[2])
+        self.assertEqual(2, self.server.messages)
@@ -0,0 +1,86 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from . import metrics
+from .models import Faq, MeetingGroup
+from .test_models import RecurringMeetingTestConfig, populate_example_meetings
+
+
+class RequestMetricsMiddlewareTests(TestCase):
+    def setUp(self):
+        metrics.reset()
+        Faq.objects.create(short_name="faq", question="Question?", answer="Answer")
+
+    def test_records_view_metrics(self):
+        cache.clear()
+        with self.assertLogs("homevisit.middleware", "INFO") as logs:
+            self.client.get(reverse("index"))
+            # Meeting availability is now cached: no queries
+            self.client.get(reverse("index"))
+
+        index = metrics.snapshot()["index"]
+        self.assertEqual(2, index["wall_ms"]["count"])
+        self.assertEqual(0.5, index["queries"]["mean"])
+        self.assertEqual(
+            {"<=0": 1, "<=1": 1},
+            {
+                bucket: count
+                for bucket, count in index["queries"]["buckets"].items()
+                if count
+            },
+        )
+        self.assertGreater(index["db_ms"]["max"], 0)
+        self.assertGreater(index["template_ms"]["max"], 0)
+        self.assertLessEqual(index["template_ms"]["max"], index["wall_ms"]["max"])
+
+        self.assertEqual(2, len(logs.records))
+        self.assertRegex(
+            logs.output[0],
+            r"view=index method=GET status=200 wall_ms=[\d.]+ queries=1 db_ms=[\d.]+ "
+            r"template_ms=[\d.]+$",
+        )
+
+    def test_unresolved(self):
+        self.client.get("/does-not-exist")
+        self.assertIn("<unresolved>", metrics.snapshot())
+
+    @override_settings(HOMEVISIT_QUERY_BUDGET=1)
+    def test_query_budget(self):
+        populate_example_meetings(RecurringMeetingTestConfig())
+        with self.assertLogs("homevisit.middleware", "INFO") as logs:
+            self.client.get(reverse("faqs"))
+            # Looks up the (uncached) group and then its meetings: 2 queries
+            group = MeetingGroup.objects.first()
+            self.client.get(reverse("ajax_load_times"), {"group": group.id})
+
+        self.assertEqual(["INFO", "WARNING"], [r.levelname for r in logs.records])
+        self.assertIn("view=ajax_load_times", logs.output[1])
+        self.assertIn("over_query_budget=1", logs.output[1])
+
+    def test_metrics_endpoint(self):
+        self.client.get(reverse("faqs"))
+
+        # Staff only
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(302, response.status_code)
+
+        staff = User.objects.create_user("staff", password="password", is_staff=True)
+        self.client.force_login(staff)
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(1, response.json()["faqs"]["wall_ms"]["count"])
+
+
+class HistogramTests(TestCase):
+    def test_add(self):
+        histogram = metrics.Histogram([1, 10])
+        for value in [0, 1, 5, 10, 11, 100]:
+            histogram.add(value)
+
+        snapshot = histogram.snapshot()
+        self.assertEqual({"<=1": 2, "<=10": 2, ">10": 2}, snapshot["buckets"])
+        self.assertEqual(6, snapshot["count"])
+        self.assertEqual(127 / 6, snapshot["mean"])
+        self.assertEqual(100, snapshot["max"])
@@ -2,7 +2,9 @@ import logging
 from datetime import timedelta, date, time, datetime
 from typing import List, Optional
 
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 
@@ -158,6 +160,18 @@ class MeetingModelTests(TestCase):
         with self.assertRaisesRegex(ValidationError, "Date cannot be in the past"):
             create_meeting(start, end)
 
+    def test_past_dates_reported_by_field(self):
+        now = timezone.now()
+        meeting = Meeting(
+            name="Test",
+            start=now - timedelta(hours=2),
+            end=now - timedelta(hours=1),
+            reserved=now - timedelta(hours=3),
+        )
+        with self.assertRaises(ValidationError) as context:
+            meeting.clean_fields(exclude=["end", "group"])
+        self.assertEqual({"start", "reserved"}, set(context.exception.message_dict))
+
     def test_end_equal_to_start(self):
         start = timezone.now() + timedelta(hours=1)
         with self.assertRaisesRegex(
@@ -173,6 +187,13 @@ class MeetingModelTests(TestCase):
         ):
             create_meeting(start, end)
 
+    def test_too_long(self):
+        start = timezone.now() + timedelta(hours=1)
+        create_meeting(start, start + timedelta(weeks=1))
+        start += timedelta(weeks=2)
+        with self.assertRaisesRegex(ValidationError, "cannot last longer than 10080"):
+            create_meeting(start, start + timedelta(weeks=1, minutes=1))
+
     def test_meeting_overlaps(self):
         start = timezone.now() + timedelta(hours=3)
         end = start + timedelta(hours=1)
@@ -217,6 +238,24 @@ class MeetingModelTests(TestCase):
 
         self.assertEqual(3, Meeting.objects.count())
 
+    def test_meeting_edit_does_not_overlap_itself(self):
+        start = timezone.now() + timedelta(hours=3)
+        meeting = create_meeting(start, start + timedelta(hours=1))
+
+        meeting.end = meeting.end + timedelta(minutes=30)
+        meeting.full_clean()
+
+    def test_schedule_meetings_overlap(self):
+        config = RecurringMeetingTestConfig()
+        populate_example_meetings(config)
+        count = Meeting.objects.count()
+
+        with self.assertRaisesRegex(
+            ValidationError, "Cannot overlap with another meeting"
+        ):
+            populate_example_meetings(config)
+        self.assertEqual(count, Meeting.objects.count())
+
     def test_schedule_meetings(self):
         mock_now: datetime = datetime(2018, 1, 1, 20, 0, 0, tzinfo=pytz.utc)
         config: RecurringMeetingTestConfig = RecurringMeetingTestConfig()
@@ -247,6 +286,32 @@ class MeetingModelTests(TestCase):
             meeting_start = meeting.start.time()
             self.assertEqual(meeting_start, config.start_times[ndx])
 
+    def test_schedule_meetings_bulk(self):
+        mock_now: datetime = datetime(2018, 1, 1, 20, 0, 0, tzinfo=pytz.utc)
+        group = MeetingGroup.objects.create(name="Bulk", date=mock_now.date())
+        config: RecurringMeetingTestConfig = RecurringMeetingTestConfig()
+
+        with CaptureQueriesContext(connection) as queries:
+            created = Meeting.schedule_recurring(
+                "Bulk",
+                mock_now.date(),
+                mock_now.date() + timedelta(days=config.days),
+                config.duration_mins,
+                config.weekdays,
+                config.start_times,
+                create_after=mock_now,
+                group=group,
+                batch_size=5,
+            )
+
+        # 11 meetings (see test_schedule_meetings) inserted 5 at a time
+        self.assertEqual(11, len(created))
+        self.assertEqual(11, Meeting.objects.filter(group=group).count())
+        inserts = [q for q in queries.captured_queries if q["sql"].startswith("INSERT")]
+        self.assertEqual(3, len(inserts))
+        group.refresh_from_db()
+        self.assertEqual((11, 11), (group.total_slots, group.open_slots))
+
     def test_meeting_string(self):
         next_year = timezone.now().year + 1
         start: datetime = datetime(next_year, 1, 1, 19, 0, 0, tzinfo=pytz.utc)
@@ -272,3 +337,60 @@ class MeetingModelTests(TestCase):
             f"{end_weekday.name.capitalize()}, Jan. 3, {next_year} 12:00 PM",
             str(meeting),
         )
+
+
+class MeetingGroupCounterTests(TestCase):
+    def setUp(self):
+        start = timezone.now() + timedelta(days=1)
+        self.meeting = create_meeting(start, start + timedelta(hours=1))
+        self.group = self.meeting.group
+        self.sibling = create_meeting(
+            self.meeting.end, self.meeting.end + timedelta(hours=1), group=self.group
+        )
+
+    def assertSlots(self, total, open_slots, group=None):
+        group = group or self.group
+        group.refresh_from_db()
+        self.assertEqual((total, open_slots), (group.total_slots, group.open_slots))
+
+    def test_create(self):
+        self.assertSlots(2, 2)
+
+    def test_reserve_and_cancel(self):
+        household = create_household("Test Address")
+        self.meeting.household = household
+        self.meeting.save()
+        self.assertSlots(2, 1)
+        self.assertFalse(MeetingGroup.objects.open().exists())
+
+        self.meeting.household = None
+        self.meeting.save()
+        self.assertSlots(2, 2)
+        self.assertTrue(MeetingGroup.objects.open().exists())
+
+    def test_household_deleted(self):
+        household = create_household("Test Address")
+        self.meeting.household = household
+        self.meeting.save()
+
+        household.delete()
+        self.assertSlots(2, 2)
+
+    def test_move_to_another_group(self):
+        other = MeetingGroup.objects.create(name="Other", date=self.group.date)
+        self.sibling.group = other
+        self.sibling.save()
+        self.assertSlots(1, 1)
+        self.assertSlots(1, 1, group=other)
+
+    def test_delete(self):
+        self.sibling.delete()
+        self.assertSlots(1, 1)
+
+    def test_refresh_counters(self):
+        MeetingGroup.objects.update(total_slots=5, open_slots=0)
+        group = MeetingGroup.objects.with_slot_counts().get()
+        self.assertEqual((2, 2), (group.slot_count, group.open_slot_count))
+
+        self.assertEqual(1, MeetingGroup.objects.all().refresh_counters())
+        self.assertSlots(2, 2)
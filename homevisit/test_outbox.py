@@ -0,0 +1,91 @@
+from datetime import timedelta
+from io import StringIO
+from smtplib import SMTPException
+from unittest.mock import patch
+
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from . import outbox
+from .models import QueuedEmail
+
+
+@override_settings(HOMEVISIT_EMAIL_RETRY_SECONDS=60, HOMEVISIT_EMAIL_MAX_ATTEMPTS=3)
+class OutboxTests(TestCase):
+    def setUp(self):
+        self.queued = outbox.queue_email(
+            "Subject",
+            "<p>Body</p>",
+            from_email="owner@test.com",
+            to_email="user@test.com",
+            cc_emails=["owner@test.com", "other@test.com"],
+        )
+
+    def test_queue_email(self):
+        self.assertEqual(QueuedEmail.PENDING, self.queued.status)
+        self.assertEqual(0, len(mail.outbox))
+
+        message = outbox.to_message(self.queued)
+        self.assertEqual(["user@test.com"], message.to)
+        self.assertEqual(["owner@test.com", "other@test.com"], message.cc)
+        self.assertEqual("html", message.content_subtype)
+
+    def test_send_due(self):
+        self.assertEqual((1, 0), outbox.send_due())
+
+        self.assertEqual(1, len(mail.outbox))
+        self.assertEqual("Subject", mail.outbox[0].subject)
+        self.queued.refresh_from_db()
+        self.assertEqual(QueuedEmail.SENT, self.queued.status)
+        self.assertEqual(1, self.queued.attempts)
+        self.assertIsNotNone(self.queued.sent_date)
+
+        # Nothing left to send
+        self.assertEqual((0, 0), outbox.send_due())
+        self.assertEqual(1, len(mail.outbox))
+
+    def test_send_due_not_yet(self):
+        QueuedEmail.objects.update(next_attempt=timezone.now() + timedelta(minutes=1))
+        self.assertEqual((0, 0), outbox.send_due())
+
+    def test_claimed_messages_not_resent(self):
+        claimed = outbox._claim_due(10)
+        self.assertEqual([self.queued], claimed)
+        self.assertEqual([], outbox._claim_due(10))
+
+    @patch(
+        "django.core.mail.backends.locmem.EmailBackend.send_messages",
+        side_effect=SMTPException("down"),
+    )
+    def test_retry_with_backoff(self, mock_send):
+        expected_backoffs = [60, 120]
+        for backoff in expected_backoffs:
+            before = timezone.now()
+            self.assertEqual((0, 1), outbox.send_due())
+
+            self.queued.refresh_from_db()
+            self.assertEqual(QueuedEmail.PENDING, self.queued.status)
+            self.assertIn("down", self.queued.last_error)
+            self.assertGreaterEqual(
+                self.queued.next_attempt, before + timedelta(seconds=backoff)
+            )
+            QueuedEmail.objects.update(next_attempt=timezone.now())
+
+        # 3rd failure: give up
+        self.assertEqual((0, 1), outbox.send_due())
+        self.queued.refresh_from_db()
+        self.assertEqual(QueuedEmail.FAILED, self.queued.status)
+        self.assertEqual(3, self.queued.attempts)
+
+        QueuedEmail.objects.update(next_attempt=timezone.now())
+        self.assertEqual((0, 0), outbox.send_due())
+        self.assertEqual(3, mock_send.call_count)
+
+    def test_command(self):
+        out = StringIO()
+        call_command("send_queued_email", "--once", stdout=out)
+
+        self.assertIn("Sent 1 emails (0 failed)", out.getvalue())
+        self.assertEqual(1, len(mail.outbox))
@@ -0,0 +1,84 @@
+from datetime import timedelta
+
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from django.utils import timezone
+
+from .models import Meeting
+from .overlaps import find_conflicts, validate_no_overlaps
+from .test_models import create_meeting
+
+
+class FindConflictsTests(TestCase):
+    def setUp(self):
+        self.start = timezone.now().replace(microsecond=0) + timedelta(days=1)
+        self.existing = create_meeting(self.start, self.start + timedelta(hours=1))
+
+    def _meeting(self, start_mins, end_mins):
+        return Meeting(
+            name="New",
+            start=self.start + timedelta(minutes=start_mins),
+            end=self.start + timedelta(minutes=end_mins),
+        )
+
+    def test_no_conflicts(self):
+        # Meetings may touch each other (or the existing meeting) without overlapping
+        batch = [self._meeting(-60, 0), self._meeting(60, 90), self._meeting(90, 120)]
+        with self.assertNumQueries(1):
+            self.assertEqual([], find_conflicts(batch))
+        validate_no_overlaps(batch)
+
+    def test_empty_batch(self):
+        with self.assertNumQueries(0):
+            self.assertEqual([], find_conflicts([]))
+
+    def test_conflicts_with_existing(self):
+        inside = self._meeting(15, 30)
+        self.assertEqual([(inside, self.existing)], find_conflicts([inside]))
+
+        # The new meeting starts first, but still overlaps
+        before = self._meeting(-30, 30)
+        self.assertEqual([(before, self.existing)], find_conflicts([before]))
+
+        # The existing meeting is contained by the new one
+        around = self._meeting(-30, 90)
+        self.assertEqual([(around, self.existing)], find_conflicts([around]))
+
+    def test_conflicts_within_batch(self):
+        first = self._meeting(120, 180)
+        second = self._meeting(170, 200)
+        self.assertEqual([(second, first)], find_conflicts([second, first]))
+
+        with self.assertRaisesRegex(
+            ValidationError, "Cannot overlap with another meeting"
+        ):
+            validate_no_overlaps([second, first])
+
+    def test_longest_meeting(self):
+        # Starts long before the batch's window, but still overlaps it
+        self.existing.end = self.existing.start + timedelta(days=1)
+        self.existing.save()
+        late = self._meeting(24 * 60 - 30, 24 * 60 + 30)
+        self.assertEqual([(late, self.existing)], find_conflicts([late]))
+
+        with self.settings(HOMEVISIT_MAX_MEETING_MINUTES=60):
+            with self.assertRaisesRegex(ValidationError, "longer than 60 minutes"):
+                validate_no_overlaps([self._meeting(120, 181)])
+
+    def test_saved_meetings_do_not_conflict_with_themselves(self):
+        self.existing.end += timedelta(minutes=30)
+        self.assertEqual([], find_conflicts([self.existing]))
+
+    def test_existing_overlaps_ignored(self):
+        # Overlaps that are already in the database are not the batch's problem
+        Meeting.objects.bulk_create(
+            [
+                Meeting(
+                    name="Old",
+                    start=self.start,
+                    end=self.existing.end,
+                    group=self.existing.group,
+                )
+            ]
+        )
+        self.assertEqual([], find_conflicts([self._meeting(60, 90)]))
@@ -0,0 +1,67 @@
+from datetime import timedelta
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from .models import Feedback, Household, Meeting, MeetingGroup, QueuedEmail
+
+
+@skipUnless(connection.vendor == "sqlite", "Query plans are SQLite-specific")
+class QueryPlanTests(TestCase):
+    """Guards the indexes used by the hottest queries against regressions."""
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertRegex(plan, f"USING (COVERING )?INDEX {index_name}\\b", plan)
+
+    def setUp(self):
+        self.now = timezone.now()
+        self.today = self.now.date()
+
+    def test_open_groups_by_date(self):
+        groups = (
+            MeetingGroup.objects.filter(
+                date__gte=self.today, date__lte=self.today + timedelta(weeks=52)
+            )
+            .open()
+            .order_by("date")
+        )
+        self.assertUsesIndex(groups, "homevisit_group_date")
+        # Served by the group's counters alone
+        self.assertNotIn('"homevisit_meeting"', str(groups.query))
+
+    def test_unreserved_meetings_by_start(self):
+        meetings = Meeting.objects.filter(
+            household__isnull=True, start__gte=self.now
+        ).order_by("start")
+        self.assertUsesIndex(meetings, "homevisit_meeting_hh_start")
+
+    def test_upcoming_meeting(self):
+        household = Household.objects.create(address="123 Main St")
+        meetings = household.meeting_set.filter(start__gte=self.now).order_by("start")
+        self.assertUsesIndex(meetings, "homevisit_meeting_hh_start")
+
+    def test_meetings_in_range(self):
+        # e.g. cancel_meetings
+        meetings = Meeting.objects.filter(
+            start__gte=self.now, start__lt=self.now + timedelta(days=1)
+        )
+        self.assertUsesIndex(meetings, "homevisit_meeting_start_end")
+
+    def test_overlapping_meetings(self):
+        meetings = Meeting.objects.overlapping(self.now, self.now + timedelta(hours=1))
+        self.assertUsesIndex(meetings, "homevisit_meeting_start_end")
+        # A bounded range, rather than every meeting that started before the end
+        self.assertIn("(start>? AND start<?)", meetings.explain())
+
+    def test_unresponded_feedback(self):
+        feedback = Feedback.objects.filter(responded=False).order_by("-created_date")
+        self.assertUsesIndex(feedback, "homevisit_feedback_responded")
+
+    def test_due_emails(self):
+        due = QueuedEmail.objects.filter(
+            status=QueuedEmail.PENDING, next_attempt__lte=self.now
+        ).order_by("next_attempt")
+        self.assertUsesIndex(due, "homevisit_email_due")
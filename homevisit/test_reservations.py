@@ -0,0 +1,106 @@
+import threading
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Household, Meeting, MeetingGroup, Person
+from .reservations import SlotTakenError, reserve_meeting
+from .test_models import create_household, create_meeting
+
+# Used to disable emails for these tests
+from django.conf import settings
+
+
+class ReserveMeetingTests(TestCase):
+    def setUp(self):
+        start = timezone.now() + timedelta(days=1)
+        self.meeting = create_meeting(start, start + timedelta(hours=1))
+
+    def test_reserve(self):
+        household = create_household("Test Address")
+        meeting = reserve_meeting(self.meeting, household)
+
+        self.assertEqual(household, meeting.household)
+        self.assertIsNotNone(meeting.reserved)
+        self.meeting.refresh_from_db()
+        self.assertEqual(household, self.meeting.household)
+        self.assertEqual(0, MeetingGroup.objects.get(pk=self.meeting.group_id).open_slots)
+
+    def test_reserve_taken(self):
+        reserve_meeting(self.meeting, create_household("First"))
+
+        stale = Meeting.objects.get(pk=self.meeting.pk)
+        stale.household = None
+        second = create_household("Second")
+        with self.assertRaises(SlotTakenError):
+            reserve_meeting(stale, second)
+
+        self.meeting.refresh_from_db()
+        self.assertNotEqual(second, self.meeting.household)
+
+    def test_reserve_group_taken(self):
+        start = self.meeting.end
+        sibling = create_meeting(
+            start, start + timedelta(hours=1), group=self.meeting.group
+        )
+        reserve_meeting(self.meeting, create_household("First"))
+
+        with self.assertRaises(SlotTakenError):
+            reserve_meeting(sibling, create_household("Second"))
+
+
+class ConcurrentReservationTests(TransactionTestCase):
+    # Each submitter holds its own connection: stay below PostgreSQL's default
+    # max_connections (100)
+    submitters = 200 if connection.vendor == "sqlite" else 50
+
+    def setUp(self):
+        settings.EMAIL_HOST_USER = None
+        start = timezone.now() + timedelta(days=1)
+        self.meeting = create_meeting(start, start + timedelta(hours=1))
+
+        # Warm up imports and template loading, like a long-running server process
+        self.client.get(reverse("index"))
+
+    def _submit(self, ndx, barrier, statuses):
+        data = {
+            "ownerForm-first_name": f"User{ndx}",
+            "ownerForm-last_name": "LastName",
+            "ownerForm-email": f"user{ndx}@test.com",
+            "ownerForm-phone_number": "",
+            "address": f"User {ndx} Address",
+            "meeting_dates": self.meeting.group.id,
+            "meeting": self.meeting.id,
+        }
+        try:
+            barrier.wait()
+            response = self.client_class().post(reverse("index"), data)
+            statuses[ndx] = response.status_code
+        finally:
+            connection.close()
+
+    def test_concurrent_posts_single_winner(self):
+        barrier = threading.Barrier(self.submitters)
+        statuses = [None] * self.submitters
+        threads = [
+            threading.Thread(target=self._submit, args=(ndx, barrier, statuses))
+            for ndx in range(self.submitters)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Exactly one submitter is redirected to "success"; everyone else is told
+        # the slot is gone and nothing of theirs is saved.
+        self.assertEqual(1, statuses.count(302), statuses)
+        self.assertEqual(self.submitters - 1, statuses.count(200), statuses)
+        self.assertEqual(1, Household.objects.count())
+        self.assertEqual(1, Person.objects.count())
+
+        self.meeting.refresh_from_db()
+        self.assertEqual(Household.objects.get(), self.meeting.household)
+        self.assertEqual(0, MeetingGroup.objects.get(pk=self.meeting.group_id).open_slots)
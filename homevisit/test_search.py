@@ -0,0 +1,97 @@
+from io import StringIO
+from unittest import skipUnless
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+
+from . import search
+from .models import Household, Person
+from .test_admin import AdminTestCase
+from .test_models import create_person
+
+
+def create_owner(address, first_name, last_name, phone_number=None):
+    household = Household.objects.create(address=address)
+    create_person(
+        first_name, last_name, f"{first_name}@test.com", phone_number, household
+    )
+    return household
+
+
+@skipUnless(search.is_available(), "Full-text search isn't supported")
+class HouseholdSearchTests(TestCase):
+    def setUp(self):
+        self.main = create_owner("12 Main Street", "Tyler", "Curtis", "530-777-7777")
+        self.oak = create_owner("34 Oak Avenue", "Jane", "Main")
+
+    def _search(self, term):
+        households = search.search(Household.objects.order_by("pk"), term)
+        return [household.address for household in households]
+
+    def test_prefixes(self):
+        self.assertEqual(["12 Main Street", "34 Oak Avenue"], self._search("mai"))
+        self.assertEqual(["12 Main Street"], self._search("mai stre"))
+        self.assertEqual(["12 Main Street"], self._search("tyl"))
+        self.assertEqual([], self._search("ain"))
+
+    def test_phone_numbers(self):
+        for term in ["530-777", "(530) 777-7777", "5307777777", "+15307777777"]:
+            with self.subTest(term=term):
+                self.assertEqual(["12 Main Street"], self._search(term))
+
+    def test_operators_and_punctuation(self):
+        self.assertEqual([], self._search('main OR "oak'))
+        self.assertEqual(["34 Oak Avenue"], self._search("oak,"))
+        self.assertEqual(2, len(self._search("  ")))
+
+    def test_kept_up_to_date(self):
+        self.oak.address = "56 Elm Court"
+        self.oak.save()
+        self.assertEqual(["56 Elm Court"], self._search("elm"))
+        self.assertEqual([], self._search("oak"))
+
+        person = Person.objects.get(household=self.oak)
+        person.last_name = "Smith"
+        person.save()
+        self.assertEqual(["12 Main Street"], self._search("main"))
+
+        # Moving someone re-indexes both households
+        person.household = self.main
+        person.save()
+        self.assertEqual(["12 Main Street"], self._search("smith"))
+        self.assertEqual([], self._search("jane elm"))
+
+        person.delete()
+        self.assertEqual([], self._search("smith"))
+
+        self.main.delete()
+        self.assertEqual([], self._search("tyler"))
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM {search.TABLE}")
+            self.assertEqual(1, cursor.fetchone()[0])
+
+    def test_rebuild_command(self):
+        Household.objects.bulk_create([Household(address="78 Pine Road")])
+        self.assertEqual([], self._search("pine"))
+
+        out = StringIO()
+        call_command("rebuild_search_index", stdout=out)
+        self.assertIn("Indexed 3 households", out.getvalue())
+        self.assertEqual(["78 Pine Road"], self._search("pine"))
+
+
+@skipUnless(search.is_available(), "Full-text search isn't supported")
+class HouseholdAdminSearchTests(AdminTestCase):
+    url = reverse("admin:homevisit_household_changelist")
+
+    def test_search(self):
+        create_owner("12 Main Street", "Tyler", "Curtis", "530-777-7777")
+        create_owner("34 Oak Avenue", "Jane", "Main")
+
+        _, response = self._count_queries(self.url + "?q=curt")
+        self.assertEqual(
+            ["12 Main Street"], [h.address for h in response.context["cl"].result_list]
+        )
+        self.assertNotIn("DISTINCT", str(response.context["cl"].queryset.query))
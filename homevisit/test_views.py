@@ -1,10 +1,11 @@
 import logging
-from unittest.mock import patch
 
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse
 
-from .models import Household, Person, MeetingGroup, Feedback
+from .models import Faq, Household, Person, MeetingGroup, Feedback, QueuedEmail
+from .outbox import to_message
 from .forms import HouseholdForm, OwnerForm
 from .test_models import RecurringMeetingTestConfig, populate_example_meetings
 from .views import SUBJECT
@@ -37,6 +38,16 @@ class IndexViewTests(TestCase):
         self.assertIn("owner_form", response.context)
         self.assertIsInstance(response.context["owner_form"], OwnerForm)
 
+    def test_index_view_warm_cache(self):
+        cache.clear()
+        self.client.get(reverse("index"))
+
+        # Availability is served from the cache: no queries at all
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("index"))
+        self.assertEqual(200, response.status_code)
+        self.assertNotIn("no_meetings_error", response.context)
+
     def test_index_view_no_meetings(self):
         # Delete the meetings created in setUp...
         MeetingGroup.objects.all().delete()
@@ -52,8 +63,7 @@ class IndexViewTests(TestCase):
         self.assertIn("No meetings are currently available", str(response.content))
         self.assertNotIn("<form", str(response.content))
 
-    @patch("homevisit.views.EmailMessage")
-    def test_index_post(self, mock_mail):
+    def test_index_post(self):
         # Enable emails for this test
         site_owner_email = "site_owner@email.com"
         settings.EMAIL_HOST_USER = site_owner_email
@@ -100,19 +110,17 @@ class IndexViewTests(TestCase):
         self.assertEqual(meeting_choice, house.upcoming_meeting())
         self.assertEqual(person.full_name, meeting.owner_name())
 
-        # Test email called as expected
-        mock_mail.assert_called_once()
-        ordered_args = mock_mail.call_args[0]
-        self.assertEqual(SUBJECT, ordered_args[0])
+        # Test email queued as expected
+        queued = QueuedEmail.objects.get()
+        self.assertEqual(QueuedEmail.PENDING, queued.status)
+        self.assertEqual(SUBJECT, queued.subject)
+        self.assertIn(first_name, queued.body)
+        self.assertIn(str(meeting_choice), queued.body)
 
-        email_body = ordered_args[1]
-        self.assertIn(first_name, email_body)
-        self.assertIn(str(meeting_choice), email_body)
-
-        kw_args = mock_mail.call_args[1]
-        self.assertEqual(site_owner_email, kw_args["from_email"])
-        self.assertEqual([email], kw_args["to"])
-        self.assertEqual([site_owner_email], kw_args["cc"])
+        message = to_message(queued)
+        self.assertEqual(site_owner_email, message.from_email)
+        self.assertEqual([email], message.to)
+        self.assertEqual([site_owner_email], message.cc)
 
         # When the next person comes to the site...
         response = self.client.get(reverse("index"))
@@ -130,8 +138,7 @@ class IndexViewTests(TestCase):
         meeting_choice_ids = [_id for (_id, _) in choices]
         self.assertNotIn(meeting_choice.id, meeting_choice_ids)
 
-    @patch("homevisit.views.EmailMessage")
-    def test_index_post_try_to_reserve_same_meeting(self, mock_mail):
+    def test_index_post_try_to_reserve_same_meeting(self):
         # Disable emails for this test
         settings.EMAIL_HOST_USER = None
 
@@ -174,7 +181,7 @@ class IndexViewTests(TestCase):
             "meeting": user2_meeting.id,
         }
 
-        # User 1: submits first (and is successful). NOTE: The view's POST is atomic.
+        # User 1: submits first (and is successful).
         response = self.client.post(reverse("index"), user1_data, follow=True)
         self.assertEqual(200, response.status_code)
         self.assertRedirects(response, reverse("success"))
@@ -210,8 +217,8 @@ class IndexViewTests(TestCase):
         self.assertEqual(0, Person.objects.filter(first_name=user2_first_name).count())
         self.assertEqual(0, Household.objects.filter(address=user2_address).count())
 
-        # No emails are sent because they are disabled
-        mock_mail.assert_not_called()
+        # No emails are queued because they are disabled
+        self.assertFalse(QueuedEmail.objects.exists())
 
     def test_ajax_load_times(self):
         group = MeetingGroup.objects.first()
@@ -226,6 +233,58 @@ class IndexViewTests(TestCase):
         self.assertIn("meetings", response.context)
         self.assertEqual(group.meeting_set.count(), len(response.context["meetings"]))
 
+    def test_ajax_load_times_warm_cache(self):
+        cache.clear()
+        group = MeetingGroup.objects.first()
+        first = self.client.get(reverse("ajax_load_times"), {"group": group.id})
+
+        # Served straight from the cache: no queries or template rendering
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("ajax_load_times"), {"group": group.id})
+        self.assertEqual(200, response.status_code)
+        self.assertEqual([], response.templates)
+        self.assertEqual(first.content, response.content)
+        self.assertIn("no-cache", response["Cache-Control"])
+
+    def test_ajax_load_times_not_modified(self):
+        group = MeetingGroup.objects.first()
+        response = self.client.get(reverse("ajax_load_times"), {"group": group.id})
+        etag = response["ETag"]
+        self.assertIn("Last-Modified", response)
+
+        response = self.client.get(
+            reverse("ajax_load_times"), {"group": group.id}, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(304, response.status_code)
+        self.assertEqual(b"", response.content)
+
+        # Reserving a meeting changes the options (and so the ETag)
+        meeting = group.meeting_set.first()
+        meeting.household = Household.objects.create(address="123 Main St")
+        meeting.save()
+        response = self.client.get(
+            reverse("ajax_load_times"), {"group": group.id}, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(200, response.status_code)
+        self.assertNotEqual(etag, response["ETag"])
+
+    def test_ajax_load_times_unreserved_only(self):
+        group = MeetingGroup.objects.first()
+        meeting = group.meeting_set.first()
+        meeting.household = Household.objects.create(address="123 Main St")
+        meeting.save()
+
+        # Reserving any meeting in a group makes the whole group unavailable
+        response = self.client.get(reverse("ajax_load_times"), {"group": group.id})
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(0, len(response.context["meetings"]))
+        self.assertNotIn(str(meeting.pk), response.content.decode())
+
+    def test_ajax_load_times_unknown_group(self):
+        for group_id in ["999999", "abc", ""]:
+            response = self.client.get(reverse("ajax_load_times"), {"group": group_id})
+            self.assertEqual(404, response.status_code)
+
 
 class ContactUsViewTests(TestCase):
     def test_get(self):
@@ -237,8 +296,7 @@ class ContactUsViewTests(TestCase):
 
         self.assertIn("form", response.context)
 
-    @patch("homevisit.views.EmailMessage")
-    def test_post(self, mock_mail):
+    def test_post(self):
         # Enable emails for this test
         site_owner_email = "site_owner@email.com"
         settings.EMAIL_HOST_USER = site_owner_email
@@ -263,35 +321,68 @@ class ContactUsViewTests(TestCase):
         self.assertEqual(comment, feedback.comment)
         self.assertEqual(f"{name}: {feedback.id}", str(feedback))
 
-        # Test emails sent as expected: one to site owner; one to user
-        email_calls = mock_mail.call_args_list
-        self.assertEqual(2, len(email_calls))
-
-        # Ensure site owner email sent correctly
-        site_owner_call = email_calls[0]
-        ordered_args = site_owner_call[0]
-        subject = ordered_args[0]
-        self.assertIn("Homevisit Feedback", subject)
-        self.assertIn(name, subject)
-
-        email_body = ordered_args[1]
-        self.assertIn(name, email_body)
-        self.assertIn(comment, email_body)
-
-        kw_args = site_owner_call[1]
-        self.assertEqual(email, kw_args["from_email"])
-        self.assertEqual([site_owner_email], kw_args["to"])
-
-        # Ensure acknowledgement email sent correctly
-        ack_call = email_calls[1]
-        ordered_args = ack_call[0]
-        subject = ordered_args[0]
-        self.assertIn("Thanks for your home visit feedback", subject)
-        self.assertIn(name, subject)
-
-        email_body = ordered_args[1]
-        self.assertIn(comment, email_body)
-
-        kw_args = ack_call[1]
-        self.assertEqual(site_owner_email, kw_args["from_email"])
-        self.assertEqual([email], kw_args["to"])
+        # Test emails queued as expected: one to site owner; one to user
+        queued = QueuedEmail.objects.order_by("pk")
+        self.assertEqual(2, len(queued))
+
+        # Ensure site owner email queued correctly
+        site_owner_email_obj = queued[0]
+        self.assertIn("Homevisit Feedback", site_owner_email_obj.subject)
+        self.assertIn(name, site_owner_email_obj.subject)
+        self.assertIn(name, site_owner_email_obj.body)
+        self.assertIn(comment, site_owner_email_obj.body)
+        self.assertEqual(email, site_owner_email_obj.from_email)
+        self.assertEqual([site_owner_email], to_message(site_owner_email_obj).to)
+
+        # Ensure acknowledgement email queued correctly
+        ack = queued[1]
+        self.assertIn("Thanks for your home visit feedback", ack.subject)
+        self.assertIn(name, ack.subject)
+        self.assertIn(comment, ack.body)
+        self.assertEqual(site_owner_email, ack.from_email)
+        self.assertEqual([email], to_message(ack).to)
+
+
+class FaqViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        Faq.objects.create(short_name="about", question="About", answer="<p>About us</p>")
+        Faq.objects.create(short_name="first", question="First?", answer="<p>Yes</p>")
+
+    def test_faqs(self):
+        response = self.client.get(reverse("faqs"))
+        self.assertEqual(200, response.status_code)
+        self.assertContains(response, "First?")
+        self.assertContains(response, "<p>Yes</p>")
+        self.assertNotContains(response, "About us")
+
+        # Served straight from the cache: no queries or template rendering
+        with self.assertNumQueries(0):
+            cached = self.client.get(reverse("faqs"))
+        self.assertEqual([], cached.templates)
+        self.assertEqual(response.content, cached.content)
+        self.assertEqual(response["Content-Type"], cached["Content-Type"])
+
+    def test_about(self):
+        response = self.client.get(reverse("about"))
+        self.assertEqual(200, response.status_code)
+        self.assertContains(response, "<p>About us</p>")
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(reverse("about"))
+        self.assertEqual(response.content, cached.content)
+
+    def test_not_modified(self):
+        etag = self.client.get(reverse("faqs"))["ETag"]
+        response = self.client.get(reverse("faqs"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(304, response.status_code)
+        self.assertIn("no-cache", response["Cache-Control"])
+
+        # Faq changes are visible immediately
+        Faq.objects.create(short_name="second", question="Second?", answer="No")
+        response = self.client.get(reverse("faqs"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(200, response.status_code)
+        self.assertContains(response, "Second?")
+
+        Faq.objects.filter(short_name="first").get().delete()
+        self.assertNotContains(self.client.get(reverse("faqs")), "First?")
@@ -0,0 +1,51 @@
+"""Version counters for invalidating groups of cached entries at once.
+
+Cached entries embed the current version of their group in their key. Bumping the
+version makes readers stop seeing the old entries immediately; they simply expire from
+the cache later.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+
+def get_cache():
+    return caches[settings.HOMEVISIT_CACHE_ALIAS]
+
+
+def _initial_version() -> int:
+    # Seeded from the clock so a version key evicted from the cache can never be
+    # re-created with a value that matches stale entries still sitting in the cache.
+    return int(time.time() * 1000)
+
+
+def get_version(key: str) -> int:
+    """Returns the current version stored at ``key``, creating it if needed."""
+    cache = get_cache()
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _initial_version(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def _bump_version(key: str) -> None:
+    cache = get_cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Key is missing (never set or evicted): any fresh value invalidates
+        cache.set(key, _initial_version(), timeout=None)
+
+
+def bump(key: str) -> None:
+    """Bumps the version stored at ``key``.
+
+    When called inside a transaction, the version is bumped again once it commits so
+    that entries cached by other requests from pre-commit data are discarded as well.
+    """
+    _bump_version(key)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: _bump_version(key))
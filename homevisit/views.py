@@ -1,21 +1,25 @@
 import logging
 from string import Template
 
+from django.contrib.admin.views.decorators import staff_member_required
 from django.db import transaction
-from django.http import HttpResponseRedirect
+from django.http import Http404, HttpResponse, HttpResponseRedirect, JsonResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
 from django.views.generic.base import TemplateView
 from django.views.generic.list import ListView
 from django.views.generic import CreateView
 from django.shortcuts import render
 from django.urls import reverse
-from django.utils import timezone
 from django.contrib import messages
 
-from django.core.mail import EmailMessage
 from django.conf import settings
 
-from .forms import HouseholdForm, MeetingGroup, OwnerForm, FeedbackForm
+from . import availability, metrics, pages
+from .forms import HouseholdForm, OwnerForm, FeedbackForm, SLOT_TAKEN_ERROR
 from .models import Faq
+from .outbox import queue_email
+from .reservations import SlotTakenError, reserve_meeting
 
 logger = logging.getLogger(__name__)
 
@@ -49,23 +53,52 @@ FEEDBACK_ACK_BODY = Template(
 )
 
 
-def send_email(subject, body, from_email, to_email, cc_emails=[]):
-    email = EmailMessage(
-        subject, body, from_email=from_email, to=[to_email], cc=cc_emails
-    )
-    email.content_subtype = "html"
-    email.send(fail_silently=False)
+def _conditional_response(request, content, etag, last_modified, **kwargs):
+    """Responds with content, or a 304 if the browser's copy is still current."""
+    last_modified = int(last_modified.timestamp())
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = HttpResponse(content, **kwargs)
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    # Let browsers revalidate their copy (rather than re-download it) on every change
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+class CachedPageMixin:
+    """Serves GET requests from the page cache (see homevisit.pages)."""
+
+    def get(self, request, *args, **kwargs):
+        def render():
+            return super(CachedPageMixin, self).get(request, *args, **kwargs).render()
+
+        page = pages.get_page(request.path, render)
+        return _conditional_response(
+            request,
+            page.content,
+            page.etag,
+            page.last_modified,
+            content_type=page.content_type,
+        )
 
 
 def load_times(request):
-    group_id = request.GET.get("group")
-    group = MeetingGroup.objects.get(pk=group_id)
-    meetings = group.meeting_set.all()
-    return render(
-        request, "homevisit/times_dropdown_list_options.html", {"meetings": meetings}
+    group_id = request.GET.get("group", "")
+    options = availability.get_time_options(int(group_id)) if group_id.isdigit() else None
+    if options is None:
+        raise Http404("No such meeting date")
+    return _conditional_response(
+        request, options.html, options.etag, options.last_modified
     )
 
 
+@staff_member_required
+def request_metrics(request):
+    """Shows the per-view request metrics aggregated by this server process."""
+    return JsonResponse(metrics.snapshot())
+
+
 class HouseholdCreateView(CreateView):
     template_name = "homevisit/index.html"
     form_class = HouseholdForm
@@ -83,61 +116,77 @@ class HouseholdCreateView(CreateView):
             context["no_meetings_error"] = True
         return context
 
-    @transaction.atomic
     def post(self, request):
         owner_form = OwnerForm(request.POST, prefix="ownerForm")
         household_form = HouseholdForm(request.POST)
 
         if owner_form.is_valid() and household_form.is_valid():
+            try:
+                with transaction.atomic():
+                    household, owner, meeting = self._reserve(household_form, owner_form)
+                    msg = self._confirm(household, owner, meeting)
+            except SlotTakenError:
+                household_form.add_error("meeting", SLOT_TAKEN_ERROR)
+                context = {"owner_form": owner_form, "form": household_form}
+                return render(request, "homevisit/index.html", context)
+
+            messages.info(request, msg, extra_tags="safe")
+            return HttpResponseRedirect(reverse("success"))
+
+        context = {"owner_form": owner_form, "form": household_form}
+        return render(request, "homevisit/index.html", context)
+
+    @staticmethod
+    def _reserve(household_form, owner_form):
+        """Saves the household + owner and claims their meeting, all or nothing."""
+        with transaction.atomic():
             household = household_form.save()
+            meeting = reserve_meeting(
+                household_form.cleaned_data["meeting_obj"], household
+            )
 
             owner = owner_form.save(commit=False)
             owner.household = household
             owner.save()
 
-            meeting = household_form.cleaned_data["meeting_obj"]
-            meeting.household = household
-            meeting.reserved = timezone.now()
-            meeting.save()
-            logger.info(
-                "Created [house=%s] with [owner=%s] [meeting=%s]",
-                str(household).replace("\r\n", ". "),
-                owner,
-                meeting,
-            )
-
-            msg = BODY.substitute(
-                url=f"http://{settings.HOST_NAME}",
-                name=owner.first_name,
-                meeting=str(meeting),
-                address=household.address,
-                host_name=settings.HOST_NAME,
-            ).replace("\n", "<br>")
-            messages.info(request, msg, extra_tags="safe")
+        logger.info(
+            "Created [house=%s] with [owner=%s] [meeting=%s]",
+            str(household).replace("\r\n", ". "),
+            owner,
+            meeting,
+        )
+        return household, owner, meeting
+
+    @staticmethod
+    def _confirm(household, owner, meeting):
+        """Queues the confirmation email and returns its body."""
+        msg = BODY.substitute(
+            url=f"http://{settings.HOST_NAME}",
+            name=owner.first_name,
+            meeting=str(meeting),
+            address=household.address,
+            host_name=settings.HOST_NAME,
+        ).replace("\n", "<br>")
 
-            if settings.EMAIL_HOST_USER:
-                logger.debug("Emailing new appt. to %s with body:\n%s", owner.email, msg)
-                send_email(
-                    SUBJECT,
-                    msg,
-                    from_email=settings.EMAIL_HOST_USER,
-                    to_email=owner.email,
-                    cc_emails=[settings.EMAIL_HOST_USER],
-                )
-            else:
-                logger.info("Received new household (but email is disabled)")
-
-            return HttpResponseRedirect(reverse("success"))
-
-        context = {"owner_form": owner_form, "form": household_form}
-        return render(request, "homevisit/index.html", context)
+        if settings.EMAIL_HOST_USER:
+            logger.debug("Emailing new appt. to %s with body:\n%s", owner.email, msg)
+            queue_email(
+                SUBJECT,
+                msg,
+                from_email=settings.EMAIL_HOST_USER,
+                to_email=owner.email,
+                cc_emails=[settings.EMAIL_HOST_USER],
+            )
+        else:
+            logger.info("Received new household (but email is disabled)")
+        return msg
 
 
 class SuccessView(TemplateView):
     template_name = "homevisit/success.html"
 
 
-class AboutView(TemplateView):
+class AboutView(CachedPageMixin, TemplateView):
     template_name = "homevisit/about.html"
 
     def get_context_data(self, **kwargs):
@@ -151,6 +200,7 @@ class ContactUsCreateView(CreateView):
     form_class = FeedbackForm
     success_url = "/contact/success"
 
+    @transaction.atomic
     def form_valid(self, form):
         if settings.EMAIL_HOST_USER:
             subject = FEEDBACK_SUBJECT.substitute(name=form.cleaned_data["name"])
@@ -162,8 +212,8 @@ class ContactUsCreateView(CreateView):
                 comment=form.cleaned_data["comment"],
             ).replace("\n", "<br>")
 
-            logger.debug("Sending feedback email to site owner: %s\n%s", subject, msg)
-            send_email(
+            logger.debug("Queueing feedback email to site owner: %s\n%s", subject, msg)
+            queue_email(
                 subject,
                 msg,
                 from_email=form.cleaned_data["email"],
@@ -176,9 +226,9 @@ class ContactUsCreateView(CreateView):
             ).replace("\n", "<br>")
 
             logger.debug(
-                "Sending feedback ack email to user: %s\n%s", ack_subject, ack_msg
+                "Queueing feedback ack email to user: %s\n%s", ack_subject, ack_msg
             )
-            send_email(
+            queue_email(
                 ack_subject,
                 ack_msg,
                 from_email=settings.EMAIL_HOST_USER,
@@ -193,7 +243,7 @@ class ContactUsSuccessView(TemplateView):
     template_name = "homevisit/contact_success.html"
 
 
-class FaqListView(ListView):
+class FaqListView(CachedPageMixin, ListView):
     template_name = "homevisit/faqs.html"
     model = Faq
     queryset = Faq.objects.exclude(short_name="about")
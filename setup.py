@@ -19,6 +19,7 @@ setuptools.setup(
         "phonenumbers",
         "django-crispy-forms",
     ],
+    extras_require={"postgres": ["psycopg2-binary<2.9"]},
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: Apache Software License",